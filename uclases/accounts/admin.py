@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
+from core.admin import LargeTableAdmin
 from .models import User, Perfil
 
 class PerfilInline(admin.StackedInline):
@@ -14,7 +15,7 @@ class PerfilInline(admin.StackedInline):
     readonly_fields = ('rating_promedio', 'total_ratings')
 
 @admin.register(User)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(LargeTableAdmin, UserAdmin):
     """Admin personalizado para el modelo User"""
     # Columnas en el listado
     list_display = ("id", "username", "email", "public_uid", "is_active", "is_staff", "date_joined")
@@ -46,9 +47,10 @@ class CustomUserAdmin(UserAdmin):
     inlines = [PerfilInline]
 
 @admin.register(Perfil)
-class PerfilAdmin(admin.ModelAdmin):
+class PerfilAdmin(LargeTableAdmin):
     """Admin para el modelo Perfil"""
     list_display = ("user", "get_email", "telefono", "carrera", "rating_promedio", "total_ratings")
+    list_select_related = ("user", "carrera")
     search_fields = ("user__username", "user__email", "telefono")
     list_filter = ("carrera", "rating_promedio")
     ordering = ("-rating_promedio",)
@@ -65,4 +67,5 @@ class PerfilAdmin(admin.ModelAdmin):
     def get_email(self, obj):
         """Obtener el email del usuario relacionado"""
         return obj.user.email
-    get_email.short_description = "Email"
\ No newline at end of file
+    get_email.short_description = "Email"
+    get_email.admin_order_field = "user__email"
\ No newline at end of file
@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, SetPasswordForm, PasswordResetForm
 from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
 from .models import User, Perfil
 
 INPUT_CLASS = "appearance-none my-4 w-full px-4 py-2 border border-border rounded-md bg-background text-foreground focus:outline-none focus:ring-2 focus:ring-primary transition"
@@ -381,6 +383,42 @@ class ImagesForm(forms.ModelForm):
             'banner_file': 'Subir banner'
         }
 
+    FILE_FIELDS = ('foto_file', 'banner_file')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Remember the stored blobs before the form mutates the instance
+        self._previous_files = {
+            field: getattr(self.instance, field).name or None
+            for field in self.FILE_FIELDS
+        }
+
+    def save(self, commit=True):
+        """
+        Guarda las imágenes y elimina los blobs que quedaron huérfanos.
+
+        Como el almacenamiento deduplica por contenido, un blob reemplazado
+        solo se borra si ningún otro perfil lo sigue referenciando.
+        """
+        instance = super().save(commit=commit)
+        if commit:
+            replaced = [
+                old_name
+                for field, old_name in self._previous_files.items()
+                if old_name and old_name != getattr(instance, field).name
+            ]
+            if replaced:
+                transaction.on_commit(lambda: self._delete_orphaned_files(replaced))
+        return instance
+
+    def _delete_orphaned_files(self, names):
+        """Borra del storage los archivos que ya no referencia ningún perfil."""
+        for name in set(names):
+            in_use = Perfil.objects.filter(Q(foto_file=name) | Q(banner_file=name)).exists()
+            if not in_use:
+                storage = self.instance.foto_file.storage
+                storage.delete(name)
+
 class CareerForm(forms.ModelForm):
     """
     Formulario especializado para gestionar carrera y ramos cursados.
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_perfil_banner_file_perfil_foto_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='calendar_token_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
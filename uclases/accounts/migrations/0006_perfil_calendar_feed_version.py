@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_perfil_calendar_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='calendar_feed_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_perfil_calendar_feed_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfil',
+            name='timetable_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -52,6 +52,9 @@ class Perfil(models.Model):
         banner_url (URLField): URL externa de banner.
         rating_promedio (DecimalField): Promedio de calificaciones recibidas (0-5).
         total_ratings (IntegerField): Cantidad total de calificaciones recibidas.
+        calendar_token_version (PositiveIntegerField): Versión del enlace .ics (al subirla se revocan los anteriores).
+        calendar_feed_version (PositiveIntegerField): Versión del contenido del feed .ics (clave de su caché).
+        timetable_version (PositiveIntegerField): Versión del horario semanal (clave de su caché).
         carrera (ForeignKey): Carrera universitaria del usuario.
         ramos_cursados (ManyToManyField): Ramos que el usuario ha cursado.
     
@@ -77,6 +80,12 @@ class Perfil(models.Model):
     banner_url = models.URLField(max_length=200, blank=True, null=True)
     rating_promedio = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     total_ratings = models.IntegerField(default=0)
+    # Part of the signed calendar feed token; bumping it revokes leaked links
+    calendar_token_version = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped when the feed content changes; part of its cache key, so every process sees the change
+    calendar_feed_version = models.PositiveIntegerField(default=0, editable=False)
+    # Same for the weekly timetable cache (courses.services.timetable_service)
+    timetable_version = models.PositiveIntegerField(default=0, editable=False)
     # Relación N:1 con CARRERA (Una CARRERA es cursada por N Perfiles)
     # ID Carrera (FK)
     carrera = models.ForeignKey('courses.Carrera', on_delete=models.SET_NULL, null=True, blank=True, related_name='perfiles_cursando')
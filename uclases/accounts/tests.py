@@ -1,12 +1,24 @@
-from django.test import TestCase
+import base64
+import tempfile
+
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import IntegrityError, transaction
 
+from accounts.forms import ImagesForm
 from accounts.models import Perfil
 from courses.models import Ramo, OfertaClase, HorarioOfertado, PerfilRamo, Inscripcion
 
 User = get_user_model()
 
+# Smallest valid PNG (1x1 transparent pixel), so ImageField validation passes
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
 class AccountsModelTests(TestCase):
     """Pruebas para el comportamiento de modelos y señales en la app `accounts`.
 
@@ -79,4 +91,51 @@ class InscripcionTests(TestCase):
         Inscripcion.objects.create(estudiante=self.perfil_s, horario_ofertado=self.horario)
         with self.assertRaises(IntegrityError):
             with transaction.atomic():
-                Inscripcion.objects.create(estudiante=self.perfil_s, horario_ofertado=self.horario)
\ No newline at end of file
+                Inscripcion.objects.create(estudiante=self.perfil_s, horario_ofertado=self.horario)
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ContentAddressedStorageTests(TestCase):
+    """Pruebas del almacenamiento por hash de contenido y la limpieza de blobs."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="media", email="media@example.com", password="x")
+        self.perfil = Perfil.objects.get(user=self.user)
+
+    def upload(self, name, content):
+        return SimpleUploadedFile(name, content, content_type="image/png")
+
+    def test_identical_uploads_share_blob(self):
+        """Dos subidas con el mismo contenido deben apuntar al mismo archivo."""
+        first = default_storage.save("profile_pics/a.png", ContentFile(b"same-bytes"))
+        second = default_storage.save("profile_pics/b.png", ContentFile(b"same-bytes"))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith("profile_pics/"))
+        self.assertTrue(first.endswith(".png"))
+
+    def test_images_form_deletes_orphaned_blob(self):
+        """Reemplazar la foto borra el blob anterior si nadie más lo usa."""
+        self.perfil.foto_file.save("old.png", ContentFile(b"old"))
+        old_name = self.perfil.foto_file.name
+
+        form = ImagesForm(data={}, files={"foto_file": self.upload("new.png", PNG_BYTES)}, instance=self.perfil)
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+
+        self.assertFalse(default_storage.exists(old_name))
+        self.assertTrue(default_storage.exists(self.perfil.foto_file.name))
+
+    def test_images_form_keeps_shared_blob(self):
+        """Un blob referenciado por otro perfil no se elimina."""
+        self.perfil.foto_file.save("old.png", ContentFile(b"shared"))
+        old_name = self.perfil.foto_file.name
+        other = Perfil.objects.get(user=User.objects.create_user(username="otro", email="o@example.com", password="x"))
+        other.banner_file = old_name
+        other.save()
+
+        form = ImagesForm(data={}, files={"foto_file": self.upload("new.png", PNG_BYTES)}, instance=self.perfil)
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+
+        self.assertTrue(default_storage.exists(old_name))
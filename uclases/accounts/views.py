@@ -4,6 +4,8 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.urls import reverse
 
+from core.db_router import use_replica
+
 from .forms import (
     CustomLoginForm,
     SignUpForm,
@@ -219,6 +221,7 @@ def my_profile_view(request):
 
 # only lecture
 
+@use_replica
 def profile_detail_view(request, public_uid):
     """
     Muestra el perfil público de un usuario identificado por su UUID público.
@@ -238,7 +241,7 @@ def profile_detail_view(request, public_uid):
         - accounts.models.User
         - django.shortcuts.get_object_or_404
     """
-    from courses.models import Inscripcion, Rating
+    from courses.models import Inscripcion
     from courses.enums import EstadoInscripcion
     from courses.forms import RatingForm
     
@@ -275,12 +278,10 @@ def profile_detail_view(request, public_uid):
             estado=EstadoInscripcion.COMPLETADO
         ).select_related('horario_ofertado__oferta')
         
-        # Verificar si alguna inscripción completada NO tiene rating
-        for inscripcion in completed_inscriptions:
-            if not Rating.objects.filter(inscripcion=inscripcion).exists():
-                can_rate = True
-                rating_form = RatingForm()
-                break
+        # Verificar si alguna inscripción completada NO tiene rating (una sola consulta)
+        if completed_inscriptions.filter(rating__isnull=True).exists():
+            can_rate = True
+            rating_form = RatingForm()
 
     context = {
         'profile_user': user,
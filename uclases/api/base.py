@@ -0,0 +1,253 @@
+"""
+Piezas comunes de la API JSON de solo lectura.
+
+Un ``Resource`` describe cómo publicar un modelo: qué campos puede pedir el
+cliente, qué ``select_related``/``prefetch_related``/anotaciones necesita
+cada uno y cómo se serializa. Con ``?fields=id,titulo`` (sparse fieldsets)
+solo se cargan las relaciones de los campos pedidos.
+
+Los listados se paginan con cursor (keyset sobre la clave primaria): cada
+página es ``WHERE pk < último ORDER BY pk DESC LIMIT n+1``, que usa el
+índice de la PK y cuesta lo mismo en la página 1 que en la 10.000 (un
+``OFFSET`` recorre todas las filas anteriores). El cursor es opaco para el
+cliente: basta seguir el enlace ``next``.
+
+``api_endpoint`` envuelve cada vista: solo GET/HEAD, errores en JSON, ETag
+calculado sobre el cuerpo (``If-None-Match`` responde 304 sin reenviar los
+datos) y un presupuesto de consultas SQL por endpoint. Superar el
+presupuesto se registra en el logger ``uclases.api``; con
+``NPLUSONE_MODE="raise"`` (los tests) lanza ``QueryBudgetExceeded``.
+"""
+
+import base64
+import functools
+import hashlib
+import logging
+import re
+from contextlib import ExitStack
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger("uclases.api")
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Connection setup (core.database PRAGMAs) and transaction housekeeping, not the endpoint's work
+_HOUSEKEEPING_RE = re.compile(r"^\s*(PRAGMA|SET|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+class ApiError(Exception):
+    """Error del cliente: se responde como ``{"error": ...}`` con ``status``."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Un endpoint hizo más consultas SQL que su presupuesto."""
+
+
+def plain(value):
+    """Valor listo para JSON (fechas en ISO 8601, Decimal como float)."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class Field:
+    """
+    Campo publicable de un recurso.
+
+    Args:
+        get: Función ``obj -> valor``
+        select_related: Relaciones que necesita ``get``
+        prefetch_related: Prefetch que necesita ``get``
+        annotate: Anotaciones (nombre -> expresión) que necesita ``get``
+    """
+
+    def __init__(self, get, select_related=(), prefetch_related=(), annotate=None):
+        self.get = get
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.annotate = annotate or {}
+
+
+class Resource:
+    """
+    Modelo publicado en la API.
+
+    Args:
+        queryset: Función ``() -> QuerySet`` con las filas visibles
+        fields: Dict nombre -> ``Field``
+        default_fields: Campos cuando el cliente no pasa ``?fields=``
+        descending: Orden del listado por PK (más nuevos primero si es True)
+    """
+
+    def __init__(self, queryset, fields, default_fields=None, descending=True):
+        self.base_queryset = queryset
+        self.fields = fields
+        self.default_fields = list(default_fields or fields)
+        self.descending = descending
+
+    def requested_fields(self, request):
+        raw = request.GET.get("fields")
+        if not raw:
+            return self.default_fields
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        if not names:
+            raise ApiError(f"fields no puede estar vacío. Disponibles: {', '.join(self.fields)}")
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(self.fields)}")
+        return names
+
+    def queryset(self, names):
+        """QuerySet con solo las relaciones y anotaciones de los campos ``names``."""
+        queryset = self.base_queryset()
+        fields = [self.fields[name] for name in names]
+        select = {path for field in fields for path in field.select_related}
+        prefetch = {path for field in fields for path in field.prefetch_related}
+        annotations = {key: expr for field in fields for key, expr in field.annotate.items()}
+        if select:
+            queryset = queryset.select_related(*sorted(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
+    def serialize(self, obj, names):
+        return {name: plain(self.fields[name].get(obj)) for name in names}
+
+    def detail(self, request, **lookup):
+        """Respuesta ``{"data": {...}}`` de una fila, o 404."""
+        names = self.requested_fields(request)
+        obj = self.queryset(names).filter(**lookup).first()
+        if obj is None:
+            raise Http404
+        return JsonResponse({"data": self.serialize(obj, names)})
+
+    def list(self, request, queryset_filter=None):
+        """
+        Respuesta paginada ``{"data": [...], "next": url | null}``.
+
+        Args:
+            request: Request con ``fields``, ``cursor`` y ``limit`` opcionales
+            queryset_filter: Función ``QuerySet -> QuerySet`` con los filtros del endpoint
+        """
+        names = self.requested_fields(request)
+        limit = parse_limit(request)
+        queryset = self.queryset(names)
+        if queryset_filter is not None:
+            queryset = queryset_filter(queryset)
+
+        after = decode_cursor(request.GET.get("cursor"))
+        if after is not None:
+            queryset = queryset.filter(pk__lt=after) if self.descending else queryset.filter(pk__gt=after)
+        rows = list(queryset.order_by("-pk" if self.descending else "pk")[:limit + 1])
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            params = request.GET.copy()
+            params["cursor"] = encode_cursor(rows[-1].pk)
+            next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+        return JsonResponse({"data": [self.serialize(obj, names) for obj in rows], "next": next_url})
+
+
+def parse_limit(request):
+    raw = request.GET.get("limit")
+    if raw is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ApiError("limit debe ser un entero") from None
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(f"pk:{pk}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, pk = raw.partition(":")
+        if prefix != "pk":
+            raise ValueError(raw)
+        return int(pk)
+    except ValueError:
+        raise ApiError("cursor inválido") from None
+
+
+def parse_int(request, name):
+    """Parámetro GET entero opcional (400 si no es un entero)."""
+    raw = request.GET.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ApiError(f"{name} debe ser un entero") from None
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not _HOUSEKEEPING_RE.match(sql):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+def api_endpoint(budget):
+    """
+    Decorador de las vistas de la API.
+
+    Args:
+        budget: Consultas SQL permitidas a la vista (sin contar sesión y auth)
+    """
+    def decorator(view):
+        @require_safe
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            counter = _QueryCounter()
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                try:
+                    response = view(request, *args, **kwargs)
+                except ApiError as exc:
+                    return JsonResponse({"error": exc.message}, status=exc.status)
+                except Http404:
+                    return JsonResponse({"error": "No encontrado"}, status=404)
+
+            if counter.count > budget:
+                message = f"{request.path}: {counter.count} consultas, presupuesto {budget}"
+                if getattr(settings, "NPLUSONE_MODE", "off") == "raise":
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+
+            # Public data: clients and proxies may keep it but must revalidate with the ETag
+            response["ETag"] = f'"{hashlib.md5(response.content, usedforsecurity=False).hexdigest()}"'
+            patch_cache_control(response, public=True, no_cache=True)
+            return get_conditional_response(request, etag=response["ETag"], response=response)
+
+        wrapper.query_budget = budget
+        return wrapper
+    return decorator
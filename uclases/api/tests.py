@@ -0,0 +1,101 @@
+from datetime import time
+from uuid import uuid4
+
+from django.db import connection
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from courses.enums import DiaSemana, EstadoInscripcion
+from courses.models import HorarioOfertado, Inscripcion, OfertaClase, Ramo
+
+from api.base import QueryBudgetExceeded, api_endpoint
+
+
+class ApiV1Tests(TestCase):
+    """Pruebas de la API JSON v1 (campos, cursor, ETag, cupos y privacidad)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ramo = Ramo.objects.create(name="Cálculo", codigo="MA1001")
+        cls.profesor = cls.perfil()
+        cls.ofertas = [
+            OfertaClase.objects.create(titulo=f"Oferta {i}", descripcion="d", profesor=cls.profesor, ramo=cls.ramo)
+            for i in range(5)
+        ]
+        cls.privada = OfertaClase.objects.create(titulo="Privada", descripcion="d", profesor=cls.profesor, ramo=cls.ramo, public=False)
+        cls.horario = HorarioOfertado.objects.create(
+            oferta=cls.ofertas[0], dia=DiaSemana.MARTES, hora_inicio=time(10), hora_fin=time(11), cupos_totales=2,
+        )
+        cls.lleno = HorarioOfertado.objects.create(
+            oferta=cls.ofertas[0], dia=DiaSemana.JUEVES, hora_inicio=time(10), hora_fin=time(11), cupos_totales=1,
+        )
+        Inscripcion.objects.create(estudiante=cls.perfil(), horario_ofertado=cls.horario, estado=EstadoInscripcion.ACEPTADO)
+        Inscripcion.objects.create(estudiante=cls.perfil(), horario_ofertado=cls.horario, estado=EstadoInscripcion.CANCELADO)
+        Inscripcion.objects.create(estudiante=cls.perfil(), horario_ofertado=cls.lleno, estado=EstadoInscripcion.PENDIENTE)
+
+    @staticmethod
+    def perfil():
+        return User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x").perfil
+
+    def test_cursor_recorre_todas_las_ofertas_publicas(self):
+        url, ids = reverse("api:v1_ofertas") + "?limit=2&fields=id", []
+        while url:
+            data = self.client.get(url).json()
+            ids += [row["id"] for row in data["data"]]
+            url = data["next"]
+
+        self.assertEqual(ids, [oferta.pk for oferta in reversed(self.ofertas)])
+
+    def test_campos_pedidos_y_consultas(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(reverse("api:v1_ofertas"), {"fields": "id,titulo"}).json()
+        self.assertEqual(set(data["data"][0]), {"id", "titulo"})
+        # No ramo/profesor join and no horarios prefetch
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        data = self.client.get(reverse("api:v1_oferta", args=[self.ofertas[0].pk])).json()["data"]
+        self.assertEqual(data["ramo"], {"id": self.ramo.pk, "codigo": "MA1001", "nombre": "Cálculo"})
+        self.assertEqual([h["cupos_libres"] for h in data["horarios"]], [1, 0])
+
+        response = self.client.get(reverse("api:v1_ofertas"), {"fields": "id,email"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.client.get(reverse("api:v1_ofertas"), {"perfil": "notauuid"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("api:v1_ofertas"), {"fields": ",,"}).status_code, 400)
+
+        data = self.client.get(reverse("api:v1_ofertas"), {"perfil": str(self.profesor.user.public_uid)}).json()
+        self.assertEqual(len(data["data"]), 5)
+
+    def test_horarios_disponibles(self):
+        data = self.client.get(reverse("api:v1_horarios"), {"disponibles": 1}).json()
+
+        self.assertEqual([(h["id"], h["cupos_libres"]) for h in data["data"]], [(self.horario.pk, 1)])
+
+    def test_etag_responde_304(self):
+        url = reverse("api:v1_solicitudes")
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+
+    def test_privacidad(self):
+        self.assertEqual(self.client.get(reverse("api:v1_oferta", args=[self.privada.pk])).status_code, 404)
+
+        data = self.client.get(reverse("api:v1_perfil", args=[self.profesor.user.public_uid])).json()["data"]
+        self.assertEqual(data["username"], self.profesor.user.username)
+        self.assertNotIn("email", data)
+        self.assertNotIn("telefono", data)
+
+    @override_settings(NPLUSONE_MODE="raise")
+    def test_presupuesto_de_consultas(self):
+        @api_endpoint(budget=1)
+        def view(request):
+            list(Ramo.objects.all())
+            list(Ramo.objects.all())
+            return JsonResponse({})
+
+        with self.assertRaises(QueryBudgetExceeded):
+            view(RequestFactory().get("/"))
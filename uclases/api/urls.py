@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('v1/ofertas/', views.ofertas, name='v1_ofertas'),
+    path('v1/ofertas/<int:pk>/', views.oferta, name='v1_oferta'),
+    path('v1/solicitudes/', views.solicitudes, name='v1_solicitudes'),
+    path('v1/solicitudes/<int:pk>/', views.solicitud, name='v1_solicitud'),
+    path('v1/horarios/', views.horarios, name='v1_horarios'),
+    path('v1/perfiles/<uuid:public_uid>/', views.perfil, name='v1_perfil'),
+]
@@ -0,0 +1,214 @@
+"""
+API JSON v1 (solo lectura): ofertas, solicitudes, horarios con cupos y perfiles públicos.
+
+Todos los endpoints aceptan ``?fields=a,b`` para pedir solo algunos campos;
+los listados además ``?limit=`` (máx. 100) y ``?cursor=`` (del enlace
+``next``). Ver ``api.base`` para el detalle de paginación, ETags y
+presupuestos de consultas.
+"""
+
+import uuid
+
+from django.db.models import F, Prefetch
+from django.urls import reverse
+
+from accounts.models import Perfil
+from core.db_router import use_replica
+from courses.models import HorarioOfertado, OfertaClase, SolicitudClase
+from courses.services.availability_service import AvailabilityService
+
+from .base import ApiError, Field, Resource, api_endpoint, parse_int
+
+
+def _cupos_libres():
+    return {
+        'ocupados': AvailabilityService.active_inscriptions_subquery(),
+        'cupos_libres': F('cupos_totales') - F('ocupados'),
+    }
+
+
+def _horario(horario):
+    return {
+        'id': horario.pk,
+        'dia': horario.dia,
+        'dia_label': horario.get_dia_display(),
+        'hora_inicio': horario.hora_inicio.strftime('%H:%M'),
+        'hora_fin': horario.hora_fin.strftime('%H:%M'),
+        'cupos_totales': horario.cupos_totales,
+        'cupos_libres': horario.cupos_libres,
+    }
+
+
+def _perfil(perfil):
+    user = perfil.user
+    return {
+        'uid': str(user.public_uid),
+        'username': user.username,
+        'rating_promedio': float(perfil.rating_promedio),
+    }
+
+
+def _foto(perfil):
+    if perfil.foto_file:
+        return perfil.foto_file.url
+    return perfil.foto_url or None
+
+
+def _ramo(ramo):
+    return {'id': ramo.pk, 'codigo': ramo.codigo, 'nombre': ramo.name}
+
+
+OFERTAS = Resource(
+    queryset=lambda: OfertaClase.objects.filter(public=True),
+    fields={
+        'id': Field(lambda o: o.pk),
+        'titulo': Field(lambda o: o.titulo),
+        'descripcion': Field(lambda o: o.descripcion),
+        'fecha_publicacion': Field(lambda o: o.fecha_publicacion),
+        'ramo': Field(lambda o: _ramo(o.ramo), select_related=['ramo']),
+        'profesor': Field(lambda o: _perfil(o.profesor), select_related=['profesor__user']),
+        'horarios': Field(
+            lambda o: [_horario(h) for h in o.horarios.all()],
+            prefetch_related=[Prefetch(
+                'horarios',
+                queryset=HorarioOfertado.objects.annotate(**_cupos_libres()).order_by('dia', 'hora_inicio'),
+            )],
+        ),
+        'total_comentarios': Field(lambda o: o.total_comentarios),
+        'url': Field(lambda o: reverse('courses:oferta_detail', args=[o.pk])),
+    },
+)
+
+SOLICITUDES = Resource(
+    queryset=lambda: SolicitudClase.objects.filter(public=True),
+    fields={
+        'id': Field(lambda s: s.pk),
+        'titulo': Field(lambda s: s.titulo),
+        'descripcion': Field(lambda s: s.descripcion),
+        'fecha_publicacion': Field(lambda s: s.fecha_publicacion),
+        'ramo': Field(lambda s: _ramo(s.ramo), select_related=['ramo']),
+        'solicitante': Field(lambda s: _perfil(s.solicitante), select_related=['solicitante__user']),
+        'total_comentarios': Field(lambda s: s.total_comentarios),
+        'url': Field(lambda s: reverse('courses:solicitud_detail', args=[s.pk])),
+    },
+)
+
+HORARIOS = Resource(
+    # Same seat rule as inscribirse_view: cupos_totales minus PENDIENTE/ACEPTADO
+    queryset=lambda: HorarioOfertado.objects.filter(oferta__public=True).annotate(**_cupos_libres()),
+    fields={
+        'id': Field(lambda h: h.pk),
+        'oferta': Field(lambda h: {'id': h.oferta_id, 'titulo': h.oferta.titulo}, select_related=['oferta']),
+        'dia': Field(lambda h: h.dia),
+        'dia_label': Field(lambda h: h.get_dia_display()),
+        'hora_inicio': Field(lambda h: h.hora_inicio.strftime('%H:%M')),
+        'hora_fin': Field(lambda h: h.hora_fin.strftime('%H:%M')),
+        'cupos_totales': Field(lambda h: h.cupos_totales),
+        'cupos_libres': Field(lambda h: h.cupos_libres),
+    },
+    descending=False,
+)
+
+PERFILES = Resource(
+    # Contact data (email, teléfono) is not published
+    queryset=lambda: Perfil.objects.filter(user__is_active=True).select_related('user'),
+    fields={
+        'uid': Field(lambda p: str(p.user.public_uid)),
+        'username': Field(lambda p: p.user.username),
+        'nombre': Field(lambda p: p.user.get_full_name()),
+        'descripcion': Field(lambda p: p.descripcion),
+        'carrera': Field(lambda p: p.carrera.name if p.carrera else None, select_related=['carrera']),
+        'rating_promedio': Field(lambda p: p.rating_promedio),
+        'total_ratings': Field(lambda p: p.total_ratings),
+        'foto': Field(_foto),
+        'url': Field(lambda p: reverse('accounts:profile_detail', args=[p.user.public_uid])),
+    },
+)
+
+
+def _publication_filter(request, author):
+    ramo = parse_int(request, 'ramo')
+    uid = request.GET.get('perfil')
+    if uid:
+        try:
+            uid = uuid.UUID(uid)
+        except ValueError:
+            raise ApiError("perfil debe ser un UUID") from None
+
+    def apply(queryset):
+        if ramo is not None:
+            queryset = queryset.filter(ramo_id=ramo)
+        if uid:
+            queryset = queryset.filter(**{f'{author}__user__public_uid': uid})
+        return queryset
+    return apply
+
+
+@use_replica
+@api_endpoint(budget=2)
+def ofertas(request):
+    """
+    Ofertas públicas, más nuevas primero.
+
+    Filtros GET: ``ramo`` (id) y ``perfil`` (uid del profesor).
+    """
+    return OFERTAS.list(request, _publication_filter(request, 'profesor'))
+
+
+@use_replica
+@api_endpoint(budget=2)
+def oferta(request, pk):
+    """Una oferta pública con sus horarios y cupos libres."""
+    return OFERTAS.detail(request, pk=pk)
+
+
+@use_replica
+@api_endpoint(budget=1)
+def solicitudes(request):
+    """
+    Solicitudes públicas, más nuevas primero.
+
+    Filtros GET: ``ramo`` (id) y ``perfil`` (uid del solicitante).
+    """
+    return SOLICITUDES.list(request, _publication_filter(request, 'solicitante'))
+
+
+@use_replica
+@api_endpoint(budget=1)
+def solicitud(request, pk):
+    """Una solicitud pública."""
+    return SOLICITUDES.detail(request, pk=pk)
+
+
+@use_replica
+@api_endpoint(budget=1)
+def horarios(request):
+    """
+    Horarios de ofertas públicas con ``cupos_libres``.
+
+    Filtros GET: ``oferta`` (id), ``ramo`` (id), ``dia`` (1-7) y
+    ``disponibles=1`` (solo con cupos libres).
+    """
+    oferta_id, ramo, dia = parse_int(request, 'oferta'), parse_int(request, 'ramo'), parse_int(request, 'dia')
+    disponibles = request.GET.get('disponibles')
+    if disponibles not in (None, '', '0', '1'):
+        raise ApiError("disponibles debe ser 0 o 1")
+
+    def apply(queryset):
+        if oferta_id is not None:
+            queryset = queryset.filter(oferta_id=oferta_id)
+        if ramo is not None:
+            queryset = queryset.filter(oferta__ramo_id=ramo)
+        if dia is not None:
+            queryset = queryset.filter(dia=dia)
+        if disponibles == '1':
+            queryset = queryset.filter(cupos_libres__gt=0)
+        return queryset
+    return HORARIOS.list(request, apply)
+
+
+@use_replica
+@api_endpoint(budget=1)
+def perfil(request, public_uid):
+    """Perfil público (sin datos de contacto)."""
+    return PERFILES.detail(request, user__public_uid=public_uid)
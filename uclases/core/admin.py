@@ -0,0 +1,35 @@
+"""
+Utilidades compartidas por los ``admin.py`` de las apps.
+"""
+
+from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.pagination import EstimatedCountPaginator
+
+
+def count_subquery(queryset, field):
+    """
+    Subconsulta correlacionada que cuenta las filas de ``queryset`` que apuntan a la fila externa.
+
+    A diferencia de ``Count`` sobre un join, no multiplica filas al anotar varias
+    relaciones y el listado no necesita ``GROUP BY``.
+
+    Args:
+        queryset: Filas a contar (ej: ``OfertaClase.objects.all()``)
+        field: FK de esas filas hacia el modelo del listado (ej: ``'ramo'``)
+    """
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base para listados de tablas que pueden tener millones de filas.
+
+    No hace el ``COUNT(*)`` extra de "mostrar todos" y, sin filtros, usa el
+    conteo estimado del motor para paginar (``core.pagination``).
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
@@ -0,0 +1,189 @@
+"""
+Configuración de base de datos (SQLite afinado o PostgreSQL con pool).
+
+El motor se elige con variables de entorno (ver ``database_from_env``):
+sin configuración se usa SQLite, con ``DB_ENGINE=postgres`` se usa
+PostgreSQL con el pool de conexiones de psycopg integrado en Django 5.
+
+SQLite por defecto usa journal en modo DELETE y transacciones diferidas, lo
+que provoca errores "database is locked" cuando varias requests escriben a la
+vez (inscripciones, notificaciones). Este módulo:
+
+- Aplica PRAGMAs de rendimiento en cada conexión nueva mediante la señal
+  ``connection_created`` (WAL, ``synchronous=NORMAL``, mmap, caché y
+  ``busy_timeout``).
+- Construye la entrada de ``DATABASES`` con conexiones persistentes y
+  transacciones ``IMMEDIATE`` para que los escritores esperen su turno en
+  vez de fallar al promover un lock de lectura.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Applied in order on every new connection. journal_mode=WAL is persistent in
+# the database file, the rest are per-connection.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    # Durable at checkpoints; safe with WAL and much cheaper than FULL
+    ("synchronous", "NORMAL"),
+    # Milliseconds a writer waits for the lock before raising
+    ("busy_timeout", 5000),
+    # Negative value = size in KiB (64 MiB page cache)
+    ("cache_size", -64000),
+    # Memory-map up to 256 MiB of the database file
+    ("mmap_size", 268435456),
+    ("temp_store", "MEMORY"),
+)
+
+# Seconds a connection is reused across requests (0 = close after each request)
+SQLITE_CONN_MAX_AGE = 600
+
+# psycopg_pool defaults, overridable with DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT
+POSTGRES_POOL_MIN_SIZE = 2
+POSTGRES_POOL_MAX_SIZE = 10
+POSTGRES_POOL_TIMEOUT = 10
+
+
+def apply_sqlite_pragmas(cursor, pragmas=SQLITE_PRAGMAS):
+    """Ejecuta los PRAGMAs dados sobre un cursor DB-API de SQLite."""
+    for name, value in pragmas:
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Aplica ``SQLITE_PRAGMAS`` a cada conexión SQLite recién abierta.
+
+    Se omiten las bases en memoria (usadas por los tests), donde WAL y mmap
+    no aplican.
+    """
+    if connection.vendor != "sqlite" or connection.is_in_memory_db():
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor)
+
+
+def sqlite_database(name):
+    """
+    Devuelve la configuración de ``DATABASES`` para un archivo SQLite.
+
+    Args:
+        name: Ruta al archivo ``.sqlite3``.
+
+    Returns:
+        dict: Entrada lista para ``DATABASES['default']``.
+    """
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "CONN_MAX_AGE": SQLITE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Take the write lock at BEGIN so concurrent writers queue on
+            # busy_timeout instead of failing when upgrading a read lock
+            "transaction_mode": "IMMEDIATE",
+        },
+    }
+
+
+def postgres_database(name, user="", password="", host="", port="", pool_min_size=POSTGRES_POOL_MIN_SIZE,
+                      pool_max_size=POSTGRES_POOL_MAX_SIZE, pool_timeout=POSTGRES_POOL_TIMEOUT):
+    """
+    Devuelve la configuración de ``DATABASES`` para PostgreSQL con pool.
+
+    Usa el soporte nativo de Django 5 para ``psycopg_pool``: cada worker
+    mantiene entre ``pool_min_size`` y ``pool_max_size`` conexiones abiertas.
+    Con pool, ``CONN_MAX_AGE`` debe ser 0 (el pool gestiona la reutilización).
+
+    Returns:
+        dict: Entrada lista para ``DATABASES['default']``.
+    """
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": name,
+        "USER": user,
+        "PASSWORD": password,
+        "HOST": host,
+        "PORT": port,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": False,
+        "OPTIONS": {
+            "pool": {
+                "min_size": pool_min_size,
+                "max_size": pool_max_size,
+                "timeout": pool_timeout,
+            },
+        },
+    }
+
+
+def database_from_env(sqlite_path, environ=None):
+    """
+    Construye ``DATABASES['default']`` a partir de variables de entorno.
+
+    Variables:
+        DB_ENGINE: ``sqlite`` (por defecto) o ``postgres``.
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT: conexión a PostgreSQL.
+        DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT: tamaño del pool.
+
+    Args:
+        sqlite_path: Archivo SQLite usado cuando ``DB_ENGINE`` es ``sqlite``.
+        environ: Mapeo de variables (por defecto ``os.environ``).
+
+    Raises:
+        ImproperlyConfigured: Si el motor no es soportado o falta ``DB_NAME``.
+    """
+    env = os.environ if environ is None else environ
+    engine = env.get("DB_ENGINE", "sqlite").strip().lower()
+
+    if engine in ("sqlite", "sqlite3"):
+        return sqlite_database(env.get("DB_NAME") or sqlite_path)
+
+    if engine in ("postgres", "postgresql"):
+        if not env.get("DB_NAME"):
+            raise ImproperlyConfigured("DB_NAME es obligatorio cuando DB_ENGINE=postgres.")
+        return postgres_database(
+            name=env["DB_NAME"],
+            user=env.get("DB_USER", ""),
+            password=env.get("DB_PASSWORD", ""),
+            host=env.get("DB_HOST", ""),
+            port=env.get("DB_PORT", ""),
+            pool_min_size=int(env.get("DB_POOL_MIN_SIZE", POSTGRES_POOL_MIN_SIZE)),
+            pool_max_size=int(env.get("DB_POOL_MAX_SIZE", POSTGRES_POOL_MAX_SIZE)),
+            pool_timeout=int(env.get("DB_POOL_TIMEOUT", POSTGRES_POOL_TIMEOUT)),
+        )
+
+    raise ImproperlyConfigured(f"DB_ENGINE no soportado: {engine!r} (usa 'sqlite' o 'postgres').")
+
+
+def replica_from_env(primary, environ=None):
+    """
+    Construye el alias ``replica`` a partir de variables de entorno.
+
+    Variables:
+        DB_REPLICA_NAME: Archivo SQLite o base PostgreSQL de la réplica.
+        DB_REPLICA_HOST, DB_REPLICA_PORT: Servidor de la réplica (PostgreSQL).
+
+    Args:
+        primary: Configuración de ``DATABASES['default']``.
+        environ: Mapeo de variables (por defecto ``os.environ``).
+
+    Returns:
+        dict: ``{'replica': {...}}`` o ``{}`` si no hay réplica configurada.
+    """
+    env = os.environ if environ is None else environ
+    if not env.get("DB_REPLICA_NAME"):
+        return {}
+
+    replica = {**primary, "OPTIONS": dict(primary.get("OPTIONS", {})), "NAME": env["DB_REPLICA_NAME"]}
+    if env.get("DB_REPLICA_HOST"):
+        replica["HOST"] = env["DB_REPLICA_HOST"]
+    if env.get("DB_REPLICA_PORT"):
+        replica["PORT"] = env["DB_REPLICA_PORT"]
+    # Tests run against a single database: the replica mirrors default
+    replica["TEST"] = {"MIRROR": "default"}
+    return {"replica": replica}
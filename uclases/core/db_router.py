@@ -0,0 +1,112 @@
+"""
+Enrutamiento de lecturas a una réplica de la base de datos.
+
+Las vistas de solo lectura (listados, detalles, perfiles) se decoran con
+``use_replica``: durante una request GET/HEAD sus consultas van al alias
+``replica``. Las escrituras siempre van a ``default``.
+
+Para garantizar *read-your-writes*, ``ReplicaPinMiddleware`` marca con una
+cookie de corta duración a quien acaba de escribir (POST, PUT, ...); mientras
+la cookie exista sus lecturas siguen yendo a ``default`` aunque la vista esté
+decorada, dando tiempo a que la réplica se ponga al día.
+
+Si no hay alias ``replica`` configurado todo sigue yendo a ``default``.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+REPLICA_ALIAS = "replica"
+PRIMARY_ALIAS = "default"
+PIN_COOKIE_NAME = "db_pin_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Set only while a decorated read-only view is running
+_reads_from_replica = ContextVar("reads_from_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """Enruta a la réplica las lecturas ejecutadas dentro del bloque."""
+    token = _reads_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _reads_from_replica.reset(token)
+
+
+def use_replica(view_func):
+    """
+    Decorador para vistas que pueden leer desde la réplica.
+
+    Solo aplica a métodos seguros y a usuarios sin escrituras recientes
+    (sin cookie de pin). El resto de requests usa la base primaria.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and PIN_COOKIE_NAME not in request.COOKIES
+            and replica_configured()
+        ):
+            with replica_reads():
+                return view_func(request, *args, **kwargs)
+        return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Router que envía lecturas a ``replica`` solo dentro de ``replica_reads``.
+
+    Las escrituras y cualquier lectura fuera de una vista decorada usan
+    ``default``. Ambos alias comparten esquema, así que se permiten relaciones
+    entre objetos de cualquiera de ellos.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _reads_from_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY_ALIAS, REPLICA_ALIAS}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db in (PRIMARY_ALIAS, REPLICA_ALIAS)
+
+
+class ReplicaPinMiddleware:
+    """
+    Fija al usuario a la base primaria tras una escritura (read-your-writes).
+
+    Después de cualquier request con método no seguro agrega una cookie que
+    dura ``REPLICA_PIN_SECONDS``; ``use_replica`` la respeta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
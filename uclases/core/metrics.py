@@ -0,0 +1,335 @@
+"""
+Métricas de la aplicación en formato de texto de Prometheus.
+
+Un registro en memoria con tres tipos de métrica:
+
+- ``Counter``: solo sube (requests, consultas, notificaciones creadas).
+- ``Histogram``: distribución de duraciones en buckets fijos.
+- ``Gauge``: valor calculado al momento del scrape con una función (por
+  ejemplo, notificaciones sin leer). No se guarda estado por proceso.
+
+Se publican en ``/metrics`` (vista ``metrics_view``).
+
+Varios procesos (gunicorn con workers pre-fork): si ``METRICS_DIR`` está
+definido, cada proceso escribe sus counters e histogramas a
+``METRICS_DIR/<pid>-<token>.json`` como máximo cada
+``METRICS_FLUSH_SECONDS`` (al final de las requests) y al terminar. El
+scrape suma los archivos de todos los procesos, incluidos los que ya
+murieron, para que los counters no retrocedan. El directorio debe vaciarse al
+iniciar el servidor. Sin ``METRICS_DIR`` se publica solo el proceso actual.
+
+Las métricas generales (HTTP, SQL, caché) se definen aquí y las alimentan
+``core.perf.PerfMiddleware`` y ``CacheCountingMixin``; las de dominio se
+definen junto a su código (``courses/signals.py``,
+``notifications/services/notification_service.py``).
+"""
+
+import atexit
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from a cached page to a slow report
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labels}, recibió {labels}")
+        return tuple(str(value) for value in labels)
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """Contador monótono, opcionalmente con etiquetas."""
+
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    @staticmethod
+    def merge(current, other):
+        return (current or 0) + other
+
+    def render(self, samples):
+        for key, value in samples.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Histograma de buckets fijos (``le`` acumulados al publicar)."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # One slot per bucket plus +Inf, then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self._values.items()]
+
+    @staticmethod
+    def merge(current, other):
+        if current is None:
+            return list(other)
+        return [a + b for a, b in zip(current, other)]
+
+    def render(self, samples):
+        for key, state in samples.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), state[:-1]):
+                cumulative += count
+                le = (("le", _format_value(float(bound))),)
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(state[-1])}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class Gauge(_Metric):
+    """
+    Valor calculado al publicar: ``function(samples)`` retorna un número o un
+    dict {tupla de etiquetas: número}. ``samples`` son los counters e
+    histogramas ya sumados entre procesos.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, function, labels=()):
+        super().__init__(name, documentation, labels)
+        self.function = function
+
+    def collect(self, samples):
+        value = self.function(samples)
+        if not isinstance(value, dict):
+            value = {(): value}
+        return {tuple(str(label) for label in key): value for key, value in value.items() if value is not None}
+
+    def render(self, samples):
+        for key, value in samples.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(float(value))}"
+
+
+class Registry:
+    """Métricas del proceso y su agregación entre procesos (``METRICS_DIR``)."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._token = None
+        self._last_flush = 0.0
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrica {name} ya existe con otro tipo")
+            return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(Counter, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labels, buckets)
+
+    def gauge(self, name, documentation, function, labels=()):
+        return self._register(Gauge, name, documentation, function, labels)
+
+    def reset(self):
+        """Vacía los valores del proceso (tests)."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self):
+        """Counters e histogramas del proceso: {nombre: [[etiquetas, valor], ...]}."""
+        return {name: metric.snapshot() for name, metric in self._metrics.items() if metric.type != "gauge"}
+
+    @staticmethod
+    def directory():
+        path = getattr(settings, "METRICS_DIR", None)
+        return Path(path) if path else None
+
+    def _process_file(self, directory):
+        pid = os.getpid()
+        if pid != self._pid:
+            # Forked worker: start from zero, the parent's values are in the parent's file
+            if self._pid is not None:
+                self.reset()
+            self._pid, self._token = pid, uuid4().hex[:8]
+        return directory / f"{self._pid}-{self._token}.json"
+
+    def flush(self):
+        """Escribe los valores del proceso en ``METRICS_DIR`` (reemplazo atómico)."""
+        directory = self.directory()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        path = self._process_file(directory)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        """``flush`` si pasaron ``METRICS_FLUSH_SECONDS`` desde el anterior."""
+        if self.directory() is None:
+            return
+        if time.monotonic() - self._last_flush >= getattr(settings, "METRICS_FLUSH_SECONDS", 1.0):
+            self.flush()
+
+    def collect(self):
+        """Valores sumados entre procesos: {nombre: {tupla de etiquetas: valor}}."""
+        snapshots = []
+        directory = self.directory()
+        if directory is None:
+            snapshots.append(self.snapshot())
+        else:
+            self.flush()
+            for path in directory.glob("*.json"):
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    # Being replaced by its process; the next scrape reads it
+                    continue
+
+        samples = {name: {} for name in self._metrics}
+        for snapshot in snapshots:
+            for name, rows in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                merged = samples[name]
+                for labels, value in rows:
+                    key = tuple(labels)
+                    merged[key] = metric.merge(merged.get(key), value)
+        for name, metric in self._metrics.items():
+            if metric.type == "gauge":
+                samples[name] = metric.collect(samples)
+        return samples
+
+    def render(self):
+        """Texto de exposición de Prometheus (formato 0.0.4)."""
+        samples = self.collect()
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(dict(sorted(samples[name].items()))))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+
+def _cache_hit_ratio(samples):
+    requests = samples.get("uclases_cache_requests_total", {})
+    hits = requests.get(("hit",), 0)
+    total = hits + requests.get(("miss",), 0)
+    return hits / total if total else None
+
+
+HTTP_REQUESTS = registry.counter(
+    "uclases_http_requests_total", "Requests atendidas por vista, método y código de estado.",
+    ("view", "method", "status"),
+)
+HTTP_LATENCY = registry.histogram(
+    "uclases_http_request_duration_seconds", "Duración de las requests por vista.", ("view", "method"),
+)
+DB_QUERY_DURATION = registry.histogram(
+    "uclases_db_query_duration_seconds", "Duración de cada consulta SQL ejecutada en una request.",
+    ("alias",), buckets=DB_BUCKETS,
+)
+CACHE_REQUESTS = registry.counter(
+    "uclases_cache_requests_total", "Lecturas de caché por resultado (hit o miss).", ("result",),
+)
+registry.gauge(
+    "uclases_cache_hit_ratio", "Fracción de lecturas de caché que fueron hit desde el inicio.", _cache_hit_ratio,
+)
+
+
+def metrics_view(request):
+    """
+    Publica las métricas en formato de texto de Prometheus.
+
+    Solo responde a requests con ``Authorization: Bearer <METRICS_TOKEN>`` o
+    a IPs en ``METRICS_ALLOWED_IPS`` (vacía por defecto: sin configurar
+    nada, ``/metrics`` responde 403).
+
+    Args:
+        request (HttpRequest): Request del scraper.
+
+    Returns:
+        HttpResponse: Métricas en ``text/plain; version=0.0.4``, o 403.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    authorized = (
+        request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ())
+        or (token and hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()))
+    )
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
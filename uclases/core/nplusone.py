@@ -0,0 +1,172 @@
+"""
+Detector de consultas N+1.
+
+Un N+1 aparece como la misma consulta (misma forma, distintos parámetros)
+ejecutada muchas veces en una request: un ``exists()`` por inscripción, el
+autor de cada comentario, las acciones de cada notificación, etc.
+
+``detect_n_plus_one`` registra cada consulta con ``connection.execute_wrapper``
+y la reduce a una huella: el SQL sin literales, con las listas ``IN (...)``
+colapsadas. Cuando una huella supera ``threshold`` repeticiones se guarda el
+punto del código del proyecto que la disparó (archivo:línea, función).
+
+``NPlusOneMiddleware`` lo aplica a las requests según ``NPLUSONE_MODE``:
+
+- ``"raise"``: lanza ``NPlusOneError`` (lo activa el runner de tests,
+  ``core.test_runner``).
+- ``"log"``: revisa una fracción ``NPLUSONE_SAMPLE_RATE`` de las requests y
+  registra lo detectado en el logger ``uclases.nplusone``.
+- ``"off"``: el middleware no se carga.
+"""
+
+import json
+import logging
+import random
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("uclases.nplusone")
+
+DEFAULT_THRESHOLD = 5
+
+_PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+# Query wrappers of the project itself, never the real call site
+_INSTRUMENTATION_FILES = {str(Path(__file__).resolve()), str(Path(__file__).resolve().with_name("perf.py"))}
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?|\d+|'[^']*')\s*,?)+\)", re.IGNORECASE)
+_SAVEPOINT_RE = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+# ContentType lookups are cached by their manager: at most one per model and process
+_IGNORED_RE = re.compile(r'\bFROM "django_content_type"')
+
+
+class NPlusOneError(AssertionError):
+    """Se repitió la misma consulta más veces que el umbral permitido."""
+
+
+def fingerprint(sql):
+    """Forma de una consulta: sin literales y con ``IN (...)`` colapsado."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return " ".join(sql.split())
+
+
+def call_site():
+    """Frame más interno del proyecto (fuera de la instrumentación) en la pila actual."""
+    frame = sys._getframe(1)
+    in_template = False
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if "/django/template/" in filename:
+            in_template = True
+        if filename.startswith(_PROJECT_DIR) and filename not in _INSTRUMENTATION_FILES and "site-packages" not in filename:
+            where = f"{Path(filename).relative_to(_PROJECT_DIR)}:{frame.f_lineno} en {frame.f_code.co_name}"
+            return f"{where} (al renderizar un template)" if in_template else where
+        frame = frame.f_back
+    return "desconocido"
+
+
+class QueryLog:
+    """Huellas contadas durante un bloque ``detect_n_plus_one``."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.sites = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not _SAVEPOINT_RE.match(sql) and not _IGNORED_RE.search(sql):
+            shape = fingerprint(sql)
+            self.counts[shape] += 1
+            if self.counts[shape] == self.threshold + 1:
+                self.sites[shape] = call_site()
+        return execute(sql, params, many, context)
+
+    def problems(self):
+        """Lista de (veces, huella, punto del código) sobre el umbral, de más a menos repetida."""
+        return sorted(
+            ((self.counts[shape], shape, site) for shape, site in self.sites.items()),
+            reverse=True,
+        )
+
+    def report(self):
+        lines = [f"Consultas repetidas más de {self.threshold} veces (posible N+1):"]
+        for count, shape, site in self.problems():
+            lines.append(f"  {count}x en {site}\n      {shape[:300]}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def detect_n_plus_one(threshold=None, raise_error=True):
+    """
+    Cuenta las consultas del bloque y falla si alguna forma se repite demasiado.
+
+    Uso en tests de servicios (fuera de una request):
+
+        with detect_n_plus_one():
+            CommentService.get_page(oferta, 1)
+
+    Args:
+        threshold: Repeticiones permitidas por forma (``NPLUSONE_THRESHOLD`` por defecto)
+        raise_error: Si es False no lanza; revisar ``log.problems()`` al salir
+
+    Yields:
+        QueryLog: Registro de consultas del bloque
+    """
+    if threshold is None:
+        threshold = getattr(settings, "NPLUSONE_THRESHOLD", DEFAULT_THRESHOLD)
+    log = QueryLog(threshold)
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(log))
+        yield log
+    if raise_error and log.problems():
+        raise NPlusOneError(log.report())
+
+
+class NPlusOneMiddleware:
+    """
+    Revisa las requests en busca de N+1 según ``NPLUSONE_MODE``.
+
+    Settings:
+        NPLUSONE_MODE: ``"raise"``, ``"log"`` u ``"off"``.
+        NPLUSONE_THRESHOLD: Repeticiones permitidas de una misma consulta.
+        NPLUSONE_SAMPLE_RATE: Fracción de requests revisadas en modo ``"log"``.
+    """
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, "NPLUSONE_MODE", "off")
+        if self.mode not in ("raise", "log"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "NPLUSONE_SAMPLE_RATE", 0.0)
+
+    def __call__(self, request):
+        if self.mode == "log" and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with detect_n_plus_one(raise_error=False) as log:
+            response = self.get_response(request)
+
+        if log.problems():
+            if self.mode == "raise":
+                raise NPlusOneError(f"{request.method} {request.path}\n{log.report()}")
+            match = getattr(request, "resolver_match", None)
+            for count, shape, site in log.problems():
+                logger.warning(json.dumps({
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "count": count,
+                    "site": site,
+                    "sql": shape[:500],
+                }, sort_keys=True, ensure_ascii=False))
+        return response
@@ -0,0 +1,64 @@
+"""
+Paginación con conteo estimado para tablas grandes.
+
+Paginar un listado sin filtros hace ``SELECT COUNT(*)`` de toda la tabla, que
+en PostgreSQL y SQLite recorre todas las filas. ``EstimatedCountPaginator``
+usa en ese caso la estadística que mantiene el motor (``pg_class.reltuples``
+tras ``ANALYZE``/autovacuum, ``sqlite_stat1`` tras ``ANALYZE``) si indica al
+menos ``ESTIMATE_MIN_ROWS`` filas. Con filtros, o sin estadísticas, cuenta
+normalmente.
+"""
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+# Below this the exact count is cheap and preferable
+ESTIMATE_MIN_ROWS = 100_000
+
+
+def estimated_count(model, using="default"):
+    """
+    Cantidad aproximada de filas de la tabla del modelo según el motor.
+
+    Args:
+        model: Modelo de Django
+        using: Alias de la BD
+
+    Returns:
+        int | None: Estimación, o None si el motor no tiene estadísticas
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            elif connection.vendor == "sqlite":
+                # The first number of every stat row is the table's row count
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        # sqlite_stat1 only exists after the first ANALYZE
+        return None
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    # reltuples is -1 on tables never analyzed
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """``Paginator`` que usa ``estimated_count`` para listados grandes sin filtros."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.has_filters():
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+                return estimate
+        return super().count
@@ -0,0 +1,263 @@
+"""
+Instrumentación de rendimiento por request.
+
+``PerfMiddleware`` mide para cada request:
+
+- Consultas SQL (cantidad y tiempo) con ``connection.execute_wrapper`` en
+  todos los alias de BD.
+- Tiempo de render de templates (backend ``TimedDjangoTemplates``).
+- Hits y misses de caché (backends con ``CacheCountingMixin``).
+- Tiempo en ``NotificationService`` (decorador ``record_time``).
+
+Además alimenta las métricas de Prometheus de ``core.metrics`` (latencia
+por vista, duración de consultas SQL, lecturas de caché).
+
+Los resultados se envían en el header ``Server-Timing`` (visible en la
+pestaña Network del navegador) solo con ``DEBUG`` o a usuarios staff, porque
+revelan cuántas consultas hace cada vista. Para una fracción ``PERF_LOG_SAMPLE_RATE``
+de las requests o las que superen ``PERF_SLOW_REQUEST_MS``, como una línea
+JSON en el logger ``uclases.perf``.
+
+Con ``PERF_INSTRUMENTATION = False`` el middleware se quita de la cadena
+(``MiddlewareNotUsed``) y los demás ganchos solo consultan una ContextVar
+vacía, así que el costo es despreciable.
+"""
+
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+from core.metrics import CACHE_REQUESTS, DB_QUERY_DURATION, HTTP_LATENCY, HTTP_REQUESTS, registry
+
+logger = logging.getLogger("uclases.perf")
+
+# Set only while PerfMiddleware is handling a request
+_current = ContextVar("request_metrics", default=None)
+
+# Anything else is reported as "other" to keep metric labels bounded
+_HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class RequestMetrics:
+    """Acumuladores de una request."""
+
+    __slots__ = (
+        "sql_count", "sql_ms", "template_ms", "cache_hits", "cache_misses",
+        "notifications_count", "notifications_ms",
+    )
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.notifications_count = 0
+        self.notifications_ms = 0.0
+
+    def server_timing(self, total_ms):
+        """Valor del header ``Server-Timing``."""
+        parts = [
+            f'db;dur={self.sql_ms:.1f};desc="{self.sql_count} queries"',
+            f"tpl;dur={self.template_ms:.1f}",
+            f'cache;desc="hit={self.cache_hits} miss={self.cache_misses}"',
+        ]
+        if self.notifications_count:
+            parts.append(f'notif;dur={self.notifications_ms:.1f};desc="{self.notifications_count} sent"')
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+    def as_dict(self):
+        return {name: round(getattr(self, name), 2) for name in self.__slots__}
+
+
+def current_metrics():
+    """Métricas de la request en curso, o None si no se está midiendo."""
+    return _current.get()
+
+
+def record_time(field, count_field=None):
+    """
+    Decorador que suma la duración de la función a ``field`` de las métricas
+    de la request en curso (y 1 a ``count_field`` si se indica).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _current.get()
+            if metrics is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setattr(metrics, field, getattr(metrics, field) + (time.perf_counter() - start) * 1000)
+                if count_field:
+                    setattr(metrics, count_field, getattr(metrics, count_field) + 1)
+
+        return wrapper
+
+    return decorator
+
+
+class _TimedTemplate:
+    """Envuelve un template del backend de Django y mide su ``render``."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.template_ms += (time.perf_counter() - start) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Backend de templates de Django que mide el tiempo de render.
+
+    Solo se mide el template de nivel superior; sus ``include`` y ``extends``
+    quedan dentro de ese tiempo.
+    """
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+class CacheCountingMixin:
+    """Cuenta hits y misses de ``get``/``get_many`` en la request en curso."""
+
+    _MISSING = object()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._MISSING, version)
+        CACHE_REQUESTS.inc("miss" if value is self._MISSING else "hit")
+        metrics = _current.get()
+        if metrics is not None:
+            if value is self._MISSING:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is self._MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        if found:
+            CACHE_REQUESTS.inc("hit", amount=len(found))
+        if len(keys) > len(found):
+            CACHE_REQUESTS.inc("miss", amount=len(keys) - len(found))
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        return found
+
+
+class InstrumentedLocMemCache(CacheCountingMixin, LocMemCache):
+    """Caché en memoria local (la de Django por defecto) con conteo de hits/misses."""
+
+
+class PerfMiddleware:
+    """
+    Mide cada request y publica el resultado en métricas, logs y (en
+    desarrollo o para staff) ``Server-Timing``.
+
+    Settings:
+        PERF_INSTRUMENTATION: Activa la medición (si es False el middleware no se carga).
+        PERF_LOG_SAMPLE_RATE: Fracción de requests que se registran en el log (0 a 1).
+        PERF_SLOW_REQUEST_MS: Requests más lentas que esto se registran siempre.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PERF_LOG_SAMPLE_RATE", 0.0)
+        self.slow_ms = getattr(settings, "PERF_SLOW_REQUEST_MS", 500)
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(self._sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        if self._show_timing(request):
+            response["Server-Timing"] = metrics.server_timing(total_ms)
+        if total_ms >= self.slow_ms or random.random() < self.sample_rate:
+            self._log(request, response, metrics, total_ms)
+        self._export(request, response, total_ms)
+        return response
+
+    @staticmethod
+    def _show_timing(request):
+        """Server-Timing solo en desarrollo o para staff (no se expone a visitantes)."""
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        return bool(user and user.is_staff)
+
+    @staticmethod
+    def _sql_wrapper(execute, sql, params, many, context):
+        metrics = _current.get()
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_QUERY_DURATION.observe(elapsed, context["connection"].alias)
+            if metrics is not None:
+                metrics.sql_count += 1
+                metrics.sql_ms += elapsed * 1000
+
+    @staticmethod
+    def _export(request, response, total_ms):
+        """Registra la request en las métricas de ``core.metrics``."""
+        match = getattr(request, "resolver_match", None)
+        # URL name, never the raw path: unmatched URLs would explode the label set
+        view = (match.view_name or match._func_path) if match else "<unresolved>"
+        method = request.method if request.method in _HTTP_METHODS else "other"
+        HTTP_REQUESTS.inc(view, method, response.status_code)
+        HTTP_LATENCY.observe(total_ms / 1000, view, method)
+        registry.maybe_flush()
+
+    @staticmethod
+    def _log(request, response, metrics, total_ms):
+        match = getattr(request, "resolver_match", None)
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            **metrics.as_dict(),
+        }
+        logger.info(json.dumps(entry, sort_keys=True))
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.database import database_from_env, replica_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -26,6 +29,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# URL pública del sitio, para enlaces absolutos generados fuera de una request
+# o guardados en caché (por ejemplo, el feed .ics de courses)
+SITE_URL = os.environ.get("SITE_URL", "http://localhost:8000").rstrip("/")
+
 # Application definition
 INSTALLED_APPS = [
 	'django.contrib.admin',
@@ -39,23 +46,31 @@ INSTALLED_APPS = [
     'courses',
     'devtools',
     'notifications.apps.NotificationsConfig',
+    'api',
 ]
 
 MIDDLEWARE = [
+	# Outermost so its timings cover the rest of the stack (see core/perf.py)
+	'core.perf.PerfMiddleware',
+	# Counts every query of the request, including other middleware (see core/nplusone.py)
+	'core.nplusone.NPlusOneMiddleware',
 	'django.middleware.security.SecurityMiddleware',
+	'core.staticfiles.StaticFilesMiddleware',
 	'django.contrib.sessions.middleware.SessionMiddleware',
 	'django.middleware.common.CommonMiddleware',
 	'django.middleware.csrf.CsrfViewMiddleware',
 	'django.contrib.auth.middleware.AuthenticationMiddleware',
 	'django.contrib.messages.middleware.MessageMiddleware',
 	'django.middleware.clickjacking.XFrameOptionsMiddleware',
+	'core.db_router.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
 	{
-		'BACKEND': 'django.template.backends.django.DjangoTemplates',
+		# DjangoTemplates that also reports render time to core.perf
+		'BACKEND': 'core.perf.TimedDjangoTemplates',
 		'DIRS': [BASE_DIR/'templates'],
 		'APP_DIRS': True,
 		'OPTIONS': {
@@ -71,12 +86,15 @@ TEMPLATES = [
 	},
 ]
 
+# SQLite afinado por defecto; PostgreSQL con pool si DB_ENGINE=postgres (ver core/database.py)
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",   # Motor de BD
-        "NAME": BASE_DIR / "db.sqlite3",          # Ruta al archivo .sqlite3
-    }
+    "default": database_from_env(BASE_DIR / "db.sqlite3"),
 }
+# Réplica de solo lectura opcional (DB_REPLICA_NAME); ver core/db_router.py
+DATABASES.update(replica_from_env(DATABASES["default"]))
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+# Segundos que un usuario lee de la primaria tras escribir (read-your-writes)
+REPLICA_PIN_SECONDS = 10
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,11 +131,72 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+# Destino de collectstatic: archivos con hash y precomprimidos (ver core/staticfiles.py)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Media files (User uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Los archivos subidos se guardan por hash de contenido (ver core/storage.py)
+STORAGES = {
+    "default": {
+        "BACKEND": "core.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Same as Django's default cache, plus hit/miss counting for core.perf
+CACHES = {
+    "default": {
+        "BACKEND": "core.perf.InstrumentedLocMemCache",
+    },
+}
+
+# Instrumentación por request (ver core/perf.py): métricas, logs muestreados y
+# header Server-Timing (este último solo con DEBUG o para usuarios staff)
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "1") == "1"
+# Fracción de requests que se registran en el logger uclases.perf (0 a 1)
+PERF_LOG_SAMPLE_RATE = float(os.environ.get("PERF_LOG_SAMPLE_RATE", "0.01"))
+# Requests más lentas que esto (ms) se registran siempre
+PERF_SLOW_REQUEST_MS = float(os.environ.get("PERF_SLOW_REQUEST_MS", "500"))
+
+# Detector de consultas N+1 (ver core/nplusone.py): "raise", "log" u "off".
+# El runner de tests (core.test_runner) lo fuerza a "raise".
+NPLUSONE_MODE = os.environ.get("NPLUSONE_MODE", "log")
+# Repeticiones permitidas de una misma consulta en una request
+NPLUSONE_THRESHOLD = int(os.environ.get("NPLUSONE_THRESHOLD", "5"))
+# Fracción de requests revisadas en modo "log" (0 a 1)
+NPLUSONE_SAMPLE_RATE = float(os.environ.get("NPLUSONE_SAMPLE_RATE", "0.01"))
+
+TEST_RUNNER = "core.test_runner.NPlusOneTestRunner"
+
+# Métricas de Prometheus en /metrics (ver core/metrics.py).
+# Con workers pre-fork, un directorio compartido y vacío al iniciar el servidor.
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+# Cada cuántos segundos un proceso escribe sus métricas en METRICS_DIR
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "1"))
+# Quién puede leer /metrics: "Authorization: Bearer <METRICS_TOKEN>" o estas IPs.
+# La lista es opcional (vacía por defecto): detrás de un proxy local todas las
+# requests llegan desde 127.0.0.1, así que solo es segura sin proxy delante.
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get("METRICS_ALLOWED_IPS", "").split(",") if ip.strip()]
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "uclases.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        "uclases.nplusone": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+        "uclases.api": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+    },
+}
+
 AUTH_USER_MODEL = 'accounts.User'
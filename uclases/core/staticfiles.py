@@ -0,0 +1,204 @@
+"""
+Pipeline de archivos estáticos: nombres con hash, precompresión y servicio.
+
+- ``CompressedManifestStaticFilesStorage``: al ejecutar ``collectstatic``
+  agrega el hash del contenido al nombre de cada archivo (``output.css`` ->
+  ``output.3f2a9c1b7d4e.css``) y genera versiones ``.gz`` y ``.br``.
+- ``StaticFilesMiddleware``: sirve ``STATIC_ROOT`` desde la aplicación,
+  eligiendo la variante comprimida según ``Accept-Encoding`` y marcando los
+  archivos con hash como inmutables.
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from stat import S_ISREG
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+from core.storage import IMMUTABLE_CACHE_CONTROL
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".mjs", ".map", ".svg", ".json", ".txt", ".html", ".xml")
+# Below this size compression overhead outweighs the savings
+MIN_COMPRESS_SIZE = 256
+# Hash inserted by ManifestStaticFilesStorage: 12 hex chars before the extension
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+# Unhashed names may change on the next deploy, keep them short-lived
+SHORT_CACHE_CONTROL = "public, max-age=60"
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage que además precomprime los archivos de texto.
+
+    Cuando aún no existe manifest (por ejemplo en tests o si no se ha corrido
+    ``collectstatic``) devuelve el nombre original en lugar de fallar.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def tolerant_converter(matchobj):
+            # Source files such as css/src/input.css reference build-time
+            # modules (@import "tailwindcss") that are not static files
+            try:
+                return converter(matchobj)
+            except ValueError:
+                return matchobj.group(0)
+
+        return tolerant_converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+                continue
+            for compressed_name in self.compress(name):
+                yield name, compressed_name, True
+
+    def compress(self, name):
+        """Escribe ``name.gz`` y ``name.br`` si reducen el tamaño del archivo."""
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return []
+
+        variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(content, quality=11)))
+
+        written = []
+        for suffix, data in variants:
+            if len(data) >= len(content):
+                continue
+            path = self.path(name + suffix)
+            with open(path, "wb") as fh:
+                fh.write(data)
+            written.append(name + suffix)
+        return written
+
+
+@lru_cache(maxsize=2048)
+def _find_variants(path, mtime_ns, dir_mtime_ns):
+    """
+    Variantes comprimidas de ``path`` en disco.
+
+    Los mtime son parte de la clave: un archivo reescrito, o un ``.gz``/``.br``
+    agregado o borrado (cambia el mtime del directorio), vuelve a buscarse.
+    """
+    variants = {}
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if os.path.isfile(path + suffix):
+            variants[encoding] = path + suffix
+    return variants
+
+
+def _stat_variants(root, relative_path):
+    """
+    Busca el archivo y sus variantes comprimidas en disco.
+
+    Cuesta dos ``stat`` por request (archivo y directorio); la búsqueda de
+    variantes se cachea por mtime y los archivos inexistentes no se cachean.
+    """
+    try:
+        path = safe_join(root, relative_path)
+        stat = os.stat(path)
+        dir_stat = os.stat(os.path.dirname(path))
+    except (ValueError, OSError):
+        return None
+    if not S_ISREG(stat.st_mode):
+        return None
+
+    variants = _find_variants(path, stat.st_mtime_ns, dir_stat.st_mtime_ns)
+    return path, variants, stat.st_mtime, stat.st_size
+
+
+def _accepted_encodings(header):
+    """Devuelve las codificaciones aceptadas por el cliente (ignora ``q=0``)."""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Sirve ``STATIC_ROOT`` con negociación de codificación y caché inmutable.
+
+    Debe ubicarse al inicio de ``MIDDLEWARE`` para que los estáticos no pasen
+    por sesiones ni autenticación. Si ``STATIC_ROOT`` no está configurado o el
+    archivo no existe, la request sigue su curso normal.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.static_url = settings.STATIC_URL or ""
+        if not self.static_url.startswith("/"):
+            self.static_url = "/" + self.static_url
+        self.static_root = str(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+
+    def __call__(self, request):
+        if (
+            self.static_root
+            and request.method in ("GET", "HEAD")
+            and request.path.startswith(self.static_url)
+        ):
+            response = self.serve(request, request.path[len(self.static_url):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, relative_path):
+        found = _stat_variants(self.static_root, relative_path)
+        if found is None:
+            return None
+        path, variants, mtime, size = found
+
+        cache_control = (
+            IMMUTABLE_CACHE_CONTROL if HASHED_NAME_RE.search(relative_path) else SHORT_CACHE_CONTROL
+        )
+        accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        encoding = next((enc for enc in ("br", "gzip") if enc in variants and enc in accepted), None)
+        served_path = variants[encoding] if encoding else path
+        # Strong ETags must differ per representation: each encoding gets its own
+        etag = f'"{int(mtime):x}-{size:x}{ETAG_SUFFIXES.get(encoding, "")}"'
+
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(path)
+            response = FileResponse(open(served_path, "rb"), content_type=content_type or "application/octet-stream")
+            if encoding:
+                response["Content-Encoding"] = encoding
+            response["Content-Length"] = os.path.getsize(served_path)
+            response["Last-Modified"] = http_date(mtime)
+        if variants:
+            response["Vary"] = "Accept-Encoding"
+        response["Cache-Control"] = cache_control
+        response["ETag"] = etag
+        return response
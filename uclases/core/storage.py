@@ -0,0 +1,79 @@
+"""
+Almacenamiento de archivos media direccionado por contenido.
+
+Los archivos subidos (fotos de perfil, banners) se guardan bajo el hash
+SHA-256 de su contenido en lugar de su nombre original. Dos subidas idénticas
+apuntan al mismo archivo en disco y, como la URL cambia cuando cambia el
+contenido, los archivos pueden servirse con cabeceras de caché inmutables.
+"""
+
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.views.static import serve
+
+# One year, the conventional upper bound for "never expires"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage que nombra cada archivo según el hash de su contenido.
+
+    Un archivo subido a ``profile_pics/foto.jpg`` se guarda como
+    ``profile_pics/ab/abcdef...jpg``, donde ``abcdef...`` es el SHA-256 del
+    contenido. Si el blob ya existe no se vuelve a escribir (deduplicación).
+
+    La eliminación de blobs huérfanos queda en manos de quien reemplaza el
+    archivo (ver ``accounts.forms.ImagesForm``), ya que un mismo blob puede
+    estar referenciado por varios registros.
+    """
+
+    hash_chunk_size = 64 * 1024
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = self.content_name(name, self.hash_content(content))
+        # Identical content already stored: reuse the existing blob
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def hash_content(self, content):
+        """Calcula el SHA-256 del contenido y deja el archivo rebobinado."""
+        digest = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks(chunk_size=self.hash_chunk_size):
+            digest.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def content_name(name, digest):
+        """Construye ``<directorio>/<hh>/<hash><ext>`` a partir del nombre original."""
+        dirname, filename = posixpath.split(name.replace("\\", "/"))
+        ext = os.path.splitext(filename)[1].lower()
+        # Shard by the first two hex chars to keep directories small
+        return posixpath.join(dirname, digest[:2], f"{digest}{ext}")
+
+
+def serve_immutable_media(request, path, document_root=None, show_indexes=False):
+    """
+    Sirve un archivo media agregando cabeceras de caché de larga duración.
+
+    Es seguro porque el nombre de cada archivo es el hash de su contenido:
+    un archivo nuevo siempre tiene una URL nueva.
+    """
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if response.status_code in (200, 304):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -0,0 +1,21 @@
+"""
+Runner de tests del proyecto.
+
+Igual al ``DiscoverRunner`` de Django, pero con el detector de N+1
+(``core/nplusone.py``) en modo ``"raise"``: una vista que repite la misma
+consulta más de ``NPLUSONE_THRESHOLD`` veces hace fallar el test que la pide.
+
+Para correr los tests sin el detector: ``NPLUSONE_MODE=off python manage.py test``.
+"""
+
+import os
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class NPlusOneTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        if os.environ.get("NPLUSONE_MODE", "raise") != "off":
+            settings.NPLUSONE_MODE = "raise"
@@ -0,0 +1,555 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Perfil, User
+from courses.enums import DiaSemana, EstadoInscripcion
+from courses.models import Comentario, HorarioOfertado, Inscripcion, OfertaClase, Ramo, Rating
+from notifications.models import Notification
+from core.database import database_from_env, replica_from_env
+from core.exports import iter_rows
+from core import pagination
+from core.metrics import Registry, registry
+from core.nplusone import NPlusOneError, NPlusOneMiddleware, detect_n_plus_one, fingerprint
+from core.perf import PerfMiddleware, record_time
+from core.db_router import PIN_COOKIE_NAME, ReplicaPinMiddleware, ReplicaRouter, use_replica
+from core.staticfiles import CompressedManifestStaticFilesStorage
+from core.storage import IMMUTABLE_CACHE_CONTROL
+from devtools.management.commands.bench_views import Command as BenchViewsCommand, iter_url_patterns, percentile
+from devtools.management.commands.explain_queries import plan_problems
+
+
+class StaticPipelineTests(SimpleTestCase):
+    """Pruebas de collectstatic con hash + precompresión y del middleware que lo sirve."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root, ignore_errors=True)
+        cls.settings_override = override_settings(STATIC_ROOT=cls.static_root)
+        cls.settings_override.enable()
+        cls.addClassCleanup(cls.settings_override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+        cls.storage = CompressedManifestStaticFilesStorage(location=cls.static_root)
+
+    def test_collectstatic_writes_hashed_and_gzip_files(self):
+        """El JS debe tener nombre con hash y una variante .gz válida."""
+        hashed = self.storage.stored_name("js/autocomplete.js")
+        self.assertRegex(hashed, r"^js/autocomplete\.[0-9a-f]{12}\.js$")
+        with self.storage.open(hashed) as original, self.storage.open(hashed + ".gz") as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), original.read())
+
+    def test_middleware_serves_gzip_with_immutable_headers(self):
+        """Si el cliente acepta gzip, se sirve la variante comprimida e inmutable."""
+        hashed = self.storage.stored_name("js/autocomplete.js")
+        response = Client().get(f"/static/{hashed}", headers={"accept-encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_middleware_serves_identity_and_short_cache_for_unhashed(self):
+        """Sin Accept-Encoding se sirve el archivo plano; sin hash, caché corta."""
+        response = Client().get("/static/js/autocomplete.js")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_middleware_returns_not_modified_for_matching_etag(self):
+        """Un ETag coincidente responde 304 sin cuerpo."""
+        first = Client().get("/static/js/autocomplete.js")
+        response = Client().get("/static/js/autocomplete.js", headers={"if-none-match": first["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_differs_per_encoding(self):
+        """Cada codificación tiene su propio ETag y el 304 solo aplica a la misma."""
+        hashed = self.storage.stored_name("js/autocomplete.js")
+        identity = Client().get(f"/static/{hashed}")["ETag"]
+        gzipped = Client().get(f"/static/{hashed}", headers={"accept-encoding": "gzip"})["ETag"]
+        self.assertNotEqual(identity, gzipped)
+        self.assertTrue(gzipped.endswith('-gz"'))
+        response = Client().get(f"/static/{hashed}", headers={"accept-encoding": "gzip", "if-none-match": identity})
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_and_rewritten_files_are_not_stale(self):
+        """Un archivo que no existía o que cambió se sirve al día (no se cachea el stat)."""
+        path = Path(self.static_root) / "nuevo.txt"
+        self.addCleanup(path.unlink, missing_ok=True)
+        self.assertEqual(Client().get("/static/nuevo.txt").status_code, 404)
+
+        path.write_text("uno")
+        first = Client().get("/static/nuevo.txt")
+        self.assertEqual(first.status_code, 200)
+        path.write_text("dos, más largo")
+        os.utime(path, (0, 1_000_000))
+        second = Client().get("/static/nuevo.txt")
+        self.assertEqual(b"".join(second.streaming_content), "dos, más largo".encode())
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+
+class DatabaseFromEnvTests(SimpleTestCase):
+    """Pruebas de la selección de motor de BD por variables de entorno."""
+
+    def test_defaults_to_tuned_sqlite(self):
+        """Sin variables se usa SQLite con transacciones IMMEDIATE."""
+        config = database_from_env("/tmp/db.sqlite3", environ={})
+        self.assertEqual(config["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(config["NAME"], "/tmp/db.sqlite3")
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+    def test_postgres_uses_pool_without_persistent_connections(self):
+        """Con DB_ENGINE=postgres se configura el pool y CONN_MAX_AGE=0."""
+        config = database_from_env("/tmp/db.sqlite3", environ={
+            "DB_ENGINE": "postgres",
+            "DB_NAME": "uclases",
+            "DB_POOL_MAX_SIZE": "20",
+        })
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 20)
+
+    def test_rejects_unknown_engine_and_missing_name(self):
+        """Un motor desconocido o PostgreSQL sin DB_NAME es un error de configuración."""
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env("/tmp/db.sqlite3", environ={"DB_ENGINE": "mysql"})
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env("/tmp/db.sqlite3", environ={"DB_ENGINE": "postgres"})
+
+
+REPLICA_DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": "primary.sqlite3"},
+    "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": "replica.sqlite3"},
+}
+
+
+@override_settings(DATABASES=REPLICA_DATABASES)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Pruebas del router de réplica, el decorador y el pin read-your-writes."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def routed_view(self, request):
+        """Vista de prueba que responde con el alias elegido para leer."""
+        return HttpResponse(self.router.db_for_read(None))
+
+    def test_reads_go_to_primary_outside_decorated_views(self):
+        self.assertEqual(self.router.db_for_read(None), "default")
+        self.assertEqual(self.router.db_for_write(None), "default")
+
+    def test_safe_request_reads_from_replica(self):
+        response = use_replica(self.routed_view)(self.factory.get("/"))
+        self.assertEqual(response.content, b"replica")
+
+    def test_unsafe_request_and_pinned_user_read_from_primary(self):
+        response = use_replica(self.routed_view)(self.factory.post("/"))
+        self.assertEqual(response.content, b"default")
+
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE_NAME] = "1"
+        response = use_replica(self.routed_view)(request)
+        self.assertEqual(response.content, b"default")
+
+    def test_pin_middleware_sets_cookie_after_write(self):
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse())
+        self.assertIn(PIN_COOKIE_NAME, middleware(self.factory.post("/")).cookies)
+        self.assertNotIn(PIN_COOKIE_NAME, middleware(self.factory.get("/")).cookies)
+
+    def test_replica_from_env_mirrors_default_in_tests(self):
+        primary = database_from_env("/tmp/db.sqlite3", environ={})
+        self.assertEqual(replica_from_env(primary, environ={}), {})
+        replica = replica_from_env(primary, environ={"DB_REPLICA_NAME": "/tmp/replica.sqlite3"})["replica"]
+        self.assertEqual(replica["NAME"], "/tmp/replica.sqlite3")
+        self.assertEqual(replica["TEST"], {"MIRROR": "default"})
+
+
+class ExplainQueriesTests(TestCase):
+    """Pruebas del catálogo de planes de consulta."""
+
+    def test_plan_problems_detects_full_scan_and_temp_sort(self):
+        plan = "3 0 0 SCAN courses_ofertaclase\n9 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertEqual(
+            plan_problems(plan),
+            ["recorrido completo de courses_ofertaclase", "ordenamiento temporal (ORDER BY)"],
+        )
+
+    def test_plan_problems_accepts_index_scans(self):
+        self.assertEqual(plan_problems("5 0 0 SCAN courses_ofertaclase USING INDEX oferta_fecha_pub_idx"), [])
+        self.assertEqual(plan_problems("Seq Scan on courses_inscripcion"), ["recorrido completo de courses_inscripcion"])
+
+    def test_catalogue_uses_indexes(self):
+        """Ninguna consulta del catálogo debe recorrer una tabla completa."""
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        self.assertIn("Todas las consultas usan índices", out.getvalue())
+
+
+class BenchViewsTests(SimpleTestCase):
+    """Pruebas de las piezas del benchmark de vistas."""
+
+    def test_iter_url_patterns_covers_app_namespaces(self):
+        names = {name for name, _ in iter_url_patterns()}
+        self.assertIn("home:home", names)
+        self.assertIn("courses:oferta_detail", names)
+        self.assertIn("notifications:list", names)
+        self.assertFalse(any(name.startswith("admin:") for name in names))
+
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_query_growth_and_baseline_regressions_are_reported(self):
+        results = [
+            {"scale": 100, "url": "courses:mis_ofertas", "queries": 5, "p95_ms": 10.0},
+            {"scale": 1000, "url": "courses:mis_ofertas", "queries": 9, "p95_ms": 40.0},
+        ]
+        baseline = [{"scale": 1000, "url": "courses:mis_ofertas", "queries": 9, "p95_ms": 20.0}]
+
+        self.assertEqual(len(BenchViewsCommand.check_growth(results)), 1)
+        self.assertEqual(
+            BenchViewsCommand.check_baseline(results, baseline, tolerance=0.25),
+            ["courses:mis_ofertas (escala 1,000): p95 20.0 → 40.0 ms"],
+        )
+
+
+@override_settings(DEBUG=True, PERF_INSTRUMENTATION=True, PERF_LOG_SAMPLE_RATE=0.0, PERF_SLOW_REQUEST_MS=10_000)
+class PerfMiddlewareTests(TestCase):
+    """Pruebas de la instrumentación por request (Server-Timing y logs)."""
+
+    def view(self, request):
+        cache.set("perf-test", 1)
+        cache.get("perf-test")
+        cache.get("perf-test-missing")
+        User.objects.exists()
+        return HttpResponse(render_to_string("home/home.html", {"request": request}))
+
+    def test_server_timing_reports_sql_templates_and_cache(self):
+        response = PerfMiddleware(self.view)(RequestFactory().get("/"))
+
+        header = response["Server-Timing"]
+        self.assertIn('db;dur=', header)
+        self.assertIn('desc="1 queries"', header)
+        self.assertIn('cache;desc="hit=1 miss=1"', header)
+        self.assertRegex(header, r"tpl;dur=\d+\.\d")
+        self.assertIn("total;dur=", header)
+
+    def test_sampled_requests_are_logged_as_json(self):
+        with override_settings(PERF_LOG_SAMPLE_RATE=1.0), self.assertLogs("uclases.perf", "INFO") as logs:
+            PerfMiddleware(self.view)(RequestFactory().get("/"))
+
+        self.assertIn('"sql_count": 1', logs.output[0])
+        self.assertIn('"cache_misses": 1', logs.output[0])
+
+    def test_notification_time_is_reported_when_sent(self):
+        send = record_time("notifications_ms", "notifications_count")(lambda: None)
+
+        def view(request):
+            send()
+            send()
+            return HttpResponse()
+
+        response = PerfMiddleware(view)(RequestFactory().get("/"))
+        self.assertIn('desc="2 sent"', response["Server-Timing"])
+
+    def test_disabled_middleware_is_not_loaded(self):
+        with override_settings(PERF_INSTRUMENTATION=False), self.assertRaises(MiddlewareNotUsed):
+            PerfMiddleware(self.view)
+
+    def test_full_stack_response_has_header(self):
+        response = Client().get("/")
+        self.assertIn("tpl;dur=", response["Server-Timing"])
+
+    @override_settings(DEBUG=False)
+    def test_header_only_for_staff_in_production(self):
+        self.assertNotIn("Server-Timing", Client().get("/"))
+
+        client = Client()
+        client.force_login(User.objects.create_user(username="staff", password="x", is_staff=True))
+        self.assertIn("Server-Timing", client.get("/"))
+
+
+
+class NPlusOneDetectorTests(TestCase):
+    """Pruebas del detector de consultas N+1 y de las vistas que tenían uno."""
+
+    def make_perfil(self):
+        user = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x")
+        return user.perfil
+
+    def test_fingerprint_ignores_literals_and_in_list_length(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'x''y' AND k IN (1, 2, 3)"),
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'z' AND k IN (%s, %s)"),
+        )
+        self.assertNotEqual(fingerprint("SELECT a FROM t WHERE id = 1"), fingerprint("SELECT b FROM t WHERE id = 1"))
+
+    def test_repeated_queries_raise_with_call_site(self):
+        with self.assertRaises(NPlusOneError) as ctx, detect_n_plus_one(threshold=3):
+            for pk in range(5):
+                User.objects.filter(pk=pk).exists()
+
+        self.assertIn("5x en core/tests.py", str(ctx.exception))
+        self.assertIn("test_repeated_queries_raise_with_call_site", str(ctx.exception))
+
+    def test_distinct_queries_under_threshold_pass(self):
+        with detect_n_plus_one(threshold=3) as log:
+            for pk in range(3):
+                User.objects.filter(pk=pk).exists()
+            list(User.objects.filter(pk__in=range(50)))
+        self.assertEqual(log.problems(), [])
+
+    def test_middleware_log_mode_logs_and_off_mode_is_not_loaded(self):
+        def view(request):
+            for pk in range(6):
+                User.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        with override_settings(NPLUSONE_MODE="log", NPLUSONE_SAMPLE_RATE=1.0, NPLUSONE_THRESHOLD=5), \
+                self.assertLogs("uclases.nplusone", "WARNING") as logs:
+            response = NPlusOneMiddleware(view)(RequestFactory().get("/x/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('"count": 6', logs.output[0])
+
+        with override_settings(NPLUSONE_MODE="off"), self.assertRaises(MiddlewareNotUsed):
+            NPlusOneMiddleware(view)
+
+    @override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=3)
+    def test_listing_views_do_not_repeat_queries_per_row(self):
+        profesor = self.make_perfil()
+        oferta = OfertaClase.objects.create(titulo="Oferta", descripcion="d", profesor=profesor, ramo=Ramo.objects.create(name="Ramo"))
+        horario = HorarioOfertado.objects.create(
+            oferta=oferta, dia=DiaSemana.LUNES, hora_inicio=datetime.time(10), hora_fin=datetime.time(12), cupos_totales=20,
+        )
+        for i in range(8):
+            Inscripcion.objects.create(
+                estudiante=self.make_perfil(), horario_ofertado=horario,
+                estado=EstadoInscripcion.ACEPTADO if i % 2 else EstadoInscripcion.PENDIENTE,
+            )
+        client = Client()
+        client.force_login(profesor.user)
+
+        for url in (
+            reverse("notifications:list"),
+            reverse("courses:mis_inscripciones"),
+            reverse("courses:mis_ofertas_horarios", args=[oferta.pk]),
+            reverse("home"),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 200)
+
+
+class MetricsTests(TestCase):
+    """Pruebas del registro de métricas y del endpoint /metrics."""
+
+    def test_counter_and_histogram_text_format(self):
+        local = Registry()
+        local.counter("c_total", "Un contador", ("k",)).inc('a"b', amount=2)
+        histogram = local.histogram("h_seconds", "Un histograma", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        text = local.render()
+        self.assertIn("# TYPE c_total counter", text)
+        self.assertIn('c_total{k="a\\"b"} 2', text)
+        self.assertIn('h_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('h_seconds_bucket{le="1"} 2', text)
+        self.assertIn('h_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("h_seconds_sum 3.55", text)
+        self.assertIn("h_seconds_count 3", text)
+
+    def test_processes_are_summed_through_metrics_dir(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        worker_a, worker_b = Registry(), Registry()
+        with override_settings(METRICS_DIR=directory):
+            worker_a.counter("requests_total", "r").inc(amount=2)
+            worker_a.flush()
+            worker_b.counter("requests_total", "r").inc(amount=3)
+            self.assertIn("requests_total 5", worker_b.render())
+
+    def value(self, name, *labels):
+        return registry.collect()[name].get(tuple(str(label) for label in labels), 0)
+
+    def test_endpoint_reports_requests_transitions_and_notifications(self):
+        profesor = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x").perfil
+        alumno = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x").perfil
+        oferta = OfertaClase.objects.create(titulo="Oferta", descripcion="d", profesor=profesor, ramo=Ramo.objects.create(name="Ramo"))
+        horario = HorarioOfertado.objects.create(oferta=oferta, dia=DiaSemana.LUNES, hora_inicio=datetime.time(10), hora_fin=datetime.time(12))
+        creadas = self.value("uclases_inscripcion_transitions_total", "", EstadoInscripcion.PENDIENTE)
+        aceptadas = self.value("uclases_inscripcion_transitions_total", EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO)
+        notificaciones = self.value("uclases_notifications_created_total", "inscription_accepted")
+
+        inscripcion = Inscripcion.objects.create(estudiante=alumno, horario_ofertado=horario)
+        Inscripcion.objects.get(pk=inscripcion.pk).aceptar()
+
+        self.assertEqual(self.value("uclases_inscripcion_transitions_total", "", EstadoInscripcion.PENDIENTE), creadas + 1)
+        self.assertEqual(
+            self.value("uclases_inscripcion_transitions_total", EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO),
+            aceptadas + 1,
+        )
+        self.assertEqual(self.value("uclases_notifications_created_total", "inscription_accepted"), notificaciones + 1)
+
+        client = Client()
+        client.get(reverse("courses:publications"))
+        with self.settings(METRICS_TOKEN="secreto"):
+            response = client.get(reverse("metrics"), headers={"authorization": "Bearer secreto"})
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        text = response.content.decode()
+        self.assertIn('uclases_http_requests_total{view="courses:publications",method="GET",status="200"}', text)
+        self.assertIn('uclases_http_request_duration_seconds_bucket{view="courses:publications",method="GET",le="+Inf"}', text)
+        self.assertIn('uclases_notifications_unread{type="inscription_created"} 1', text)
+        self.assertIn('uclases_db_query_duration_seconds_count{alias="default"}', text)
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN="secreto")
+    def test_endpoint_requires_allowed_ip_or_token(self):
+        self.assertEqual(Client().get(reverse("metrics")).status_code, 403)
+        response = Client(HTTP_AUTHORIZATION="Bearer secreto").get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_endpoint_closed_by_default(self):
+        # Behind a local reverse proxy every request comes from 127.0.0.1
+        self.assertEqual(Client(REMOTE_ADDR="127.0.0.1").get(reverse("metrics")).status_code, 403)
+        with self.settings(METRICS_ALLOWED_IPS=["127.0.0.1"]):
+            self.assertEqual(Client(REMOTE_ADDR="127.0.0.1").get(reverse("metrics")).status_code, 200)
+
+
+class AdminChangelistTests(TestCase):
+    """Los listados del admin no hacen consultas por fila y paginan con conteo estimado."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username="admin", email="admin@test.cl", password="x")
+        profesor = User.objects.create_user(username="profe", email="profe@test.cl", password="x").perfil
+        oferta = OfertaClase.objects.create(titulo="Oferta", descripcion="d", profesor=profesor, ramo=Ramo.objects.create(name="Ramo"))
+        for i in range(8):
+            horario = HorarioOfertado.objects.create(
+                oferta=oferta, dia=DiaSemana.LUNES, hora_inicio=datetime.time(8 + i), hora_fin=datetime.time(9 + i),
+            )
+            alumno = User.objects.create_user(username=f"alumno{i}", email=f"alumno{i}@test.cl", password="x").perfil
+            inscripcion = Inscripcion.objects.create(estudiante=alumno, horario_ofertado=horario, estado=EstadoInscripcion.COMPLETADO)
+            Rating.objects.create(valoracion=5, calificador=alumno, calificado=profesor, inscripcion=inscripcion)
+            Comentario.objects.create(contenido="c", publicador=alumno, oferta_clase=oferta)
+
+    @override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=3)
+    def test_changelists_do_not_query_per_row(self):
+        client = Client()
+        client.force_login(self.admin)
+        for model in ("carrera", "ramo", "ofertaclase", "horarioofertado", "inscripcion", "rating", "comentario"):
+            with self.subTest(model=model):
+                response = client.get(reverse(f"admin:courses_{model}_changelist"))
+                self.assertEqual(response.status_code, 200)
+        response = client.get(reverse("admin:courses_horarioofertado_changelist"), {"o": "-7"})
+        self.assertEqual(response.context["cl"].result_list[0]._cupos_ocupados, 1)
+        self.assertEqual(client.get(reverse("admin:accounts_perfil_changelist")).status_code, 200)
+
+    def test_paginator_uses_engine_estimate_without_filters(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        with patch.object(pagination, "ESTIMATE_MIN_ROWS", 1):
+            with patch.object(Inscripcion.objects.none().query.__class__, "get_count", side_effect=AssertionError):
+                # The unfiltered count comes from sqlite_stat1, not COUNT(*)
+                self.assertEqual(pagination.EstimatedCountPaginator(Inscripcion.objects.order_by("pk"), 10).count, 8)
+            filtered = Inscripcion.objects.filter(horario_ofertado__hora_inicio__lt=datetime.time(10)).order_by("pk")
+            self.assertEqual(pagination.EstimatedCountPaginator(filtered, 10).count, 2)
+
+
+class ExportTests(TestCase):
+    """Las exportaciones se envían en streaming, con columnas aplanadas y solo lo que el usuario puede ver."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username="admin", email="admin@test.cl", password="x")
+        cls.profesor = User.objects.create_user(username="profe", email="profe@test.cl", password="x").perfil
+        oferta = OfertaClase.objects.create(titulo="Oferta", descripcion="d", profesor=cls.profesor, ramo=Ramo.objects.create(name="Ramo"))
+        cls.alumnos = []
+        for i in range(5):
+            horario = HorarioOfertado.objects.create(
+                oferta=oferta, dia=DiaSemana.LUNES, hora_inicio=datetime.time(8 + i), hora_fin=datetime.time(9 + i),
+            )
+            alumno = User.objects.create_user(username=f"alumno{i}", email=f"alumno{i}@test.cl", password="x").perfil
+            inscripcion = Inscripcion.objects.create(estudiante=alumno, horario_ofertado=horario, estado=EstadoInscripcion.COMPLETADO)
+            Rating.objects.create(valoracion=5, comentario="=HYPERLINK(\"x\")", calificador=alumno, calificado=cls.profesor, inscripcion=inscripcion)
+            Notification.objects.create(receiver=alumno, type="x", title=f"Aviso {i}", message="m")
+            cls.alumnos.append(alumno)
+
+    def get_export(self, user, url, formato):
+        client = Client()
+        client.force_login(user)
+        response = client.get(reverse(url, kwargs={"formato": formato}))
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_inscripciones_csv_flattens_related_fields_in_one_query(self):
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(reverse("courses:export_inscripciones", kwargs={"formato": "csv"}))
+        with CaptureQueriesContext(connection) as ctx:
+            body = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        self.assertTrue(body.startswith("\ufeff"))
+        rows = list(csv.DictReader(body[1:].splitlines()))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["estudiante"], "alumno0")
+        self.assertEqual(rows[0]["profesor"], "profe")
+        self.assertEqual(rows[0]["hora_inicio"], "08:00:00")
+        self.assertEqual(rows[0]["rating"], "5")
+
+    def test_exports_are_scoped_to_the_user(self):
+        _, body = self.get_export(self.alumnos[1].user, "courses:export_inscripciones", "jsonl")
+        self.assertEqual([json.loads(line)["estudiante"] for line in body.splitlines()], ["alumno1"])
+        _, body = self.get_export(self.profesor.user, "courses:export_ratings", "jsonl")
+        self.assertEqual(len(body.splitlines()), 5)
+        _, body = self.get_export(self.alumnos[2].user, "notifications:export", "jsonl")
+        self.assertEqual([json.loads(line)["titulo"] for line in body.splitlines()], ["Aviso 2"])
+
+    def test_csv_escapes_formulas(self):
+        body = "".join(iter_rows(Rating.objects.order_by("pk"), [("comentario", "comentario")], "csv"))
+        self.assertEqual(list(csv.reader(body[1:].splitlines()))[1], ["'=HYPERLINK(\"x\")"])
+        # JSON Lines keeps the value as is
+        line = "".join(iter_rows(Rating.objects.order_by("pk")[:1], [("comentario", "comentario")], "jsonl"))
+        self.assertEqual(json.loads(line)["comentario"], '=HYPERLINK("x")')
+
+    def test_unknown_format_is_404(self):
+        client = Client()
+        client.force_login(self.admin)
+        self.assertEqual(client.get(reverse("courses:export_ratings", kwargs={"formato": "xlsx"})).status_code, 404)
+
+    def test_admin_action_exports_selected_rows(self):
+        client = Client()
+        client.force_login(self.admin)
+        selected = list(Inscripcion.objects.order_by("pk").values_list("pk", flat=True)[:2])
+        response = client.post(
+            reverse("admin:courses_inscripcion_changelist"),
+            {"action": "export_csv", "_selected_action": selected},
+        )
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual([int(row["id"]) for row in csv.DictReader(body[1:].splitlines())], selected)
+        response = client.post(
+            reverse("admin:notifications_notification_changelist"),
+            {"action": "export_jsonl", "_selected_action": [Notification.objects.earliest("pk").pk]},
+        )
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 1)
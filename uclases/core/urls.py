@@ -1,7 +1,11 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core.metrics import metrics_view
+from core.storage import serve_immutable_media
 
 from home.views import home as home_view
 
@@ -12,8 +16,16 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     path('courses/', include('courses.urls')),
     path('notifications/', include('notifications.urls')),
+    path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Servir archivos media en desarrollo
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+            serve_immutable_media,
+            {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]
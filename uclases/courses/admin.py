@@ -1,8 +1,14 @@
 from django.contrib import admin
+from django.db.models import Exists, OuterRef
+
+from accounts.models import Perfil
+from core.admin import LargeTableAdmin, count_subquery
+from core.exports import export_action
 from .models import (
     Carrera, Ramo, OfertaClase, SolicitudClase, 
-    HorarioOfertado, PerfilRamo, Inscripcion, Rating, Comentario
+    HorarioOfertado, PerfilRamo, Inscripcion, Rating, Comentario, Recomendacion
 )
+from .services.export_service import ExportService
 
 @admin.register(Carrera)
 class CarreraAdmin(admin.ModelAdmin):
@@ -11,10 +17,14 @@ class CarreraAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     ordering = ("name",)
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_total_perfiles=count_subquery(Perfil.objects.all(), 'carrera'))
+    
     def total_perfiles(self, obj):
-        """Contar cuántos perfiles tienen esta carrera"""
-        return obj.perfiles_cursando.count()
+        """Cantidad de perfiles con esta carrera (anotada en get_queryset)"""
+        return obj._total_perfiles
     total_perfiles.short_description = "Total Estudiantes"
+    total_perfiles.admin_order_field = "_total_perfiles"
 
 @admin.register(Ramo)
 class RamoAdmin(admin.ModelAdmin):
@@ -23,13 +33,21 @@ class RamoAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     ordering = ("name",)
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _total_ofertas=count_subquery(OfertaClase.objects.all(), 'ramo'),
+            _total_solicitudes=count_subquery(SolicitudClase.objects.all(), 'ramo'),
+        )
+    
     def total_ofertas(self, obj):
-        return obj.ofertas.count()
+        return obj._total_ofertas
     total_ofertas.short_description = "Ofertas"
+    total_ofertas.admin_order_field = "_total_ofertas"
     
     def total_solicitudes(self, obj):
-        return obj.solicitudes.count()
+        return obj._total_solicitudes
     total_solicitudes.short_description = "Solicitudes"
+    total_solicitudes.admin_order_field = "_total_solicitudes"
 
 class HorarioOfertadoInline(admin.TabularInline):
     """Inline para gestionar horarios desde OfertaClase"""
@@ -38,9 +56,10 @@ class HorarioOfertadoInline(admin.TabularInline):
     fields = ("dia", "hora_inicio", "hora_fin", "cupos_totales")
 
 @admin.register(OfertaClase)
-class OfertaClaseAdmin(admin.ModelAdmin):
+class OfertaClaseAdmin(LargeTableAdmin):
     """Admin para el modelo OfertaClase"""
     list_display = ("id", "titulo", "profesor", "ramo", "fecha_publicacion", "total_horarios", "total_comentarios")
+    list_select_related = ("profesor__user", "ramo")
     search_fields = ("titulo", "descripcion", "profesor__user__username", "ramo__name")
     list_filter = ("fecha_publicacion", "ramo")
     ordering = ("-fecha_publicacion",)
@@ -54,18 +73,19 @@ class OfertaClaseAdmin(admin.ModelAdmin):
     readonly_fields = ("fecha_publicacion",)
     inlines = [HorarioOfertadoInline]
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_total_horarios=count_subquery(HorarioOfertado.objects.all(), 'oferta'))
+    
     def total_horarios(self, obj):
-        return obj.horarios.count()
+        return obj._total_horarios
     total_horarios.short_description = "Horarios"
-    
-    def total_comentarios(self, obj):
-        return obj.comentarios.count()
-    total_comentarios.short_description = "Comentarios"
+    total_horarios.admin_order_field = "_total_horarios"
 
 @admin.register(SolicitudClase)
-class SolicitudClaseAdmin(admin.ModelAdmin):
+class SolicitudClaseAdmin(LargeTableAdmin):
     """Admin para el modelo SolicitudClase"""
     list_display = ("id", "titulo", "solicitante", "ramo", "fecha_publicacion", "total_comentarios")
+    list_select_related = ("solicitante__user", "ramo")
     search_fields = ("titulo", "descripcion", "solicitante__user__username")
     list_filter = ("fecha_publicacion", "ramo")
     ordering = ("-fecha_publicacion",)
@@ -76,75 +96,99 @@ class SolicitudClaseAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ("fecha_publicacion",)
-    
-    def total_comentarios(self, obj):
-        return obj.comentarios.count()
-    total_comentarios.short_description = "Comentarios"
 
 @admin.register(HorarioOfertado)
-class HorarioOfertadoAdmin(admin.ModelAdmin):
+class HorarioOfertadoAdmin(LargeTableAdmin):
     """Admin para el modelo HorarioOfertado"""
     list_display = ("id", "oferta", "dia", "hora_inicio", "hora_fin", "cupos_totales", "cupos_ocupados")
+    list_select_related = ("oferta",)
     search_fields = ("oferta__titulo",)
-    list_filter = ("dia", "oferta")
+    # Filtering by oferta would render one link per offer; search by title instead
+    list_filter = ("dia",)
     ordering = ("dia", "hora_inicio")
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_cupos_ocupados=count_subquery(Inscripcion.objects.all(), 'horario_ofertado'))
+    
     def cupos_ocupados(self, obj):
-        return obj.inscripciones.count()
+        return obj._cupos_ocupados
     cupos_ocupados.short_description = "Ocupados"
+    cupos_ocupados.admin_order_field = "_cupos_ocupados"
 
 @admin.register(PerfilRamo)
-class PerfilRamoAdmin(admin.ModelAdmin):
+class PerfilRamoAdmin(LargeTableAdmin):
     """Admin para el modelo PerfilRamo (Ramos Cursados)"""
     list_display = ("id", "perfil", "ramo")
+    list_select_related = ("perfil__user", "ramo")
     search_fields = ("perfil__user__username", "ramo__name")
     list_filter = ("ramo",)
     ordering = ("perfil", "ramo")
 
 @admin.register(Inscripcion)
-class InscripcionAdmin(admin.ModelAdmin):
+class InscripcionAdmin(LargeTableAdmin):
     """Admin para el modelo Inscripcion"""
     list_display = ("id", "estudiante", "get_oferta", "get_horario", "fecha_reserva", "tiene_rating")
+    list_select_related = ("estudiante__user", "horario_ofertado__oferta")
     search_fields = ("estudiante__user__username", "horario_ofertado__oferta__titulo")
     list_filter = ("fecha_reserva",)
-    ordering = ("-fecha_reserva",)
+    # Same order as -fecha_reserva (auto_now_add) but walks the primary key instead of sorting the table
+    ordering = ("-pk",)
     
     readonly_fields = ("fecha_reserva",)
+    actions = [
+        export_action(ExportService.INSCRIPCION_COLUMNS, "inscripciones", "csv"),
+        export_action(ExportService.INSCRIPCION_COLUMNS, "inscripciones", "jsonl"),
+    ]
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_tiene_rating=Exists(Rating.objects.filter(inscripcion=OuterRef('pk'))))
     
     def get_oferta(self, obj):
         return obj.horario_ofertado.oferta.titulo
     get_oferta.short_description = "Oferta"
+    get_oferta.admin_order_field = "horario_ofertado__oferta__titulo"
     
     def get_horario(self, obj):
         return f"{obj.horario_ofertado.get_dia_display()} {obj.horario_ofertado.hora_inicio}"
     get_horario.short_description = "Horario"
+    get_horario.admin_order_field = "horario_ofertado__dia"
     
     def tiene_rating(self, obj):
-        return hasattr(obj, 'rating')
+        return obj._tiene_rating
     tiene_rating.boolean = True
     tiene_rating.short_description = "¿Rating?"
+    tiene_rating.admin_order_field = "_tiene_rating"
 
 @admin.register(Rating)
-class RatingAdmin(admin.ModelAdmin):
+class RatingAdmin(LargeTableAdmin):
     """Admin para el modelo Rating"""
     list_display = ("id", "calificador", "calificado", "valoracion", "fecha_rating", "get_oferta")
+    list_select_related = ("calificador__user", "calificado__user", "inscripcion__horario_ofertado__oferta")
     search_fields = ("calificador__user__username", "calificado__user__username")
     list_filter = ("valoracion", "fecha_rating")
-    ordering = ("-fecha_rating",)
+    # Same order as -fecha_rating (auto_now_add) but walks the primary key instead of sorting the table
+    ordering = ("-pk",)
     
     readonly_fields = ("fecha_rating",)
+    actions = [
+        export_action(ExportService.RATING_COLUMNS, "ratings", "csv"),
+        export_action(ExportService.RATING_COLUMNS, "ratings", "jsonl"),
+    ]
     
     def get_oferta(self, obj):
         return obj.inscripcion.horario_ofertado.oferta.titulo
     get_oferta.short_description = "Oferta"
+    get_oferta.admin_order_field = "inscripcion__horario_ofertado__oferta__titulo"
 
 @admin.register(Comentario)
-class ComentarioAdmin(admin.ModelAdmin):
+class ComentarioAdmin(LargeTableAdmin):
     """Admin para el modelo Comentario"""
     list_display = ("id", "publicador", "get_tipo", "get_destino", "fecha_comentario")
+    list_select_related = ("publicador__user", "oferta_clase", "solicitud_clase")
     search_fields = ("publicador__user__username", "contenido")
     list_filter = ("fecha_comentario",)
-    ordering = ("-fecha_comentario",)
+    # Same order as -fecha_comentario (auto_now_add) but walks the primary key instead of sorting the table
+    ordering = ("-pk",)
     
     readonly_fields = ("fecha_comentario",)
     
@@ -170,3 +214,13 @@ class ComentarioAdmin(admin.ModelAdmin):
             return obj.solicitud_clase.titulo
         return "N/A"
     get_destino.short_description = "Publicación"
+
+@admin.register(Recomendacion)
+class RecomendacionAdmin(LargeTableAdmin):
+    """Admin de solo lectura para las recomendaciones (las escribe build_recommendations)"""
+    list_display = ("perfil", "posicion", "oferta", "score", "fecha_calculo")
+    list_select_related = ("perfil__user", "oferta")
+    search_fields = ("perfil__user__username", "oferta__titulo")
+    ordering = ("perfil", "posicion")
+    readonly_fields = ("perfil", "oferta", "posicion", "score", "fecha_calculo")
+
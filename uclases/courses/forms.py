@@ -1,6 +1,10 @@
+from datetime import time
+
 from django import forms
 from django.forms import inlineformset_factory, BaseInlineFormSet
-from .models import HorarioOfertado, OfertaClase, SolicitudClase, Comentario, Rating
+from .models import HorarioOfertado, OfertaClase, SolicitudClase, Comentario, Rating, Ramo
+from .enums import DiaSemana
+from .services.schedule_index import ScheduleIndex
 from django.core.exceptions import ValidationError
 
 INPUT = "appearance-none w-full px-4 py-2 border border-border rounded-md bg-background text-foreground focus:outline-none focus:ring-2 focus:ring-primary transition"
@@ -137,14 +141,24 @@ class BaseHorarioFormSet(BaseInlineFormSet):
     Formset personalizado para validar múltiples horarios ofertados.
     
     Asegura que al menos un horario válido sea agregado cuando se crea
-    o edita una oferta de clase.
+    o edita una oferta de clase y, si se indica el profesor, que ningún
+    horario se superponga con otro de la misma oferta ni con los de sus
+    otras ofertas.
     
     Tipo: BaseInlineFormSet personalizado
     Modelo relacionado: HorarioOfertado
+    
+    Args extra:
+        profesor: Perfil que dicta la oferta (opcional, activa la validación de superposición)
     """
+    def __init__(self, *args, profesor=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profesor = profesor
+
     def clean(self):
         """
-        Valida que se haya agregado al menos un horario ofertado válido.
+        Valida que se haya agregado al menos un horario ofertado válido
+        y que los horarios no se superpongan.
         
         Ignora formularios vacíos o marcados para eliminar y cuenta solo
         los horarios con datos completos.
@@ -163,11 +177,36 @@ class BaseHorarioFormSet(BaseInlineFormSet):
                 continue
             if not (cd.get("dia") and cd.get("hora_inicio") and cd.get("hora_fin")):
                 continue
-            vivos.append(cd)
+            vivos.append((form, cd))
 
         if len(vivos) == 0:
             raise ValidationError("Debes agregar al menos un horario ofertado.")
 
+        self._check_overlaps_within(vivos)
+        if self.profesor is not None:
+            self._check_overlaps_with_other_offers(vivos)
+
+    def _check_overlaps_within(self, vivos):
+        """Marca los horarios de este formset que se superponen entre sí."""
+        ordenados = sorted(vivos, key=lambda item: (item[1]["dia"], item[1]["hora_inicio"]))
+        anterior = None
+        for form, cd in ordenados:
+            if anterior and anterior[1]["dia"] == cd["dia"] and cd["hora_inicio"] < anterior[1]["hora_fin"]:
+                form.add_error(None, "Este horario se superpone con otro horario de esta oferta.")
+            if not anterior or anterior[1]["dia"] != cd["dia"] or cd["hora_fin"] > anterior[1]["hora_fin"]:
+                anterior = (form, cd)
+
+    def _check_overlaps_with_other_offers(self, vivos):
+        """Marca los horarios que chocan con otras ofertas del profesor (O(log n) por horario)."""
+        index = ScheduleIndex.for_profesor(self.profesor, exclude_oferta=self.instance)
+        for form, cd in vivos:
+            conflicto = index.find_overlap(cd["dia"], cd["hora_inicio"], cd["hora_fin"])
+            if conflicto:
+                form.add_error(None, (
+                    f"Se superpone con tu oferta '{conflicto.oferta_titulo}' "
+                    f"({DiaSemana(cd['dia']).label} {conflicto.inicio:%H:%M}-{conflicto.fin:%H:%M})."
+                ))
+
 HorarioFormSet = inlineformset_factory(
     OfertaClase,
     HorarioOfertado,
@@ -296,3 +335,35 @@ class RatingForm(forms.ModelForm):
     class Meta:
         model = Rating
         fields = ['valoracion', 'comentario']
+
+
+class DisponibilidadSearchForm(forms.Form):
+    """
+    Parámetros de búsqueda de horarios con cupos disponibles.
+    
+    Tipo: Form (GET)
+    
+    Campos:
+        - ramo: Ramo a buscar (opcional)
+        - dia: Día de la semana (enum DiaSemana)
+        - desde: Hora mínima de inicio (por defecto 00:00)
+        - hasta: Hora máxima de término (por defecto 23:59)
+    """
+    ramo = forms.ModelChoiceField(queryset=Ramo.objects.all(), required=False)
+    dia = forms.TypedChoiceField(choices=DiaSemana.choices, coerce=int)
+    desde = forms.TimeField(required=False, input_formats=["%H:%M"])
+    hasta = forms.TimeField(required=False, input_formats=["%H:%M"])
+
+    def clean(self):
+        """
+        Completa la ventana horaria y valida que sea coherente.
+        
+        Raises:
+            ValidationError: Si ``desde`` no es menor que ``hasta``.
+        """
+        cleaned = super().clean()
+        cleaned["desde"] = cleaned.get("desde") or time.min
+        cleaned["hasta"] = cleaned.get("hasta") or time(23, 59)
+        if cleaned["desde"] >= cleaned["hasta"]:
+            raise ValidationError("La hora 'desde' debe ser menor a la hora 'hasta'.")
+        return cleaned
@@ -0,0 +1,45 @@
+"""
+Recalcula las ofertas recomendadas ("Para ti") de cada usuario.
+Ejecutar con: python manage.py build_recommendations
+Opciones: python manage.py build_recommendations --batch-size 1000 --top 10
+
+Pensado para correr cada noche (cron) o a mano después de cargar datos.
+El detalle del puntaje está en courses.services.recommendation_service.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from courses.services.recommendation_service import RecommendationService
+
+
+class Command(BaseCommand):
+    help = "Precalcula las ofertas recomendadas de cada usuario para la sección 'Para ti'"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RecommendationService.BATCH_SIZE,
+            help="Perfiles procesados por lote",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=RecommendationService.TOP_N,
+            help="Recomendaciones guardadas por perfil",
+        )
+
+    def handle(self, *args, **opts):
+        self.stdout.write("🧮 Calculando recomendaciones...")
+        start = time.perf_counter()
+        perfiles, recomendaciones = RecommendationService.build(
+            batch_size=opts["batch_size"], limit=opts["top"]
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {recomendaciones} recomendaciones para {perfiles} perfiles en {elapsed:.2f}s"
+            )
+        )
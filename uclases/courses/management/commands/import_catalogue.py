@@ -0,0 +1,90 @@
+"""
+Importa el catálogo universitario (carreras, ramos y ramos cursados).
+Ejecutar con: python manage.py import_catalogue --carreras carreras.csv --ramos ramos.csv --cursados cursados.csv
+Probar sin guardar: python manage.py import_catalogue --ramos ramos.csv --dry-run -v 2
+
+Formatos: .csv (con encabezado), .jsonl (un objeto por línea) o .json (lista).
+Columnas: carreras y ramos ``codigo,nombre``; cursados ``usuario,ramo``
+(username y código del ramo). El detalle está en
+courses.services.catalogue_service.
+
+Todo corre en una transacción: si alguna fila tiene errores no se guarda
+nada, y con --dry-run se informan las diferencias y se deshace al final.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from courses.services.catalogue_service import CatalogueImportService
+
+
+class Command(BaseCommand):
+    help = "Importa carreras, ramos y ramos cursados desde CSV/JSON en lotes (con --dry-run para ver las diferencias)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--carreras", help="Archivo de carreras (codigo, nombre)")
+        parser.add_argument("--ramos", help="Archivo de ramos (codigo, nombre)")
+        parser.add_argument("--cursados", help="Archivo de ramos cursados (usuario, ramo)")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=CatalogueImportService.BATCH_SIZE,
+            help="Filas por lote",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Calcular e informar las diferencias sin guardar nada",
+        )
+
+    def handle(self, *args, **opts):
+        # Order matters: cursados reference ramos imported in the same run
+        steps = [
+            ("carreras", CatalogueImportService.import_carreras),
+            ("ramos", CatalogueImportService.import_ramos),
+            ("cursados", CatalogueImportService.import_cursados),
+        ]
+        steps = [(name, opts[name], importer) for name, importer in steps if opts[name]]
+        if not steps:
+            raise CommandError("Indica al menos un archivo: --carreras, --ramos o --cursados")
+
+        errors = 0
+        start = time.perf_counter()
+        with transaction.atomic():
+            for name, path, importer in steps:
+                self.stdout.write(f"\n📥 Importando {name} desde {path}...")
+                try:
+                    diff = importer(CatalogueImportService.read_rows(path), batch_size=opts["batch_size"])
+                except (OSError, ValueError) as exc:
+                    raise CommandError(f"❌ No se pudo leer {path}: {exc}") from exc
+                self.report(diff, opts["verbosity"])
+                errors += len(diff.errors)
+
+            if errors or opts["dry_run"]:
+                transaction.set_rollback(True)
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            raise CommandError(f"❌ {errors} fila(s) con errores: no se guardó nada.")
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"\n⚠️  --dry-run: no se guardó nada ({elapsed:.2f}s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\n✅ Catálogo importado en {elapsed:.2f}s"))
+
+    def report(self, diff, verbosity):
+        self.stdout.write(
+            f"  {diff.created} nuevos, {diff.updated} actualizados, "
+            f"{diff.unchanged} sin cambios, {len(diff.errors)} errores"
+        )
+        if verbosity >= 2:
+            for change in diff.changes:
+                self.stdout.write(f"    {change}")
+            hidden = diff.created + diff.updated - len(diff.changes)
+            if hidden > 0:
+                self.stdout.write(f"    ... y {hidden} más")
+        for line, message in diff.errors[:20]:
+            self.stdout.write(self.style.ERROR(f"  ❌ línea {line}: {message}"))
+        if len(diff.errors) > 20:
+            self.stdout.write(self.style.ERROR(f"  ... y {len(diff.errors) - 20} errores más"))
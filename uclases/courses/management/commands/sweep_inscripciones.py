@@ -0,0 +1,83 @@
+"""
+Vence inscripciones pendientes sin respuesta y (opcional) completa clases ya dictadas.
+Ejecutar con: python manage.py sweep_inscripciones
+Opciones: python manage.py sweep_inscripciones --pending-days 7 --complete --complete-grace 60 --dry-run
+
+Pensado para correr periódicamente desde cron, por ejemplo cada hora:
+    0 * * * * cd /ruta/uclases && python manage.py sweep_inscripciones --complete -v 0
+
+Cambia los estados por lotes con UPDATEs y notificaciones en bloque (sin
+save() por fila). El detalle está en courses.services.sweep_service.
+
+Este proceso no comparte la caché de los workers web: los horarios y feeds
+cacheados se invalidan subiendo sus versiones en la BD, así que el comando
+debe usar la misma base de datos (settings y DB_*) que la aplicación.
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.services.sweep_service import InscriptionSweepService
+
+
+class Command(BaseCommand):
+    help = "Vence inscripciones pendientes antiguas y completa las aceptadas cuya clase ya se dictó"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pending-days",
+            type=float,
+            default=InscriptionSweepService.PENDING_MAX_AGE.total_seconds() / 86400,
+            help="Días sin respuesta tras los cuales una inscripción pendiente vence",
+        )
+        parser.add_argument(
+            "--complete",
+            action="store_true",
+            help="Completar también las inscripciones aceptadas cuya clase ya terminó",
+        )
+        parser.add_argument(
+            "--complete-grace",
+            type=int,
+            default=int(InscriptionSweepService.COMPLETE_GRACE.total_seconds() // 60),
+            help="Minutos después del término de la clase antes de completarla",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=InscriptionSweepService.BATCH_SIZE,
+            help="Inscripciones por lote",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Contar las inscripciones afectadas sin cambiarlas",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["pending_days"] <= 0:
+            raise CommandError("--pending-days debe ser mayor que 0")
+        if opts["complete_grace"] < 0:
+            raise CommandError("--complete-grace no puede ser negativo")
+        if opts["batch_size"] < 1:
+            raise CommandError("--batch-size debe ser al menos 1")
+
+        start = time.perf_counter()
+        common = {"batch_size": opts["batch_size"], "dry_run": opts["dry_run"]}
+        vencidas = InscriptionSweepService.expire_stale(max_age=timedelta(days=opts["pending_days"]), **common)
+        completadas = 0
+        if opts["complete"]:
+            completadas = InscriptionSweepService.complete_past(
+                grace=timedelta(minutes=opts["complete_grace"]), **common,
+            )
+        elapsed = time.perf_counter() - start
+
+        if opts["verbosity"] < 1:
+            return
+        suffix = " (dry-run, sin cambios)" if opts["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🧹 {vencidas} pendientes vencidas, {completadas} aceptadas completadas en {elapsed:.2f}s{suffix}"
+            )
+        )
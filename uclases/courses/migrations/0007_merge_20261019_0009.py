@@ -0,0 +1,14 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_merge_20251124_2102'),
+        ('courses', '0006_merge_20251124_2251'),
+    ]
+
+    operations = [
+    ]
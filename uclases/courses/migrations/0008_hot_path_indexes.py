@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_perfil_banner_file_perfil_foto_file'),
+        ('courses', '0007_merge_20261019_0009'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(condition=models.Q(('oferta_clase__isnull', False)), fields=['oferta_clase', 'fecha_comentario'], name='comentario_oferta_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(condition=models.Q(('solicitud_clase__isnull', False)), fields=['solicitud_clase', 'fecha_comentario'], name='comentario_solic_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='horarioofertado',
+            index=models.Index(fields=['oferta', 'dia', 'hora_inicio'], name='horario_oferta_dia_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['horario_ofertado', 'estado'], name='inscripcion_horario_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['estudiante', 'estado'], name='inscripcion_estud_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(condition=models.Q(('estado__in', [0, 1])), fields=['horario_ofertado'], name='inscripcion_activas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertaclase',
+            index=models.Index(fields=['-fecha_publicacion'], name='oferta_fecha_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertaclase',
+            index=models.Index(fields=['profesor', '-fecha_publicacion'], name='oferta_profesor_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudclase',
+            index=models.Index(fields=['-fecha_publicacion'], name='solicitud_fecha_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudclase',
+            index=models.Index(fields=['solicitante', '-fecha_publicacion'], name='solicitud_solic_fecha_idx'),
+        ),
+    ]
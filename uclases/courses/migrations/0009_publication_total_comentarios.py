@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:11
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_total_comentarios(apps, schema_editor):
+    Comentario = apps.get_model('courses', 'Comentario')
+    for model_name, fk in (('OfertaClase', 'oferta_clase'), ('SolicitudClase', 'solicitud_clase')):
+        counts = (
+            Comentario.objects.filter(**{fk: OuterRef('pk')})
+            .order_by()
+            .values(fk)
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        apps.get_model('courses', model_name).objects.update(
+            total_comentarios=Coalesce(Subquery(counts), Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertaclase',
+            name='total_comentarios',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='solicitudclase',
+            name='total_comentarios',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_total_comentarios, migrations.RunPython.noop),
+    ]
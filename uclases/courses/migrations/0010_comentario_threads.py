@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PATH_STEP = 10
+
+
+def backfill_paths(apps, schema_editor):
+    # Existing comments are all roots of their own thread
+    Comentario = apps.get_model('courses', 'Comentario')
+    for comentario in Comentario.objects.only('pk').iterator():
+        Comentario.objects.filter(pk=comentario.pk).update(path=str(comentario.pk).zfill(PATH_STEP))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_perfil_banner_file_perfil_foto_file'),
+        ('courses', '0009_publication_total_comentarios'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comentario',
+            name='comentario_oferta_fecha_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comentario',
+            name='comentario_solic_fecha_idx',
+        ),
+        migrations.AddField(
+            model_name='comentario',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comentario',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='respuestas', to='courses.comentario'),
+        ),
+        migrations.AddField(
+            model_name='comentario',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=210),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(fields=['path'], name='comentario_path_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(condition=models.Q(('oferta_clase__isnull', False)), fields=['oferta_clase', 'depth', 'path'], name='comentario_oferta_hilo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(condition=models.Q(('solicitud_clase__isnull', False)), fields=['solicitud_clase', 'depth', 'path'], name='comentario_solic_hilo_idx'),
+        ),
+    ]
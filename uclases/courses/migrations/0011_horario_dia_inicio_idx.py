@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_comentario_threads'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='horarioofertado',
+            index=models.Index(fields=['dia', 'hora_inicio', 'hora_fin'], name='horario_dia_inicio_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_perfil_banner_file_perfil_foto_file'),
+        ('courses', '0011_horario_dia_inicio_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recomendacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posicion', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('fecha_calculo', models.DateTimeField(auto_now_add=True)),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.ofertaclase')),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendaciones', to='accounts.perfil')),
+            ],
+            options={
+                'verbose_name': 'Recomendación',
+                'verbose_name_plural': 'Recomendaciones',
+                'constraints': [models.UniqueConstraint(fields=('perfil', 'posicion'), name='unique_recomendacion_posicion')],
+            },
+        ),
+    ]
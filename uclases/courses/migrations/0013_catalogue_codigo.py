@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_recomendacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrera',
+            name='codigo',
+            field=models.CharField(blank=True, max_length=20, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='ramo',
+            name='codigo',
+            field=models.CharField(blank=True, max_length=20, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0013_catalogue_codigo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inscripcion',
+            name='ultimo_recordatorio',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_perfil_banner_file_perfil_foto_file'),
+        ('courses', '0014_inscripcion_ultimo_recordatorio'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['estado', 'fecha_reserva'], name='inscripcion_estado_fecha_idx'),
+        ),
+    ]
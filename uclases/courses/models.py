@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from accounts.models import Perfil
 from .enums import DiaSemana, EstadoInscripcion
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -14,12 +14,15 @@ class Carrera(models.Model):
     
     Attributes:
         name (CharField): Nombre de la carrera.
+        codigo (CharField): Código del catálogo universitario (único, opcional).
     
     Relationships:
         - Reverse relation: perfil_set (usuarios que estudian esta carrera)
     """
     #ID_Carrera (PK) se crea automaticamente como 'id'
     name = models.CharField(max_length=100)
+    #Clave natural para import_catalogue (NULL en las creadas a mano)
+    codigo = models.CharField(max_length=20, unique=True, null=True, blank=True)
 
     class Meta: verbose_name_plural = "Carreras"
 
@@ -34,12 +37,15 @@ class Ramo(models.Model):
     
     Attributes:
         name (CharField): Nombre del ramo o asignatura.
+        codigo (CharField): Código del catálogo universitario (ej: CC4401; único, opcional).
     
     Relationships:
         - Reverse relations: ofertas, solicitudes, perfiles_que_cursaron (vía PerfilRamo)
     """
     #ID_Ramo (PK) se crea automaticamente como 'id'
     name = models.CharField(max_length=100)
+    #Clave natural para import_catalogue (NULL en los creados a mano)
+    codigo = models.CharField(max_length=20, unique=True, null=True, blank=True)
 
     def __str__(self): return self.name
 
@@ -57,6 +63,7 @@ class OfertaClase(models.Model):
         fecha_publicacion (DateTimeField): Fecha y hora de creación automática.
         profesor (ForeignKey): Usuario que ofrece la clase.
         ramo (ForeignKey): Asignatura que se ofrece enseñar.
+        total_comentarios (PositiveIntegerField): Cantidad de comentarios (se actualiza con signals).
     
     Relationships:
         - ForeignKey a Perfil (profesor que ofrece)
@@ -78,6 +85,16 @@ class OfertaClase(models.Model):
     #Relación N:1 con RAMO (Pertenece a) - Una oferta es de UN solo ramo
     ramo = models.ForeignKey(Ramo, on_delete=models.CASCADE, related_name='ofertas')
 
+    #Contador de comentarios (evita un COUNT en cada detalle/listado)
+    total_comentarios = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Listados por fecha (home, publicaciones) y dashboard del profesor
+            models.Index(fields=['-fecha_publicacion'], name='oferta_fecha_pub_idx'),
+            models.Index(fields=['profesor', '-fecha_publicacion'], name='oferta_profesor_fecha_idx'),
+        ]
+
     def __str__(self): return self.titulo
 
 
@@ -95,6 +112,7 @@ class SolicitudClase(models.Model):
         fecha_publicacion (DateTimeField): Fecha y hora de creación automática.
         solicitante (ForeignKey): Usuario que solicita la clase.
         ramo (ForeignKey): Asignatura.
+        total_comentarios (PositiveIntegerField): Cantidad de comentarios (se actualiza con signals).
     
     Relationships:
         - ForeignKey a Perfil (estudiante que solicita)
@@ -116,6 +134,15 @@ class SolicitudClase(models.Model):
     #Indicador si la oferta es pública
     public = models.BooleanField(default=True, verbose_name= "Oferta pública")
 
+    #Contador de comentarios (evita un COUNT en cada detalle/listado)
+    total_comentarios = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-fecha_publicacion'], name='solicitud_fecha_pub_idx'),
+            models.Index(fields=['solicitante', '-fecha_publicacion'], name='solicitud_solic_fecha_idx'),
+        ]
+
     def __str__(self): return self.titulo
 
 
@@ -149,6 +176,14 @@ class HorarioOfertado(models.Model):
     #ID_Oferta (FK)
     oferta = models.ForeignKey(OfertaClase, on_delete=models.CASCADE, related_name='horarios')
 
+    class Meta:
+        indexes = [
+            # Horarios de una oferta ordenados de lunes a domingo
+            models.Index(fields=['oferta', 'dia', 'hora_inicio'], name='horario_oferta_dia_idx'),
+            # Búsqueda de disponibilidad por día y ventana horaria
+            models.Index(fields=['dia', 'hora_inicio', 'hora_fin'], name='horario_dia_inicio_idx'),
+        ]
+
     def __str__(self): return f"Horario para {self.oferta.titulo}: {self.hora_inicio} - {self.hora_fin}"
 
 
@@ -194,6 +229,7 @@ class Inscripcion(models.Model):
         horario_ofertado (ForeignKey): Horario específico al que se inscribe.
         estado (IntegerField): Estado actual (PENDIENTE, ACEPTADO, RECHAZADO, CANCELADO, COMPLETADO).
         fecha_reserva (DateTimeField): Fecha y hora de creación de la inscripción.
+        ultimo_recordatorio (DateTimeField): Inicio de la última clase recordada al estudiante.
     
     Relationships:
         - ForeignKey a Perfil (estudiante inscrito)
@@ -216,6 +252,9 @@ class Inscripcion(models.Model):
     #Atributo
     fecha_reserva = models.DateTimeField(auto_now_add=True)
 
+    # Set by notifications.services.reminder_service so each class is reminded once
+    ultimo_recordatorio = models.DateTimeField(null=True, blank=True, editable=False)
+
     def aceptar(self):
         """Acepta una inscripción pendiente, cambiando su estado a ACEPTADO."""
         if self.estado == EstadoInscripcion.PENDIENTE:
@@ -241,6 +280,18 @@ class Inscripcion(models.Model):
             self.save()         
     class Meta: 
         constraints  = [models.UniqueConstraint(fields=['estudiante', 'horario_ofertado'], name='unique_inscripcion')]
+        indexes = [
+            models.Index(fields=['horario_ofertado', 'estado'], name='inscripcion_horario_estado_idx'),
+            models.Index(fields=['estudiante', 'estado'], name='inscripcion_estud_estado_idx'),
+            # Barrido periódico de pendientes vencidas y aceptadas ya dictadas (courses.services.sweep_service)
+            models.Index(fields=['estado', 'fecha_reserva'], name='inscripcion_estado_fecha_idx'),
+            # Conteo de cupos ocupados: solo inscripciones PENDIENTE o ACEPTADO
+            models.Index(
+                fields=['horario_ofertado'],
+                condition=models.Q(estado__in=[EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO]),
+                name='inscripcion_activas_idx',
+            ),
+        ]
         verbose_name_plural = "Inscripciones"
 
     def __str__(self): 
@@ -302,15 +353,26 @@ class Comentario(models.Model):
         publicador (ForeignKey): Usuario que publica el comentario.
         oferta_clase (ForeignKey): Oferta en la que se comenta (opcional).
         solicitud_clase (ForeignKey): Solicitud en la que se comenta (opcional).
+        parent (ForeignKey): Comentario al que responde (None si es raíz del hilo).
+        path (CharField): Ruta materializada: ids de los ancestros y el propio,
+            cada uno con ``PATH_STEP`` dígitos. Ordenar por ``path`` entrega el
+            hilo en orden de lectura y un subárbol es un rango de ``path``.
+        depth (PositiveSmallIntegerField): Nivel en el hilo (0 = raíz).
     
     Relationships:
         - ForeignKey a Perfil (autor del comentario)
         - ForeignKey a OfertaClase (opcional, si comenta en oferta)
         - ForeignKey a SolicitudClase (opcional, si comenta en solicitud)
+        - ForeignKey a Comentario (parent) / Reverse relation: respuestas
     
     Note:
         Un comentario debe estar asociado a UNA oferta O UNA solicitud, no ambas.
+        Las respuestas heredan la publicación de su comentario padre.
     """
+    PATH_STEP = 10
+    # Replies deeper than this are attached to the deepest allowed ancestor
+    MAX_DEPTH = 20
+
     #ID Comentario (PK) se crea automaticamente como 'id'
     contenido = models.TextField()
     fecha_comentario = models.DateTimeField(auto_now_add = True)
@@ -324,5 +386,96 @@ class Comentario(models.Model):
     #ID Solicitud (FK) - Relación N:1 con SOLICITUD CLASE
     solicitud_clase = models.ForeignKey(SolicitudClase, on_delete=models.CASCADE, null=True, blank=True, related_name='comentarios')
 
+    #Respuestas en hilo (ruta materializada)
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='respuestas')
+    path = models.CharField(max_length=PATH_STEP * (MAX_DEPTH + 1), blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Subárboles: rango path >= X AND path < X + '~'
+            models.Index(fields=['path'], name='comentario_path_idx'),
+            # Raíces de los hilos de una publicación, en orden; cada índice solo cubre su tipo
+            models.Index(
+                fields=['oferta_clase', 'depth', 'path'],
+                condition=models.Q(oferta_clase__isnull=False),
+                name='comentario_oferta_hilo_idx',
+            ),
+            models.Index(
+                fields=['solicitud_clase', 'depth', 'path'],
+                condition=models.Q(solicitud_clase__isnull=False),
+                name='comentario_solic_hilo_idx',
+            ),
+        ]
+
     def __str__(self): return f"Comentario de {self.publicador} - {self.fecha_comentario.strftime('%Y-%m-%d')}"
 
+    @classmethod
+    def path_step(cls, pk):
+        return str(pk).zfill(cls.PATH_STEP)
+
+    @property
+    def subtree_bounds(self):
+        """Límites (inclusivo, exclusivo) de ``path`` para este comentario y sus respuestas."""
+        # '~' sorts after every digit
+        return self.path, self.path + '~'
+
+    def save(self, *args, **kwargs):
+        """
+        Completa publicación, ``depth`` y ``path`` de las respuestas.
+
+        El ``path`` incluye el id propio, así que se escribe con un UPDATE
+        justo después del INSERT. Ambos van en la misma transacción: nunca
+        queda guardado un comentario sin ``path``. ``post_save`` corre entre
+        los dos, así que los receivers que necesiten el ``path`` deben leerlo
+        con ``transaction.on_commit``.
+        """
+        if self.parent_id:
+            while self.parent.depth >= self.MAX_DEPTH:
+                self.parent = self.parent.parent
+            self.oferta_clase_id = self.parent.oferta_clase_id
+            self.solicitud_clase_id = self.parent.solicitud_clase_id
+            self.depth = self.parent.depth + 1
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            if not self.path:
+                prefix = self.parent.path if self.parent_id else ''
+                self.path = prefix + self.path_step(self.pk)
+                type(self)._base_manager.using(using).filter(pk=self.pk).update(path=self.path)
+
+
+
+
+#Recomendacion:
+class Recomendacion(models.Model):
+    """
+    Oferta recomendada a un usuario, precalculada por ``build_recommendations``.
+
+    Se guardan solo las ``TOP_N`` mejores ofertas de cada perfil, numeradas por
+    ``posicion``, para que la sección "Para ti" del home sea una lectura por
+    índice sin calcular nada en la petición.
+
+    Attributes:
+        perfil (ForeignKey): Usuario al que se le recomienda la oferta.
+        oferta (ForeignKey): Oferta recomendada.
+        posicion (PositiveSmallIntegerField): Lugar en la lista (0 = mejor).
+        score (FloatField): Puntaje calculado.
+        fecha_calculo (DateTimeField): Cuándo se calculó la recomendación.
+
+    Relationships:
+        - ForeignKey a Perfil
+        - ForeignKey a OfertaClase
+    """
+    perfil = models.ForeignKey(Perfil, on_delete=models.CASCADE, related_name='recomendaciones')
+    oferta = models.ForeignKey(OfertaClase, on_delete=models.CASCADE, related_name='+')
+    posicion = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    fecha_calculo = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['perfil', 'posicion'], name='unique_recomendacion_posicion')]
+        verbose_name = "Recomendación"
+        verbose_name_plural = "Recomendaciones"
+
+    def __str__(self): return f"#{self.posicion} para {self.perfil.user.username}: {self.oferta.titulo}"
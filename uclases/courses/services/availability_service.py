@@ -0,0 +1,115 @@
+"""
+Servicio de búsqueda de horarios con cupos disponibles.
+
+Responde consultas del tipo "ofertas de Ramo X con cupos el martes entre
+14:00 y 18:00" con una sola consulta: un rango sobre el índice
+``(dia, hora_inicio)`` de HorarioOfertado (o ``(oferta, dia, hora_inicio)``
+si se filtra por ramo) y el conteo de inscripciones activas como subconsulta
+correlacionada sobre el índice parcial ``inscripcion_activas_idx``.
+
+Un horario tiene cupos libres con la misma regla que usa ``inscribirse_view``:
+``cupos_totales`` mayor que las inscripciones PENDIENTE o ACEPTADO.
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from courses.enums import EstadoInscripcion
+from courses.models import HorarioOfertado, Inscripcion
+
+ACTIVE_STATES = [EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO]
+
+
+class AvailabilityService:
+    """
+    Servicio que busca horarios con cupos libres.
+
+    Responsabilidades:
+    - Filtrar horarios de ofertas públicas por ramo, día y ventana horaria
+    - Calcular cupos libres en la BD (sin cargar inscripciones)
+    - Ordenar por hora de inicio y rating del profesor
+    """
+
+    MAX_RESULTS = 50
+
+    @staticmethod
+    def active_inscriptions_subquery():
+        """Subconsulta con la cantidad de inscripciones activas de cada horario."""
+        return Coalesce(
+            Subquery(
+                Inscripcion.objects.filter(horario_ofertado=OuterRef('pk'), estado__in=ACTIVE_STATES)
+                .order_by()
+                .values('horario_ofertado')
+                .annotate(total=Count('pk'))
+                .values('total'),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    @staticmethod
+    def search(dia, desde, hasta, ramo=None, limit=MAX_RESULTS):
+        """
+        Horarios con cupos libres que caben completos en la ventana ``[desde, hasta]``.
+
+        Args:
+            dia: Día de la semana (DiaSemana)
+            desde: Hora mínima de inicio (time)
+            hasta: Hora máxima de término (time)
+            ramo: Ramo a filtrar (opcional)
+            limit: Cantidad máxima de resultados
+
+        Returns:
+            QuerySet: Horarios con ``oferta__profesor__user`` y ``oferta__ramo``
+                precargados y anotados con ``ocupados`` y ``cupos_libres``,
+                ordenados por hora de inicio y rating del profesor (desc)
+        """
+        horarios = HorarioOfertado.objects.filter(
+            dia=dia,
+            hora_inicio__gte=desde,
+            hora_fin__lte=hasta,
+            oferta__public=True,
+        )
+        if ramo is not None:
+            horarios = horarios.filter(oferta__ramo=ramo)
+
+        return (
+            horarios
+            .annotate(ocupados=AvailabilityService.active_inscriptions_subquery())
+            .annotate(cupos_libres=F('cupos_totales') - F('ocupados'))
+            .filter(cupos_libres__gt=0)
+            .select_related('oferta__profesor__user', 'oferta__ramo')
+            .order_by('hora_inicio', '-oferta__profesor__rating_promedio', 'pk')[:limit]
+        )
+
+    @staticmethod
+    def serialize(horario):
+        """
+        Representación JSON de un horario encontrado.
+
+        Args:
+            horario: Horario anotado por ``search``
+
+        Returns:
+            dict: Datos del horario, la oferta y el profesor
+        """
+        oferta = horario.oferta
+        profesor = oferta.profesor
+        return {
+            'horario_id': horario.pk,
+            'dia': horario.dia,
+            'dia_label': horario.get_dia_display(),
+            'hora_inicio': horario.hora_inicio.strftime('%H:%M'),
+            'hora_fin': horario.hora_fin.strftime('%H:%M'),
+            'cupos_libres': horario.cupos_libres,
+            'oferta': {
+                'id': oferta.pk,
+                'titulo': oferta.titulo,
+                'ramo': oferta.ramo.name,
+            },
+            'profesor': {
+                'username': profesor.user.username,
+                'rating_promedio': float(profesor.rating_promedio),
+                'total_ratings': profesor.total_ratings,
+            },
+        }
@@ -0,0 +1,313 @@
+"""
+Servicio que genera el calendario iCalendar (.ics) de clases aceptadas de cada usuario.
+
+El feed de un perfil tiene un evento semanal recurrente (``RRULE:FREQ=WEEKLY``)
+por cada inscripción ACEPTADO como estudiante y por cada horario propio con al
+menos un estudiante aceptado. Las horas se publican en la zona de la app
+(``TIME_ZONE``, America/Santiago) con ``TZID``, así el evento sigue a las
+10:00 locales aunque cambie el horario de verano.
+
+Como RFC 5545 exige, cada ``TZID`` usado tiene su ``VTIMEZONE``, armado con
+las transiciones reales de ``zoneinfo`` en los años que cubre el feed.
+
+La URL del feed lleva un token firmado con ``SECRET_KEY`` que contiene el id
+del perfil y su ``calendar_token_version``. Validarlo cuesta una consulta por
+clave primaria, y subir la versión (``revoke``) invalida los enlaces filtrados
+sin rotar la clave.
+
+El cuerpo generado y su ETag se guardan en caché con la clave
+``(perfil, calendar_feed_version)``. La versión vive en la BD, se lee en la
+misma consulta que valida el token y ``invalidate`` la sube cuando cambia algo
+que aparece en el feed (estado de inscripciones, horarios, títulos). Así la
+caché puede ser local a cada proceso: un cambio hecho en otro worker o en un
+comando de cron cambia la clave en todos. Un cliente de calendario que
+consulta cada pocos minutos recibe el cuerpo desde la caché (o un 304 con
+``If-None-Match``). Las URLs del cuerpo se arman con ``SITE_URL`` y no con el
+Host de la request que llenó la caché.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Perfil
+from courses.enums import EstadoInscripcion
+from courses.models import HorarioOfertado, Inscripcion
+
+# RFC 5545 weekday codes, indexed by DiaSemana (1 = Lunes)
+BYDAY = {1: 'MO', 2: 'TU', 3: 'WE', 4: 'TH', 5: 'FR', 6: 'SA', 7: 'SU'}
+
+
+def _escape(text):
+    """Escapa un texto para un valor iCalendar (RFC 5545, 3.3.11)."""
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Corta una línea en trozos de 75 octetos como pide RFC 5545 (sin partir caracteres UTF-8)."""
+    parts, current, size = [], '', 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        # Continuation lines start with a space, which counts towards the 75
+        if size + width > 75:
+            parts.append(current)
+            current, size = ' ', 1
+        current += char
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts)
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _offset(delta):
+    minutes = int(delta.total_seconds() // 60)
+    sign = '-' if minutes < 0 else '+'
+    return f'{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}'
+
+
+def _transitions(tz, first_year, last_year):
+    """Cambios de offset de ``tz`` entre ``first_year`` y ``last_year`` (en UTC, al minuto)."""
+    start = datetime(first_year, 1, 1, tzinfo=dt_timezone.utc)
+    end = datetime(last_year + 1, 1, 1, tzinfo=dt_timezone.utc)
+    found = []
+    day = start
+    while day < end:
+        following = day + timedelta(days=1)
+        if day.astimezone(tz).utcoffset() != following.astimezone(tz).utcoffset():
+            # Binary search the first minute with the new offset
+            low, high = day, following
+            while high - low > timedelta(minutes=1):
+                middle = low + (high - low) / 2
+                if middle.astimezone(tz).utcoffset() == low.astimezone(tz).utcoffset():
+                    low = middle
+                else:
+                    high = middle
+            found.append(high.replace(second=0, microsecond=0))
+        day = following
+    return found
+
+
+def _vtimezone(tzid, first_year, last_year):
+    """Líneas del ``VTIMEZONE`` de ``tzid`` con sus transiciones en esos años."""
+    tz = ZoneInfo(tzid)
+    lines = ['BEGIN:VTIMEZONE', f'TZID:{tzid}']
+    transitions = _transitions(tz, first_year, last_year)
+    if not transitions:
+        # No DST in the range: a single observance
+        sample = datetime(first_year, 1, 1, tzinfo=dt_timezone.utc).astimezone(tz)
+        offset = _offset(sample.utcoffset())
+        lines += [
+            'BEGIN:STANDARD', f'DTSTART:{first_year}0101T000000',
+            f'TZOFFSETFROM:{offset}', f'TZOFFSETTO:{offset}', f'TZNAME:{sample.tzname()}', 'END:STANDARD',
+        ]
+    for moment in transitions:
+        before = (moment - timedelta(minutes=1)).astimezone(tz)
+        after = moment.astimezone(tz)
+        kind = 'DAYLIGHT' if after.dst() else 'STANDARD'
+        # DTSTART is the local time of the onset under the previous offset
+        onset = (moment + before.utcoffset()).replace(tzinfo=None)
+        lines += [
+            f'BEGIN:{kind}', f'DTSTART:{onset:%Y%m%dT%H%M%S}',
+            f'TZOFFSETFROM:{_offset(before.utcoffset())}', f'TZOFFSETTO:{_offset(after.utcoffset())}',
+            f'TZNAME:{after.tzname()}', f'END:{kind}',
+        ]
+    lines.append('END:VTIMEZONE')
+    return lines
+
+
+def _first_occurrence(since, dia):
+    """Primera fecha igual o posterior a ``since`` (datetime) que cae en ``dia`` (DiaSemana)."""
+    start = timezone.localtime(since).date()
+    return start + timedelta(days=(dia - 1 - start.weekday()) % 7)
+
+
+class CalendarService:
+    """
+    Servicio que arma y cachea los feeds .ics de clases aceptadas.
+
+    Responsabilidades:
+    - Generar y validar el token secreto del feed de cada perfil
+    - Renderizar los eventos recurrentes de estudiante y de profesor
+    - Cachear el feed por perfil y versión, y subir la versión cuando cambian sus datos
+    """
+
+    TOKEN_SALT = 'courses.calendar'
+    CACHE_PREFIX = 'calendar:feed:'
+    # The versioned key keeps it fresh; the timeout only bounds how long idle feeds stay in memory
+    CACHE_SECONDS = 60 * 60 * 24
+
+    @staticmethod
+    def token_for(perfil):
+        """Token secreto (firmado) del feed del perfil, atado a su ``calendar_token_version``."""
+        return signing.dumps([perfil.pk, perfil.calendar_token_version], salt=CalendarService.TOKEN_SALT)
+
+    @staticmethod
+    def resolve_token(token):
+        """
+        Perfil y versión del feed de un token (una consulta por clave primaria).
+
+        Returns:
+            tuple | None: (id del perfil, ``calendar_feed_version``), o None si
+            la firma no es válida o el enlace fue revocado
+        """
+        try:
+            payload = signing.loads(token, salt=CalendarService.TOKEN_SALT)
+        except signing.BadSignature:
+            return None
+        if not (isinstance(payload, list) and len(payload) == 2 and all(isinstance(v, int) for v in payload)):
+            return None
+        perfil_id, version = payload
+        feed_version = (
+            Perfil.objects
+            .filter(pk=perfil_id, calendar_token_version=version)
+            .values_list('calendar_feed_version', flat=True)
+            .first()
+        )
+        if feed_version is None:
+            return None
+        return perfil_id, feed_version
+
+    @staticmethod
+    def revoke(perfil_id):
+        """Invalida los enlaces anteriores del perfil (el siguiente ``token_for`` usa la nueva versión)."""
+        Perfil.objects.filter(pk=perfil_id).update(calendar_token_version=F('calendar_token_version') + 1)
+
+    @staticmethod
+    def feed_url(request, perfil):
+        """URL absoluta del feed, para pegarla en Google Calendar, Outlook o Calendario."""
+        return request.build_absolute_uri(
+            reverse('courses:calendar_feed', args=[CalendarService.token_for(perfil)])
+        )
+
+    @staticmethod
+    def invalidate(*perfil_ids):
+        """
+        Sube ``calendar_feed_version`` de los perfiles dados (un UPDATE).
+
+        Las entradas anteriores quedan huérfanas en la caché de cada proceso
+        hasta que vencen; ninguna request vuelve a pedirlas.
+        """
+        ids = {perfil_id for perfil_id in perfil_ids if perfil_id}
+        if ids:
+            Perfil.objects.filter(pk__in=ids).update(calendar_feed_version=F('calendar_feed_version') + 1)
+
+    @staticmethod
+    def get_feed(perfil_id, feed_version):
+        """
+        Feed del perfil, desde la caché si no cambió nada.
+
+        Args:
+            perfil_id: Id del perfil
+            feed_version: ``calendar_feed_version`` leída con ``resolve_token``
+
+        Returns:
+            tuple: (etag, cuerpo .ics en bytes)
+        """
+        key = f'{CalendarService.CACHE_PREFIX}{perfil_id}:{feed_version}'
+        cached = cache.get(key)
+        if cached is None:
+            body = CalendarService.render(perfil_id).encode('utf-8')
+            cached = (f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"', body)
+            cache.set(key, cached, CalendarService.CACHE_SECONDS)
+        return cached
+
+    @staticmethod
+    def render(perfil_id):
+        """
+        Calendario completo del perfil (dos consultas).
+
+        Returns:
+            str: Contenido .ics con fines de línea CRLF
+        """
+        tz = settings.TIME_ZONE
+        events = []
+
+        inscripciones = (
+            Inscripcion.objects
+            .filter(estudiante_id=perfil_id, estado=EstadoInscripcion.ACEPTADO)
+            .select_related('horario_ofertado__oferta__profesor__user', 'horario_ofertado__oferta__ramo')
+            .order_by('pk')
+        )
+        for inscripcion in inscripciones:
+            horario = inscripcion.horario_ofertado
+            oferta = horario.oferta
+            events.append(CalendarService._event(
+                uid=f'inscripcion-{inscripcion.pk}@uclases',
+                stamp=inscripcion.fecha_reserva,
+                horario=horario,
+                start=_first_occurrence(inscripcion.fecha_reserva, horario.dia),
+                summary=oferta.titulo,
+                description=f'{oferta.ramo.name} con {oferta.profesor.user.username}',
+                url=settings.SITE_URL + reverse('courses:oferta_detail', args=[oferta.pk]),
+            ))
+
+        horarios = (
+            HorarioOfertado.objects
+            .filter(oferta__profesor_id=perfil_id)
+            .annotate(aceptados=Count('inscripciones', filter=Q(inscripciones__estado=EstadoInscripcion.ACEPTADO)))
+            .filter(aceptados__gt=0)
+            .select_related('oferta__ramo')
+            .order_by('pk')
+        )
+        for horario in horarios:
+            oferta = horario.oferta
+            estudiantes = 'estudiante' if horario.aceptados == 1 else 'estudiantes'
+            events.append(CalendarService._event(
+                uid=f'horario-{horario.pk}@uclases',
+                stamp=oferta.fecha_publicacion,
+                horario=horario,
+                start=_first_occurrence(oferta.fecha_publicacion, horario.dia),
+                summary=f'Clase: {oferta.titulo}',
+                description=f'{oferta.ramo.name} ({horario.aceptados} {estudiantes} aceptados)',
+                url=settings.SITE_URL + reverse('courses:mis_ofertas_horarios', args=[oferta.pk]),
+            ))
+
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//U-Clases//Clases aceptadas//ES',
+            'CALSCALE:GREGORIAN',
+            'METHOD:PUBLISH',
+            'X-WR-CALNAME:U-Clases',
+            f'X-WR-TIMEZONE:{tz}',
+        ]
+        if events:
+            # From the observance in force at the earliest DTSTART to two years of recurrences
+            first_year = min(start.year for start, _ in events) - 1
+            last_year = max(timezone.localdate().year, first_year) + 2
+            lines += _vtimezone(tz, first_year, last_year)
+        for _, event in events:
+            lines += event
+        lines.append('END:VCALENDAR')
+        return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+    @staticmethod
+    def _event(uid, stamp, horario, start, summary, description, url):
+        """(fecha de inicio, líneas del VEVENT)."""
+        tz = settings.TIME_ZONE
+        return start, [
+            'BEGIN:VEVENT',
+            f'UID:{uid}',
+            # Creation time, not "now": the body (and its ETag) only change when the data does
+            f'DTSTAMP:{_utc(stamp)}',
+            f'DTSTART;TZID={tz}:{datetime.combine(start, horario.hora_inicio):%Y%m%dT%H%M%S}',
+            f'DTEND;TZID={tz}:{datetime.combine(start, horario.hora_fin):%Y%m%dT%H%M%S}',
+            f'RRULE:FREQ=WEEKLY;BYDAY={BYDAY[horario.dia]}',
+            f'SUMMARY:{_escape(summary)}',
+            f'DESCRIPTION:{_escape(description)}',
+            f'URL:{url}',
+            'END:VEVENT',
+        ]
@@ -0,0 +1,213 @@
+"""
+Servicio que importa el catálogo universitario desde archivos CSV o JSON.
+
+Tres tipos de archivo, con una fila por registro:
+
+- Carreras y ramos: columnas ``codigo`` y ``nombre``. El código es la clave:
+  si ya existe se actualiza el nombre. Si no existe pero hay una fila sin
+  código con el mismo nombre (creada a mano o por ``seed``), se le asigna el
+  código en vez de duplicarla.
+- Ramos cursados (PerfilRamo): columnas ``usuario`` (username) y ``ramo``
+  (código del ramo). Solo agrega; no borra ramos cursados que no vengan en
+  el archivo.
+
+Los archivos se leen fila a fila (``.csv`` y ``.jsonl``; un ``.json`` con una
+lista se carga completo) y se escriben por lotes de ``BATCH_SIZE`` filas: por
+lote, una consulta para ver qué existe y un ``bulk_create`` que inserta o
+actualiza en la misma sentencia (``update_conflicts``). Cada lote deja su
+resultado en un ``CatalogueDiff`` (creados, actualizados, sin cambios y
+errores por línea).
+"""
+
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+
+from accounts.models import Perfil
+from courses.models import Carrera, PerfilRamo, Ramo
+
+
+class CatalogueDiff:
+    """
+    Resultado de importar un archivo.
+
+    Los contadores son exactos; ``changes`` guarda solo las primeras
+    ``MAX_CHANGES`` líneas de detalle para no crecer con el archivo.
+    """
+
+    MAX_CHANGES = 200
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = []
+        self.changes = []
+
+    def change(self, text):
+        if len(self.changes) < self.MAX_CHANGES:
+            self.changes.append(text)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+
+class CatalogueImportService:
+    """
+    Servicio que carga Carreras, Ramos y ramos cursados en bloque.
+
+    Responsabilidades:
+    - Leer CSV / JSON Lines / JSON fila a fila
+    - Insertar o actualizar por lotes con ``bulk_create``
+    - Informar las diferencias con lo que ya había en la BD
+    """
+
+    BATCH_SIZE = 1000
+    CODIGO_MAX_LENGTH = Ramo._meta.get_field('codigo').max_length
+    NAME_MAX_LENGTH = Ramo._meta.get_field('name').max_length
+
+    @staticmethod
+    def read_rows(path):
+        """
+        Lee un archivo de catálogo sin cargarlo completo en memoria.
+
+        Args:
+            path: Ruta a un ``.csv``, ``.jsonl`` o ``.json`` (lista de objetos)
+
+        Yields:
+            tuple: (número de línea, dict con columnas en minúsculas)
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+        # utf-8-sig: files exported from spreadsheets (and core.exports) start with a BOM
+        with path.open(encoding='utf-8-sig', newline='') as fh:
+            if suffix == '.csv':
+                reader = csv.DictReader(fh)
+                for row in reader:
+                    yield reader.line_num, CatalogueImportService._normalize(row)
+            elif suffix == '.jsonl':
+                for line_num, line in enumerate(fh, start=1):
+                    if line.strip():
+                        yield line_num, CatalogueImportService._normalize(json.loads(line))
+            elif suffix == '.json':
+                for index, row in enumerate(json.load(fh), start=1):
+                    yield index, CatalogueImportService._normalize(row)
+            else:
+                raise ValueError(f"Formato no soportado: {path.name} (usa .csv, .jsonl o .json)")
+
+    @staticmethod
+    def _normalize(row):
+        return {str(key).strip().lower(): str(value).strip() for key, value in row.items() if value is not None}
+
+    @staticmethod
+    def _batches(rows, size):
+        rows = iter(rows)
+        while batch := list(islice(rows, size)):
+            yield batch
+
+    @staticmethod
+    def import_carreras(rows, batch_size=BATCH_SIZE):
+        """Carga carreras (``codigo``, ``nombre``). Returns: CatalogueDiff."""
+        return CatalogueImportService._import_named(Carrera, rows, batch_size)
+
+    @staticmethod
+    def import_ramos(rows, batch_size=BATCH_SIZE):
+        """Carga ramos (``codigo``, ``nombre``). Returns: CatalogueDiff."""
+        return CatalogueImportService._import_named(Ramo, rows, batch_size)
+
+    @staticmethod
+    def _import_named(model, rows, batch_size):
+        cls = CatalogueImportService
+        diff = CatalogueDiff()
+        for batch in cls._batches(rows, batch_size):
+            # codigo -> nombre; a repeated code keeps the last row
+            incoming = {}
+            for line, row in batch:
+                codigo, nombre = row.get('codigo', ''), row.get('nombre', '')
+                if not codigo or not nombre:
+                    diff.error(line, "faltan 'codigo' o 'nombre'")
+                elif len(codigo) > cls.CODIGO_MAX_LENGTH or len(nombre) > cls.NAME_MAX_LENGTH:
+                    diff.error(line, f"'codigo' o 'nombre' demasiado largo ({codigo})")
+                else:
+                    incoming[codigo] = nombre
+
+            existing = dict(model.objects.filter(codigo__in=incoming).values_list('codigo', 'name'))
+            # Rows created before codes existed: adopt them by name instead of duplicating
+            missing = {nombre: codigo for codigo, nombre in incoming.items() if codigo not in existing}
+            adopted = list(model.objects.filter(codigo__isnull=True, name__in=missing))
+            for obj in adopted:
+                if obj.name in missing:
+                    obj.codigo = missing.pop(obj.name)
+                    diff.updated += 1
+                    diff.change(f"~ {obj.codigo}: código asignado a '{obj.name}'")
+            adopted = [obj for obj in adopted if obj.codigo]
+            model.objects.bulk_update(adopted, ['codigo'])
+            adopted_codes = {obj.codigo for obj in adopted}
+
+            to_write = []
+            for codigo, nombre in incoming.items():
+                if codigo in adopted_codes:
+                    continue
+                if codigo not in existing:
+                    diff.created += 1
+                    diff.change(f"+ {codigo}: '{nombre}'")
+                elif existing[codigo] != nombre:
+                    diff.updated += 1
+                    diff.change(f"~ {codigo}: '{existing[codigo]}' -> '{nombre}'")
+                else:
+                    diff.unchanged += 1
+                    continue
+                to_write.append(model(codigo=codigo, name=nombre))
+            # One statement inserts the new codes and renames the existing ones
+            model.objects.bulk_create(
+                to_write, update_conflicts=True, unique_fields=['codigo'], update_fields=['name'],
+            )
+        return diff
+
+    @staticmethod
+    def import_cursados(rows, batch_size=BATCH_SIZE):
+        """
+        Carga ramos cursados (``usuario``, ``ramo``).
+
+        Args:
+            rows: Filas de ``read_rows``
+            batch_size: Filas por lote
+
+        Returns:
+            CatalogueDiff: Sin ``updated`` (PerfilRamo no tiene otros campos)
+        """
+        diff = CatalogueDiff()
+        for batch in CatalogueImportService._batches(rows, batch_size):
+            wanted = [(line, row.get('usuario', ''), row.get('ramo', '')) for line, row in batch]
+            perfiles = dict(
+                Perfil.objects.filter(user__username__in={u for _, u, _ in wanted}).values_list('user__username', 'pk')
+            )
+            ramos = dict(Ramo.objects.filter(codigo__in={r for _, _, r in wanted}).values_list('codigo', 'pk'))
+
+            pairs = {}
+            for line, username, codigo in wanted:
+                if not username or not codigo:
+                    diff.error(line, "faltan 'usuario' o 'ramo'")
+                elif username not in perfiles:
+                    diff.error(line, f"usuario desconocido: {username}")
+                elif codigo not in ramos:
+                    diff.error(line, f"ramo desconocido: {codigo}")
+                else:
+                    pairs[(perfiles[username], ramos[codigo])] = (username, codigo)
+
+            existing = set(
+                PerfilRamo.objects.filter(
+                    perfil_id__in={p for p, _ in pairs}, ramo_id__in={r for _, r in pairs},
+                ).values_list('perfil_id', 'ramo_id')
+            )
+            new = [pair for pair in pairs if pair not in existing]
+            diff.unchanged += len(pairs) - len(new)
+            diff.created += len(new)
+            for pair in new:
+                diff.change("+ {}: {}".format(*pairs[pair]))
+            # The pair is the whole row: there is nothing to update on conflict
+            PerfilRamo.objects.bulk_create(
+                [PerfilRamo(perfil_id=p, ramo_id=r) for p, r in new], ignore_conflicts=True,
+            )
+        return diff
@@ -0,0 +1,142 @@
+"""
+Servicio para la lectura paginada de comentarios de una publicación.
+
+Los detalles de oferta y solicitud muestran solo la primera página de
+hilos; el resto se carga con el endpoint JSON de "cargar más". Se pagina por
+comentarios raíz y cada página se arma con dos consultas: las raíces y luego
+todas sus respuestas con un único rango sobre ``path`` dentro de la
+publicación (los subárboles de raíces consecutivas son contiguos en ese
+orden). El total viene del contador
+``total_comentarios`` de la publicación, así que el número de consultas no
+depende del tamaño ni de la profundidad de los hilos.
+"""
+
+from django.urls import reverse
+from django.utils import dateformat, timezone
+
+from courses.models import Comentario, OfertaClase
+
+
+class CommentService:
+    """
+    Servicio que entrega comentarios de ofertas y solicitudes por páginas.
+
+    Responsabilidades:
+    - Construir el queryset en orden de hilo con el autor precargado
+    - Paginar por hilos sin COUNT (se pide una raíz extra para saber si hay más)
+    - Obtener subárboles con una consulta de rango sobre ``path``
+    - Serializar comentarios para el endpoint JSON
+    """
+
+    PAGE_SIZE = 10
+
+    @staticmethod
+    def queryset_for(publication):
+        """
+        Comentarios de una oferta o solicitud en orden de hilo.
+
+        Args:
+            publication: Instancia de OfertaClase o SolicitudClase
+
+        Returns:
+            QuerySet: Comentarios con ``publicador__user`` precargado, ordenados por ``path``
+        """
+        fk = 'oferta_clase' if isinstance(publication, OfertaClase) else 'solicitud_clase'
+        return (
+            Comentario.objects.filter(**{fk: publication})
+            .select_related('publicador__user')
+            .order_by('path')
+        )
+
+    @staticmethod
+    def get_page(publication, page=1, page_size=PAGE_SIZE):
+        """
+        Obtiene una página de hilos: ``page_size`` raíces con todas sus respuestas.
+
+        Args:
+            publication: Instancia de OfertaClase o SolicitudClase
+            page: Número de página (desde 1); valores inválidos se tratan como 1
+            page_size: Hilos (comentarios raíz) por página
+
+        Returns:
+            tuple: (comentarios: list en orden de lectura, has_more: bool)
+        """
+        try:
+            page = max(int(page), 1)
+        except (TypeError, ValueError):
+            page = 1
+        offset = (page - 1) * page_size
+        queryset = CommentService.queryset_for(publication)
+        roots = list(queryset.filter(depth=0)[offset:offset + page_size + 1])
+        has_more = len(roots) > page_size
+        roots = roots[:page_size]
+        if not roots:
+            return [], has_more
+
+        # Root paths are global ids: other publications' threads can fall inside the range
+        start, _ = roots[0].subtree_bounds
+        _, end = roots[-1].subtree_bounds
+        return list(queryset.filter(path__gte=start, path__lt=end)), has_more
+
+    @staticmethod
+    def get_subtree(comentario):
+        """
+        Un comentario y todas sus respuestas (a cualquier profundidad) en una consulta.
+
+        Args:
+            comentario: Instancia de Comentario
+
+        Returns:
+            QuerySet: Subárbol ordenado por ``path``
+        """
+        return CommentService._path_range(*comentario.subtree_bounds)
+
+    @staticmethod
+    def _path_range(start, end):
+        return (
+            Comentario.objects.filter(path__gte=start, path__lt=end)
+            .select_related('publicador__user')
+            .order_by('path')
+        )
+
+    @staticmethod
+    def resolve_parent(publication, parent_id):
+        """
+        Valida el comentario al que se responde.
+
+        Args:
+            publication: Instancia de OfertaClase o SolicitudClase
+            parent_id: Id recibido en el formulario (puede ser vacío)
+
+        Returns:
+            Comentario | None: El padre si pertenece a la publicación, si no None
+        """
+        if not parent_id:
+            return None
+        try:
+            return CommentService.queryset_for(publication).get(pk=int(parent_id))
+        except (ValueError, Comentario.DoesNotExist):
+            return None
+
+    @staticmethod
+    def serialize(comentario):
+        """
+        Representación JSON de un comentario.
+
+        Args:
+            comentario: Instancia de Comentario con ``publicador__user`` cargado
+
+        Returns:
+            dict: Datos para renderizar el comentario en el cliente
+        """
+        user = comentario.publicador.user
+        return {
+            'id': comentario.pk,
+            'parent_id': comentario.parent_id,
+            'depth': comentario.depth,
+            'autor': user.username,
+            'perfil_url': reverse('accounts:profile_detail', args=[user.public_uid]),
+            'contenido': comentario.contenido,
+            'fecha': comentario.fecha_comentario.isoformat(),
+            'fecha_display': dateformat.format(timezone.localtime(comentario.fecha_comentario), 'd/m/Y H:i'),
+        }
@@ -0,0 +1,85 @@
+"""
+Servicio que define las exportaciones de inscripciones y ratings.
+
+Cada exportación es una lista de columnas (nombre, ruta de ``values_list``)
+con los datos relacionados ya aplanados (estudiante, oferta, ramo, horario,
+profesor) y un queryset según quién exporta: el staff exporta todo, el resto
+solo lo propio. El streaming lo hace ``core.exports``.
+"""
+
+from django.db.models import Q
+
+from courses.models import Inscripcion, Rating
+
+
+class ExportService:
+    """
+    Servicio con las columnas y filas exportables de courses.
+
+    Responsabilidades:
+    - Definir columnas aplanadas para Inscripcion y Rating
+    - Limitar las filas a lo que el usuario puede ver
+    """
+
+    INSCRIPCION_COLUMNS = [
+        ('id', 'pk'),
+        ('estado', 'estado'),
+        ('fecha_reserva', 'fecha_reserva'),
+        ('estudiante', 'estudiante__user__username'),
+        ('estudiante_nombre', 'estudiante__user__first_name'),
+        ('estudiante_apellido', 'estudiante__user__last_name'),
+        ('estudiante_carrera', 'estudiante__carrera__name'),
+        ('oferta_id', 'horario_ofertado__oferta_id'),
+        ('oferta', 'horario_ofertado__oferta__titulo'),
+        ('ramo', 'horario_ofertado__oferta__ramo__name'),
+        ('profesor', 'horario_ofertado__oferta__profesor__user__username'),
+        ('dia', 'horario_ofertado__dia'),
+        ('hora_inicio', 'horario_ofertado__hora_inicio'),
+        ('hora_fin', 'horario_ofertado__hora_fin'),
+        ('rating', 'rating__valoracion'),
+    ]
+
+    RATING_COLUMNS = [
+        ('id', 'pk'),
+        ('valoracion', 'valoracion'),
+        ('comentario', 'comentario'),
+        ('fecha_rating', 'fecha_rating'),
+        ('calificador', 'calificador__user__username'),
+        ('calificado', 'calificado__user__username'),
+        ('inscripcion_id', 'inscripcion_id'),
+        ('oferta_id', 'inscripcion__horario_ofertado__oferta_id'),
+        ('oferta', 'inscripcion__horario_ofertado__oferta__titulo'),
+        ('ramo', 'inscripcion__horario_ofertado__oferta__ramo__name'),
+    ]
+
+    @staticmethod
+    def inscripciones_for(user):
+        """
+        Inscripciones que el usuario puede exportar.
+
+        Args:
+            user: Usuario autenticado
+
+        Returns:
+            QuerySet: Todas para el staff; si no, las de sus ofertas y las propias
+        """
+        inscripciones = Inscripcion.objects.order_by('pk')
+        if user.is_staff:
+            return inscripciones
+        return inscripciones.filter(Q(horario_ofertado__oferta__profesor_id=user.pk) | Q(estudiante_id=user.pk))
+
+    @staticmethod
+    def ratings_for(user):
+        """
+        Ratings que el usuario puede exportar.
+
+        Args:
+            user: Usuario autenticado
+
+        Returns:
+            QuerySet: Todos para el staff; si no, los recibidos y los dados
+        """
+        ratings = Rating.objects.order_by('pk')
+        if user.is_staff:
+            return ratings
+        return ratings.filter(Q(calificado_id=user.pk) | Q(calificador_id=user.pk))
@@ -0,0 +1,125 @@
+"""
+Servicio que sugiere tutores para una solicitud de clase.
+
+La tabla PerfilRamo funciona como índice invertido Ramo -> perfiles que lo
+cursaron: con su índice por ``ramo_id`` los candidatos de una solicitud se
+obtienen sin recorrer todos los usuarios, así que el costo depende de cuántos
+aprobaron ese ramo y no del total de perfiles.
+
+Cada candidato recibe un puntaje calculado en la BD:
+
+- Rating bayesiano: ``rating_promedio`` suavizado hacia ``PRIOR_MEAN`` con
+  peso ``PRIOR_WEIGHT``, para que un único 5.0 no supere a un 4.8 con
+  decenas de calificaciones.
+- Misma carrera que el solicitante.
+- Disponibilidad: ya tiene un horario público de ese ramo con cupos libres.
+
+Solo se traen los ``TOP_K`` mejores.
+"""
+
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Value, When
+from django.db.models.functions import Cast
+
+from accounts.models import Perfil
+from courses.models import HorarioOfertado
+from courses.services.availability_service import AvailabilityService
+
+
+class TutorMatchingService:
+    """
+    Servicio que encuentra y ordena posibles tutores para una SolicitudClase.
+
+    Responsabilidades:
+    - Obtener candidatos desde el índice Ramo -> PerfilRamo
+    - Puntuar por rating, carrera y disponibilidad en una sola consulta
+    - Entregar los K mejores
+    """
+
+    TOP_K = 5
+
+    PRIOR_MEAN = 3.5
+    PRIOR_WEIGHT = 5
+
+    WEIGHT_RATING = 0.6
+    WEIGHT_CARRERA = 0.15
+    WEIGHT_DISPONIBLE = 0.25
+
+    @staticmethod
+    def open_slots_for_ramo(ramo_id):
+        """Exists() de horarios públicos del ramo con cupos, del perfil externo."""
+        return Exists(
+            HorarioOfertado.objects.filter(
+                oferta__profesor=OuterRef('pk'),
+                oferta__ramo_id=ramo_id,
+                oferta__public=True,
+            )
+            .annotate(ocupados=AvailabilityService.active_inscriptions_subquery())
+            .filter(cupos_totales__gt=F('ocupados'))
+        )
+
+    @staticmethod
+    def candidates(solicitud):
+        """
+        Perfiles que cursaron el ramo de la solicitud, anotados con su puntaje.
+
+        Args:
+            solicitud: Instancia de SolicitudClase
+
+        Returns:
+            QuerySet: Perfiles (sin el solicitante) con ``rating_bayes``,
+                ``misma_carrera``, ``disponible`` y ``score``, ordenados por ``score``
+        """
+        cls = TutorMatchingService
+        solicitante = solicitud.solicitante
+
+        rating = Cast('rating_promedio', FloatField())
+        total = Cast('total_ratings', FloatField())
+        rating_bayes = (rating * total + cls.PRIOR_MEAN * cls.PRIOR_WEIGHT) / (total + cls.PRIOR_WEIGHT)
+
+        if solicitante.carrera_id:
+            misma_carrera = Case(
+                When(carrera_id=solicitante.carrera_id, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        else:
+            misma_carrera = Value(0.0, output_field=FloatField())
+
+        disponible = Case(
+            When(cls.open_slots_for_ramo(solicitud.ramo_id), then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+
+        return (
+            Perfil.objects.filter(perfilramo__ramo_id=solicitud.ramo_id)
+            .exclude(pk=solicitud.solicitante_id)
+            .annotate(
+                rating_bayes=rating_bayes,
+                misma_carrera=misma_carrera,
+                disponible=disponible,
+            )
+            .annotate(
+                score=(
+                    cls.WEIGHT_RATING * F('rating_bayes') / 5.0
+                    + cls.WEIGHT_CARRERA * F('misma_carrera')
+                    + cls.WEIGHT_DISPONIBLE * F('disponible')
+                )
+            )
+            .select_related('user')
+            .order_by('-score', '-total_ratings', 'pk')
+        )
+
+    @staticmethod
+    def suggest(solicitud, limit=TOP_K):
+        """
+        Los mejores tutores para la solicitud.
+
+        Args:
+            solicitud: Instancia de SolicitudClase
+            limit: Cantidad de sugerencias
+
+        Returns:
+            list[Perfil]: Hasta ``limit`` perfiles ordenados por puntaje
+        """
+        return list(TutorMatchingService.candidates(solicitud)[:limit])
@@ -0,0 +1,240 @@
+"""
+Servicio que precalcula las ofertas recomendadas de cada usuario ("Para ti").
+
+El cálculo se hace fuera de la petición (``manage.py build_recommendations``)
+y por lotes de perfiles:
+
+1. Una sola vez: la calidad de cada oferta pública (rating bayesiano del
+   profesor) y, por ramo, la lista de ofertas ordenada por calidad. También la
+   popularidad de cada ramo dentro de cada carrera (inscripciones agrupadas
+   por carrera y ramo).
+2. Por lote: una matriz dispersa perfil x ramo de afinidad, armada con tres
+   consultas para todo el lote (solicitudes, inscripciones y ramos cursados).
+   Pesan las solicitudes propias, las inscripciones previas y lo que más toma
+   la carrera. Un ramo ya cursado (PerfilRamo) queda con afinidad 0.
+3. El puntaje de una oferta es ``afinidad(ramo) * (ALPHA + (1 - ALPHA) * calidad)``.
+   Dentro de un ramo el orden lo da solo la calidad, así que basta recorrer
+   el comienzo de la lista de cada ramo y quedarse con los ``TOP_N`` mejores
+   con un heap.
+
+Cada lote reemplaza sus filas de Recomendacion en una transacción.
+"""
+
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from accounts.models import Perfil
+from courses.models import Inscripcion, OfertaClase, PerfilRamo, Recomendacion, SolicitudClase
+
+
+class RecommendationService:
+    """
+    Servicio que calcula y guarda las recomendaciones de ofertas.
+
+    Responsabilidades:
+    - Cargar calidad de ofertas y popularidad por carrera una vez
+    - Armar la afinidad perfil x ramo por lotes
+    - Guardar las ``TOP_N`` mejores ofertas de cada perfil
+    """
+
+    TOP_N = 10
+    BATCH_SIZE = 500
+
+    PRIOR_MEAN = 3.5
+    PRIOR_WEIGHT = 5
+
+    WEIGHT_SOLICITUD = 1.0
+    WEIGHT_INSCRIPCION = 0.6
+    WEIGHT_CARRERA = 0.4
+    # Inscriptions beyond this count add no more affinity
+    MAX_INSCRIPCIONES = 3
+    # Share of the score that does not depend on the professor's rating
+    ALPHA = 0.5
+
+    @staticmethod
+    def quality(rating_promedio, total_ratings):
+        """Rating bayesiano normalizado a [0, 1]."""
+        cls = RecommendationService
+        bayes = (float(rating_promedio) * total_ratings + cls.PRIOR_MEAN * cls.PRIOR_WEIGHT) / (
+            total_ratings + cls.PRIOR_WEIGHT
+        )
+        return bayes / 5.0
+
+    @staticmethod
+    def load_offers():
+        """
+        Ofertas públicas agrupadas por ramo.
+
+        Returns:
+            dict[int, list[tuple[float, int, int]]]: ramo_id -> lista de
+                (calidad, oferta_id, profesor_id) ordenada por calidad (desc)
+        """
+        by_ramo = defaultdict(list)
+        rows = OfertaClase.objects.filter(public=True).values_list(
+            'pk', 'ramo_id', 'profesor_id', 'profesor__rating_promedio', 'profesor__total_ratings'
+        )
+        for pk, ramo_id, profesor_id, rating, total in rows:
+            by_ramo[ramo_id].append((RecommendationService.quality(rating, total), pk, profesor_id))
+        for offers in by_ramo.values():
+            offers.sort(key=lambda offer: (-offer[0], -offer[1]))
+        return by_ramo
+
+    @staticmethod
+    def load_carrera_popularity():
+        """
+        Popularidad de cada ramo dentro de cada carrera.
+
+        Returns:
+            dict[int, dict[int, float]]: carrera_id -> {ramo_id: popularidad}, donde
+                el ramo más tomado de la carrera vale 1
+        """
+        counts = defaultdict(dict)
+        rows = (
+            Inscripcion.objects.filter(estudiante__carrera__isnull=False)
+            .values_list('estudiante__carrera_id', 'horario_ofertado__oferta__ramo_id')
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        for carrera_id, ramo_id, total in rows:
+            counts[carrera_id][ramo_id] = total
+        popularity = {}
+        for carrera_id, ramos in counts.items():
+            top = max(ramos.values())
+            popularity[carrera_id] = {ramo_id: total / top for ramo_id, total in ramos.items()}
+        return popularity
+
+    @staticmethod
+    def affinity_matrix(perfiles, carrera_popularity):
+        """
+        Afinidad perfil x ramo de un lote, como matriz dispersa.
+
+        Args:
+            perfiles: Lista de (perfil_id, carrera_id) del lote
+            carrera_popularity: Resultado de ``load_carrera_popularity``
+
+        Returns:
+            tuple[dict[int, dict[int, float]], dict[int, set[int]]]: Afinidades
+                por perfil y ofertas en que cada perfil ya se inscribió
+        """
+        cls = RecommendationService
+        ids = [perfil_id for perfil_id, _ in perfiles]
+        matrix = {perfil_id: dict(carrera_popularity.get(carrera_id, {})) for perfil_id, carrera_id in perfiles}
+        for row in matrix.values():
+            for ramo_id in row:
+                row[ramo_id] *= cls.WEIGHT_CARRERA
+
+        inscritas = defaultdict(set)
+        por_ramo = defaultdict(lambda: defaultdict(int))
+        rows = Inscripcion.objects.filter(estudiante_id__in=ids).values_list(
+            'estudiante_id', 'horario_ofertado__oferta_id', 'horario_ofertado__oferta__ramo_id'
+        )
+        for perfil_id, oferta_id, ramo_id in rows:
+            inscritas[perfil_id].add(oferta_id)
+            por_ramo[perfil_id][ramo_id] += 1
+        for perfil_id, ramos in por_ramo.items():
+            row = matrix[perfil_id]
+            for ramo_id, total in ramos.items():
+                peso = cls.WEIGHT_INSCRIPCION * min(total, cls.MAX_INSCRIPCIONES) / cls.MAX_INSCRIPCIONES
+                row[ramo_id] = row.get(ramo_id, 0.0) + peso
+
+        rows = SolicitudClase.objects.filter(solicitante_id__in=ids).values_list('solicitante_id', 'ramo_id').distinct()
+        for perfil_id, ramo_id in rows:
+            matrix[perfil_id][ramo_id] = matrix[perfil_id].get(ramo_id, 0.0) + cls.WEIGHT_SOLICITUD
+
+        # A ramo the user already passed is one they could teach, not take
+        for perfil_id, ramo_id in PerfilRamo.objects.filter(perfil_id__in=ids).values_list('perfil_id', 'ramo_id'):
+            matrix[perfil_id].pop(ramo_id, None)
+
+        return matrix, inscritas
+
+    @staticmethod
+    def top_offers(perfil_id, affinities, offers_by_ramo, excluded, limit=TOP_N):
+        """
+        Las ``limit`` ofertas con mayor puntaje para un perfil.
+
+        Args:
+            perfil_id: Perfil a recomendar (se omiten sus propias ofertas)
+            affinities: Fila de la matriz de afinidad del perfil
+            offers_by_ramo: Resultado de ``load_offers``
+            excluded: Ofertas a omitir (ya inscritas)
+            limit: Cantidad de recomendaciones
+
+        Returns:
+            list[tuple[float, int]]: Pares (score, oferta_id) de mayor a menor
+        """
+        alpha = RecommendationService.ALPHA
+        candidates = []
+        for ramo_id, afinidad in affinities.items():
+            taken = 0
+            for quality, oferta_id, profesor_id in offers_by_ramo.get(ramo_id, ()):
+                if taken == limit:
+                    break
+                if profesor_id == perfil_id or oferta_id in excluded:
+                    continue
+                candidates.append((afinidad * (alpha + (1 - alpha) * quality), oferta_id))
+                taken += 1
+        return heapq.nlargest(limit, candidates)
+
+    @staticmethod
+    def build(batch_size=BATCH_SIZE, limit=TOP_N):
+        """
+        Recalcula las recomendaciones de todos los perfiles.
+
+        Args:
+            batch_size: Perfiles por lote
+            limit: Recomendaciones por perfil
+
+        Returns:
+            tuple[int, int]: (perfiles procesados, recomendaciones guardadas)
+        """
+        cls = RecommendationService
+        offers_by_ramo = cls.load_offers()
+        carrera_popularity = cls.load_carrera_popularity()
+
+        perfiles_total = recomendaciones_total = 0
+        last_pk = None
+        while True:
+            perfiles = Perfil.objects.order_by('pk')
+            if last_pk is not None:
+                perfiles = perfiles.filter(pk__gt=last_pk)
+            batch = list(perfiles.values_list('pk', 'carrera_id')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            matrix, inscritas = cls.affinity_matrix(batch, carrera_popularity)
+            filas = [
+                Recomendacion(perfil_id=perfil_id, oferta_id=oferta_id, posicion=posicion, score=score)
+                for perfil_id, _ in batch
+                for posicion, (score, oferta_id) in enumerate(
+                    cls.top_offers(perfil_id, matrix[perfil_id], offers_by_ramo, inscritas[perfil_id], limit)
+                )
+            ]
+            with transaction.atomic():
+                Recomendacion.objects.filter(perfil_id__in=[perfil_id for perfil_id, _ in batch]).delete()
+                Recomendacion.objects.bulk_create(filas)
+
+            perfiles_total += len(batch)
+            recomendaciones_total += len(filas)
+        return perfiles_total, recomendaciones_total
+
+    @staticmethod
+    def for_perfil(perfil):
+        """
+        Recomendaciones guardadas de un perfil, listas para mostrar.
+
+        Args:
+            perfil: Perfil o su pk (el id del usuario)
+
+        Returns:
+            QuerySet: Recomendaciones de ofertas aún públicas, con oferta,
+                profesor y ramo precargados, ordenadas por posición
+        """
+        return (
+            Recomendacion.objects.filter(perfil=perfil, oferta__public=True)
+            .select_related('oferta__profesor__user', 'oferta__profesor__carrera', 'oferta__ramo')
+            .order_by('posicion')
+        )
@@ -0,0 +1,92 @@
+"""
+Índice de horarios por profesor para detectar superposiciones.
+
+Un profesor no puede dar dos clases a la vez, aunque pertenezcan a ofertas
+distintas. ``ScheduleIndex`` carga en una consulta todos los horarios del
+profesor y los guarda por día como intervalos semiabiertos
+``[hora_inicio, hora_fin)`` ordenados por inicio, junto con el máximo
+acumulado de los términos. Con eso cada consulta de superposición es una
+búsqueda binaria (O(log n)), aun si los datos existentes ya tuvieran
+horarios superpuestos.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from courses.models import HorarioOfertado
+
+Interval = namedtuple('Interval', ['inicio', 'fin', 'horario_id', 'oferta_id', 'oferta_titulo'])
+
+
+class _DaySchedule:
+    """Intervalos de un día ordenados por inicio, con máximo acumulado de término."""
+
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals)
+        self.starts = [interval.inicio for interval in self.intervals]
+        # latest[i] is the interval with the greatest end among intervals[0..i]
+        self.latest = []
+        for interval in self.intervals:
+            if not self.latest or interval.fin > self.latest[-1].fin:
+                self.latest.append(interval)
+            else:
+                self.latest.append(self.latest[-1])
+
+    def overlap(self, inicio, fin):
+        # Candidates start before `fin`; one overlaps iff the latest end among them is after `inicio`
+        i = bisect_left(self.starts, fin)
+        if i and self.latest[i - 1].fin > inicio:
+            return self.latest[i - 1]
+        return None
+
+
+class ScheduleIndex:
+    """
+    Horarios de un profesor indexados por día.
+
+    Uso típico al validar un formset de horarios:
+
+        index = ScheduleIndex.for_profesor(perfil, exclude_oferta=oferta)
+        conflicto = index.find_overlap(dia, hora_inicio, hora_fin)
+    """
+
+    def __init__(self, intervals_by_day):
+        self._days = {dia: _DaySchedule(intervals) for dia, intervals in intervals_by_day.items()}
+
+    @classmethod
+    def for_profesor(cls, profesor, exclude_oferta=None):
+        """
+        Construye el índice con una sola consulta.
+
+        Args:
+            profesor: Perfil del profesor
+            exclude_oferta: Oferta cuyos horarios se omiten (la que se está editando)
+
+        Returns:
+            ScheduleIndex: Índice con los horarios vigentes del profesor
+        """
+        horarios = HorarioOfertado.objects.filter(oferta__profesor=profesor)
+        if exclude_oferta is not None and exclude_oferta.pk:
+            horarios = horarios.exclude(oferta=exclude_oferta)
+
+        by_day = defaultdict(list)
+        rows = horarios.values_list('dia', 'hora_inicio', 'hora_fin', 'pk', 'oferta_id', 'oferta__titulo')
+        for dia, inicio, fin, pk, oferta_id, titulo in rows:
+            by_day[dia].append(Interval(inicio, fin, pk, oferta_id, titulo))
+        return cls(by_day)
+
+    def find_overlap(self, dia, inicio, fin):
+        """
+        Busca un horario que se superponga con ``[inicio, fin)`` en ``dia``.
+
+        Horarios que solo se tocan (uno termina cuando el otro empieza) no
+        se consideran superpuestos.
+
+        Returns:
+            Interval | None: Un horario en conflicto, o None si no hay
+        """
+        day = self._days.get(dia)
+        return day.overlap(inicio, fin) if day else None
+
+    def __len__(self):
+        return sum(len(day.intervals) for day in self._days.values())
@@ -0,0 +1,214 @@
+"""
+Barrido periódico del ciclo de vida de las inscripciones.
+
+- Las PENDIENTE más antiguas que ``PENDING_MAX_AGE`` (el profesor nunca
+  respondió) pasan a RECHAZADO. Así dejan de ocupar cupo en
+  ``inscribirse_view``. El estudiante recibe ``INSCRIPTION_EXPIRED`` y la
+  notificación del profesor queda marcada como "Vencida".
+- Opcionalmente, las ACEPTADO cuya clase ya se dictó pasan a COMPLETADO. El
+  estudiante recibe ``INSCRIPTION_COMPLETED``, igual que con
+  ``completar_horario_view``.
+
+Cada lote es un ``UPDATE ... WHERE id IN (...) AND estado = ...`` más un
+``bulk_create`` de notificaciones, sin ``save()`` por fila. Por eso aquí se
+hace a mano lo que harían los signals de ``Inscripcion``: subir las versiones
+de los horarios y calendarios cacheados y contar la transición en
+``uclases_inscripcion_transitions_total``. Las versiones viven en la BD
+(``Perfil.timetable_version`` / ``calendar_feed_version``), así que los
+workers web dejan de servir la copia anterior aunque el barrido corra en otro
+proceso y no comparta su caché. Las filas tocadas por corrida
+quedan en ``uclases_inscripcion_sweep_rows_total``.
+
+Una clase se considera dictada cuando su última ocurrencia semanal
+(``dia`` / ``hora_fin``, hora local) terminó y la inscripción se reservó
+antes del día de esa ocurrencia. El criterio es conservador: una reserva
+hecha el mismo día de la clase espera a la semana siguiente. Se usa
+``fecha_reserva`` porque ``Inscripcion`` no guarda cuándo se aceptó: una
+reserva aceptada días después puede completarse con una clase que ocurrió
+mientras seguía pendiente.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.metrics import registry
+from courses.enums import EstadoInscripcion
+from courses.models import Inscripcion
+from courses.services.calendar_service import CalendarService
+from courses.services.timetable_service import TimetableService
+from courses.signals import INSCRIPCION_TRANSITIONS
+from notifications.enums import NotificationTypes
+from notifications.services.notification_service import NotificationService
+
+SWEEP_ROWS = registry.counter(
+    "uclases_inscripcion_sweep_rows_total",
+    "Inscripciones cambiadas por el barrido periódico (expired = pendientes vencidas, completed = clases dictadas).",
+    ("action",),
+)
+
+
+class InscriptionSweepService:
+    """
+    Servicio que vence pendientes sin respuesta y completa clases ya dictadas.
+
+    Responsabilidades:
+    - Seleccionar por lotes las inscripciones a cambiar
+    - Cambiar su estado con UPDATEs por conjunto
+    - Enviar las notificaciones en bloque
+    - Reemplazar los efectos de los signals (versiones de caché y métricas)
+    """
+
+    PENDING_MAX_AGE = timedelta(days=7)
+    COMPLETE_GRACE = timedelta(hours=1)
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def expire_stale(now=None, max_age=None, batch_size=None, dry_run=False):
+        """
+        Vence las inscripciones PENDIENTE reservadas hace más de ``max_age``.
+
+        Args:
+            now: Momento de referencia (por defecto ahora)
+            max_age: Antigüedad máxima de una pendiente (por defecto ``PENDING_MAX_AGE``)
+            batch_size: Inscripciones por lote (por defecto ``BATCH_SIZE``)
+            dry_run: Solo cuenta, sin cambiar nada
+
+        Returns:
+            int: Inscripciones vencidas (o que se vencerían)
+        """
+        now = now or timezone.now()
+        max_age = max_age or InscriptionSweepService.PENDING_MAX_AGE
+        pendientes = Inscripcion.objects.filter(
+            estado=EstadoInscripcion.PENDIENTE, fecha_reserva__lt=now - max_age,
+        )
+        total = InscriptionSweepService._sweep(
+            pendientes,
+            desde=EstadoInscripcion.PENDIENTE,
+            hasta=EstadoInscripcion.RECHAZADO,
+            notification_type=NotificationTypes.INSCRIPTION_EXPIRED,
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+        if total and not dry_run:
+            SWEEP_ROWS.inc("expired", amount=total)
+        return total
+
+    @staticmethod
+    def complete_past(now=None, grace=None, batch_size=None, dry_run=False):
+        """
+        Completa las inscripciones ACEPTADO cuya clase terminó hace más de ``grace``.
+
+        Args:
+            now: Momento de referencia (por defecto ahora)
+            grace: Margen después del término de la clase (por defecto ``COMPLETE_GRACE``)
+            batch_size: Inscripciones por lote (por defecto ``BATCH_SIZE``)
+            dry_run: Solo cuenta, sin cambiar nada
+
+        Returns:
+            int: Inscripciones completadas (o que se completarían)
+        """
+        now = now or timezone.now()
+        grace = InscriptionSweepService.COMPLETE_GRACE if grace is None else grace
+        aceptadas = Inscripcion.objects.filter(
+            InscriptionSweepService.past_class_filter(now - grace), estado=EstadoInscripcion.ACEPTADO,
+        )
+        total = InscriptionSweepService._sweep(
+            aceptadas,
+            desde=EstadoInscripcion.ACEPTADO,
+            hasta=EstadoInscripcion.COMPLETADO,
+            notification_type=NotificationTypes.INSCRIPTION_COMPLETED,
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+        if total and not dry_run:
+            SWEEP_ROWS.inc("completed", amount=total)
+        return total
+
+    @staticmethod
+    def past_class_filter(until):
+        """
+        Filtro de inscripciones con al menos una clase terminada antes de ``until``.
+
+        Para cada día de la semana se calcula la fecha de su última
+        ocurrencia terminada; la inscripción califica si se reservó antes de
+        ese día. Son a lo más ocho condiciones sobre ``dia``, ``hora_fin`` y
+        ``fecha_reserva``, sin aritmética de fechas en SQL. Es la fecha de la
+        reserva, no la de aceptación (que no se guarda).
+
+        Args:
+            until: Datetime con zona horaria
+
+        Returns:
+            Q: Condición sobre ``Inscripcion``
+        """
+        local = timezone.localtime(until)
+        today = local.date()
+        tz = timezone.get_current_timezone()
+
+        def reserved_before(day):
+            return Q(fecha_reserva__lt=timezone.make_aware(datetime.combine(day, time.min), tz))
+
+        condition = Q()
+        for dia in range(1, 8):
+            if dia == today.isoweekday():
+                # Today's class counts only once it has ended; otherwise last week's does
+                condition |= Q(horario_ofertado__dia=dia, horario_ofertado__hora_fin__lte=local.time()) & reserved_before(today)
+                condition |= Q(horario_ofertado__dia=dia) & reserved_before(today - timedelta(days=7))
+            else:
+                last = today - timedelta(days=(today.isoweekday() - dia) % 7)
+                condition |= Q(horario_ofertado__dia=dia) & reserved_before(last)
+        return condition
+
+    @staticmethod
+    def _sweep(queryset, desde, hasta, notification_type, batch_size=None, dry_run=False):
+        if dry_run:
+            return queryset.count()
+
+        batch_size = batch_size or InscriptionSweepService.BATCH_SIZE
+        total = 0
+        while True:
+            with transaction.atomic():
+                lote = list(
+                    queryset
+                    .select_related('estudiante', 'horario_ofertado__oferta__ramo', 'horario_ofertado__oferta__profesor__user')
+                    .select_for_update(of=('self',))
+                    .order_by('pk')[:batch_size]
+                )
+                if not lote:
+                    return total
+                ids = [inscripcion.pk for inscripcion in lote]
+                # The estado guard keeps rows changed by a request since the SELECT (where not locked);
+                # only the rows this UPDATE changed get notified and counted
+                updated = Inscripcion.objects.filter(pk__in=ids, estado=desde).update(estado=hasta)
+                if updated < len(lote):
+                    changed = set(Inscripcion.objects.filter(pk__in=ids, estado=hasta).values_list('pk', flat=True))
+                    lote = [inscripcion for inscripcion in lote if inscripcion.pk in changed]
+                    ids = [inscripcion.pk for inscripcion in lote]
+                    if not lote:
+                        continue
+                for inscripcion in lote:
+                    inscripcion.estado = hasta
+                    inscripcion._estado_original = hasta
+
+                NotificationService.send_bulk(
+                    notification_type,
+                    ((inscripcion.estudiante, {'inscripcion': inscripcion}, inscripcion) for inscripcion in lote),
+                    batch_size=batch_size,
+                )
+                if desde == EstadoInscripcion.PENDIENTE:
+                    NotificationService.mark_action_many(
+                        NotificationTypes.INSCRIPTION_CREATED, Inscripcion, ids, "Vencida ⌛",
+                    )
+
+                # Bumps the versions in the database: the web workers' caches are out of reach from here
+                estudiantes = [inscripcion.estudiante_id for inscripcion in lote]
+                TimetableService.invalidate(*estudiantes)
+                if desde == EstadoInscripcion.ACEPTADO:
+                    CalendarService.invalidate(
+                        *estudiantes, *(inscripcion.horario_ofertado.oferta.profesor_id for inscripcion in lote),
+                    )
+                INSCRIPCION_TRANSITIONS.inc(desde, hasta, amount=len(lote))
+            total += len(lote)
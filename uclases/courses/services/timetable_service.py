@@ -0,0 +1,177 @@
+"""
+Servicio del horario semanal de cada estudiante.
+
+El horario se arma con una sola consulta (``Inscripcion`` → ``HorarioOfertado``
+→ oferta, ramo y profesor) sobre las inscripciones PENDIENTE y ACEPTADO, que
+son las que ocupan el bloque. Las filas quedan ordenadas por
+``(dia, hora_inicio, hora_fin)`` y se guardan en caché para la página
+"Mi horario" con la clave ``(perfil, timetable_version)``. La versión vive en
+la BD y ``invalidate`` (desde los signals de courses o el barrido de cron) la
+sube cuando cambia una inscripción, un horario o una oferta del estudiante;
+como la vista ya carga el perfil, leerla no cuesta otra consulta y un cambio
+hecho en cualquier proceso cambia la clave en todos. La validación de
+choques al inscribirse igual lee la BD, sin caché.
+
+Con k inscripciones activas, ordenar cuesta O(k log k); marcar los bloques
+que chocan es un barrido lineal por día (cada bloque se compara con el que
+termina más tarde entre los anteriores) y validar una inscripción nueva es
+una búsqueda binaria en un ``ScheduleIndex``.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+from django.db.models import F
+
+from accounts.models import Perfil
+from courses.enums import DiaSemana, EstadoInscripcion
+from courses.models import Inscripcion
+from courses.services.schedule_index import Interval, ScheduleIndex
+
+TimetableEntry = namedtuple('TimetableEntry', [
+    'inscripcion_id', 'estado', 'dia', 'inicio', 'fin',
+    'horario_id', 'oferta_id', 'oferta_titulo', 'ramo', 'profesor',
+])
+
+
+class TimetableService:
+    """
+    Servicio que arma, cachea y valida el horario semanal de un estudiante.
+
+    Responsabilidades:
+    - Cargar las inscripciones activas del estudiante en una consulta
+    - Detectar bloques superpuestos en el horario
+    - Validar que un horario nuevo no choque con las inscripciones activas
+    - Cachear el horario por perfil y versión (solo para mostrarlo) y subir la versión cuando cambia
+    """
+
+    ESTADOS_ACTIVOS = (EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO)
+    CACHE_PREFIX = 'timetable:'
+    # The versioned key keeps it fresh; the timeout only bounds how long idle entries stay in memory
+    CACHE_SECONDS = 60 * 60 * 24
+
+    @staticmethod
+    def invalidate(*perfil_ids):
+        """Sube ``timetable_version`` de los perfiles dados (un UPDATE): sus horarios cacheados dejan de usarse."""
+        ids = {perfil_id for perfil_id in perfil_ids if perfil_id}
+        if ids:
+            Perfil.objects.filter(pk__in=ids).update(timetable_version=F('timetable_version') + 1)
+
+    @staticmethod
+    def entries(perfil):
+        """
+        Inscripciones activas del estudiante, desde la caché si no cambió nada.
+
+        Args:
+            perfil: Perfil del estudiante, leído en esta request (su
+                ``timetable_version`` es parte de la clave)
+
+        Returns:
+            list[TimetableEntry]: Ordenadas por día, hora de inicio y de término
+        """
+        key = f'{TimetableService.CACHE_PREFIX}{perfil.pk}:{perfil.timetable_version}'
+        entries = cache.get(key)
+        if entries is None:
+            entries = TimetableService._load(perfil.pk)
+            cache.set(key, entries, TimetableService.CACHE_SECONDS)
+        return entries
+
+    @staticmethod
+    def _load(perfil_id):
+        rows = (
+            Inscripcion.objects
+            .filter(estudiante_id=perfil_id, estado__in=TimetableService.ESTADOS_ACTIVOS)
+            .values_list(
+                'pk', 'estado', 'horario_ofertado__dia', 'horario_ofertado__hora_inicio',
+                'horario_ofertado__hora_fin', 'horario_ofertado_id', 'horario_ofertado__oferta_id',
+                'horario_ofertado__oferta__titulo', 'horario_ofertado__oferta__ramo__name',
+                'horario_ofertado__oferta__profesor__user__username',
+            )
+        )
+        return sorted(
+            (TimetableEntry(*row) for row in rows),
+            key=lambda entry: (entry.dia, entry.inicio, entry.fin, entry.inscripcion_id),
+        )
+
+    @staticmethod
+    def conflicts(entries):
+        """
+        Inscripciones cuyos bloques se superponen con algún otro.
+
+        Bloques que solo se tocan (uno termina cuando el otro empieza) no
+        chocan, igual que en ``ScheduleIndex``.
+
+        Args:
+            entries: Lista ordenada como la devuelve ``entries``
+
+        Returns:
+            set: Ids de las inscripciones en conflicto
+        """
+        conflictos = set()
+        latest = None
+        for entry in entries:
+            if latest is None or latest.dia != entry.dia:
+                latest = entry
+                continue
+            # Any earlier block overlapping this one also overlaps the one ending latest
+            if entry.inicio < latest.fin:
+                conflictos.update((entry.inscripcion_id, latest.inscripcion_id))
+            if entry.fin > latest.fin:
+                latest = entry
+        return conflictos
+
+    @staticmethod
+    def schedule_index(perfil_id):
+        """
+        Índice de los bloques activos del estudiante para validar inscripciones nuevas.
+
+        Lee la BD (una consulta), no la caché: la validación corre con el
+        perfil bloqueado y debe ver las inscripciones confirmadas hasta ese
+        momento.
+
+        Returns:
+            ScheduleIndex: ``find_overlap`` devuelve el ``Interval`` con que choca
+        """
+        by_day = defaultdict(list)
+        for entry in TimetableService._load(perfil_id):
+            by_day[entry.dia].append(
+                Interval(entry.inicio, entry.fin, entry.horario_id, entry.oferta_id, entry.oferta_titulo)
+            )
+        return ScheduleIndex(by_day)
+
+    @staticmethod
+    def find_conflict(perfil_id, horario):
+        """
+        Busca una inscripción activa del estudiante que choque con ``horario``.
+
+        Args:
+            perfil_id: Id del perfil del estudiante
+            horario: HorarioOfertado al que se quiere inscribir
+
+        Returns:
+            Interval | None: El bloque en conflicto, o None si no hay
+        """
+        index = TimetableService.schedule_index(perfil_id)
+        return index.find_overlap(horario.dia, horario.hora_inicio, horario.hora_fin)
+
+    @staticmethod
+    def week(perfil):
+        """
+        Horario semanal listo para el template.
+
+        Returns:
+            tuple: (lista de días ``{'dia', 'label', 'bloques'}`` de lunes a
+            domingo, donde cada bloque es ``{'entry', 'estado_label',
+            'conflicto'}``; cantidad de inscripciones en conflicto)
+        """
+        entries = TimetableService.entries(perfil)
+        conflictos = TimetableService.conflicts(entries)
+        bloques = defaultdict(list)
+        for entry in entries:
+            bloques[entry.dia].append({
+                'entry': entry,
+                'estado_label': EstadoInscripcion(entry.estado).label,
+                'conflicto': entry.inscripcion_id in conflictos,
+            })
+        dias = [{'dia': dia.value, 'label': dia.label, 'bloques': bloques[dia.value]} for dia in DiaSemana]
+        return dias, len(conflictos)
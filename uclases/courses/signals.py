@@ -1,7 +1,18 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from django.db.models import Avg, Count
-from courses.models import Rating
+from django.db.models import Avg, Count, F
+from core.metrics import registry
+from courses.enums import EstadoInscripcion
+from courses.models import Comentario, HorarioOfertado, Inscripcion, OfertaClase, Rating, SolicitudClase
+from courses.services.calendar_service import CalendarService
+from courses.services.timetable_service import TimetableService
+
+INSCRIPCION_TRANSITIONS = registry.counter(
+    "uclases_inscripcion_transitions_total",
+    "Cambios de estado de inscripciones (from_state vacío = inscripción nueva).",
+    ("from_state", "to_state"),
+)
+
 
 @receiver([post_save, post_delete], sender=Rating)
 def update_profile_rating_on_change(sender, instance, **kwargs):
@@ -24,4 +35,143 @@ def update_profile_rating_on_change(sender, instance, **kwargs):
     # Guardar únicamente los campos que cambiaron
     calificado.rating_promedio = round(promedio, 2)
     calificado.total_ratings = total
-    calificado.save(update_fields=['rating_promedio', 'total_ratings'])
\ No newline at end of file
+    calificado.save(update_fields=['rating_promedio', 'total_ratings'])
+
+
+def _comment_publication_queryset(comentario):
+    """Queryset con la publicación (oferta o solicitud) del comentario."""
+    if comentario.oferta_clase_id:
+        return OfertaClase.objects.filter(pk=comentario.oferta_clase_id)
+    if comentario.solicitud_clase_id:
+        return SolicitudClase.objects.filter(pk=comentario.solicitud_clase_id)
+    return None
+
+
+@receiver(post_save, sender=Comentario)
+def increment_total_comentarios(sender, instance, created, **kwargs):
+    """
+    Suma 1 a `total_comentarios` de la publicación al crear un comentario.
+    Usa F() para que el incremento sea atómico en la BD.
+    """
+    if not created:
+        return
+    publication = _comment_publication_queryset(instance)
+    if publication is not None:
+        publication.update(total_comentarios=F('total_comentarios') + 1)
+
+
+@receiver(post_delete, sender=Comentario)
+def decrement_total_comentarios(sender, instance, **kwargs):
+    """Resta 1 a `total_comentarios` de la publicación al eliminar un comentario."""
+    publication = _comment_publication_queryset(instance)
+    if publication is not None:
+        publication.filter(total_comentarios__gt=0).update(total_comentarios=F('total_comentarios') - 1)
+
+
+@receiver(post_init, sender=Inscripcion)
+def remember_inscripcion_estado(sender, instance, **kwargs):
+    """Guarda el estado con que se cargó la inscripción (sin consultar si está diferido)."""
+    instance._estado_original = instance.__dict__.get('estado')
+
+
+def _profesor_of_horario(horario_id, horario=None):
+    """Perfil dueño del horario, sin consultar si la oferta ya está cargada."""
+    if horario is not None and HorarioOfertado.oferta.is_cached(horario):
+        return horario.oferta.profesor_id
+    return HorarioOfertado.objects.filter(pk=horario_id).values_list('oferta__profesor_id', flat=True).first()
+
+
+def _accepted_students(**filters):
+    return list(
+        Inscripcion.objects.filter(estado=EstadoInscripcion.ACEPTADO, **filters).values_list('estudiante_id', flat=True)
+    )
+
+
+def _active_students(**filters):
+    return list(
+        Inscripcion.objects
+        .filter(estado__in=TimetableService.ESTADOS_ACTIVOS, **filters)
+        .values_list('estudiante_id', flat=True)
+    )
+
+
+# Runs before count_inscripcion_transition, which resets _estado_original
+@receiver(post_save, sender=Inscripcion)
+def invalidate_calendar_on_inscripcion(sender, instance, created, **kwargs):
+    """Descarta los feeds .ics del estudiante y del profesor si la inscripción entra o sale de ACEPTADO."""
+    anterior = '' if created else instance._estado_original
+    # None: the state was deferred when loaded, so it may have left ACEPTADO
+    if anterior is not None and EstadoInscripcion.ACEPTADO not in (anterior, instance.estado):
+        return
+    if anterior == instance.estado:
+        return
+    horario = instance.horario_ofertado if Inscripcion.horario_ofertado.is_cached(instance) else None
+    CalendarService.invalidate(instance.estudiante_id, _profesor_of_horario(instance.horario_ofertado_id, horario))
+
+
+@receiver(post_delete, sender=Inscripcion)
+def invalidate_calendar_on_inscripcion_delete(sender, instance, origin=None, **kwargs):
+    """Descarta los feeds .ics al borrar una inscripción aceptada."""
+    if instance.estado != EstadoInscripcion.ACEPTADO:
+        return
+    # Deleting an offer or a schedule already invalidated the professor's feed
+    if isinstance(origin, (OfertaClase, HorarioOfertado)):
+        CalendarService.invalidate(instance.estudiante_id)
+        return
+    horario = instance.horario_ofertado if Inscripcion.horario_ofertado.is_cached(instance) else None
+    CalendarService.invalidate(instance.estudiante_id, _profesor_of_horario(instance.horario_ofertado_id, horario))
+
+
+@receiver(post_save, sender=HorarioOfertado)
+@receiver(pre_delete, sender=HorarioOfertado)
+def invalidate_calendar_on_horario(sender, instance, created=False, origin=None, **kwargs):
+    """Descarta los feeds .ics del profesor y de los aceptados cuando cambia o se borra un horario."""
+    # A new schedule has no accepted students; an offer's deletion is handled on the offer
+    if created or isinstance(origin, OfertaClase):
+        return
+    CalendarService.invalidate(
+        _profesor_of_horario(instance.pk, instance), *_accepted_students(horario_ofertado=instance),
+    )
+
+
+@receiver(post_save, sender=OfertaClase)
+@receiver(pre_delete, sender=OfertaClase)
+def invalidate_calendar_on_oferta(sender, instance, created=False, **kwargs):
+    """Descarta los feeds .ics del profesor y de los aceptados cuando cambia o se borra la oferta."""
+    if created:
+        return
+    CalendarService.invalidate(instance.profesor_id, *_accepted_students(horario_ofertado__oferta=instance))
+
+
+@receiver([post_save, post_delete], sender=Inscripcion)
+def invalidate_timetable_on_inscripcion(sender, instance, **kwargs):
+    """Descarta el horario semanal cacheado del estudiante al crear, cambiar o borrar una inscripción."""
+    TimetableService.invalidate(instance.estudiante_id)
+
+
+@receiver(post_save, sender=HorarioOfertado)
+@receiver(pre_delete, sender=HorarioOfertado)
+def invalidate_timetable_on_horario(sender, instance, created=False, origin=None, **kwargs):
+    """Descarta el horario semanal de los inscritos activos cuando cambia o se borra un horario."""
+    if created or isinstance(origin, OfertaClase):
+        return
+    TimetableService.invalidate(*_active_students(horario_ofertado=instance))
+
+
+@receiver(post_save, sender=OfertaClase)
+@receiver(pre_delete, sender=OfertaClase)
+def invalidate_timetable_on_oferta(sender, instance, created=False, **kwargs):
+    """Descarta el horario semanal de los inscritos activos cuando cambia o se borra la oferta."""
+    if created:
+        return
+    TimetableService.invalidate(*_active_students(horario_ofertado__oferta=instance))
+
+
+@receiver(post_save, sender=Inscripcion)
+def count_inscripcion_transition(sender, instance, created, **kwargs):
+    """Cuenta el cambio de estado en la métrica ``uclases_inscripcion_transitions_total``."""
+    anterior = '' if created else instance._estado_original
+    # None: the state was deferred when loaded, the previous value is unknown
+    if anterior is not None and anterior != instance.estado:
+        INSCRIPCION_TRANSITIONS.inc(anterior, instance.estado)
+    instance._estado_original = instance.estado
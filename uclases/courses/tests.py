@@ -1,13 +1,33 @@
+import tempfile
+from datetime import datetime, time, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
 from uuid import uuid4
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.signals import post_init
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.forms import ValidationError
 from django.utils import timezone
 from django.urls import reverse
 
 from courses.forms import HorarioOfertadoForm, HorarioFormSet, OfertaForm, SolicitudClaseForm
-from courses.models import OfertaClase, HorarioOfertado, Ramo, Perfil  # ajusta si la ruta cambia
-from courses.enums import DiaSemana
+from courses.models import Carrera, Comentario, Inscripcion, OfertaClase, HorarioOfertado, PerfilRamo, Ramo, Perfil, Recomendacion, SolicitudClase  # ajusta si la ruta cambia
+from courses.services.calendar_service import CalendarService
+from courses.services.comment_service import CommentService
+from courses.services.schedule_index import Interval, ScheduleIndex
+from courses.services.sweep_service import InscriptionSweepService
+from courses.services.timetable_service import TimetableService
+from courses.services.matching_service import TutorMatchingService
+from courses.services.recommendation_service import RecommendationService
+from courses.enums import DiaSemana, EstadoInscripcion
+from notifications.enums import NotificationTypes
+from notifications.models import Notification
 
 User = get_user_model()
 
@@ -168,6 +188,41 @@ class BaseHorarioFormSetTests(FormFactoriesMixin, TestCase):
         # Se espera exactamente 1 horario asociado a la oferta creada
         self.assertEqual(HorarioOfertado.objects.filter(oferta=oferta).count(), 1)
 
+    def horario(self, dia, inicio, fin):
+        return {"dia": dia, "hora_inicio": inicio, "hora_fin": fin, "cupos_totales": 1}
+
+    def test_rejects_overlap_within_formset(self):
+        """Dos filas del mismo día que se cruzan -> error en la segunda."""
+        oferta = self.make_oferta()
+        post = self.build_formset_post("horarios", forms=[
+            self.horario(DiaSemana.LUNES, "09:00", "11:00"),
+            self.horario(DiaSemana.LUNES, "10:00", "12:00"),
+            self.horario(DiaSemana.LUNES, "11:00", "12:00"),  # toca la primera, pero choca con la segunda
+        ])
+        formset = HorarioFormSet(post, instance=oferta, prefix="horarios", profesor=oferta.profesor)
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.forms[0].non_field_errors(), [])
+        self.assertIn("otro horario de esta oferta", formset.forms[1].non_field_errors()[0])
+        self.assertIn("otro horario de esta oferta", formset.forms[2].non_field_errors()[0])
+
+    def test_rejects_overlap_with_other_offer_of_same_profesor(self):
+        """Un horario que choca con otra oferta del profesor reporta esa oferta."""
+        otra = self.make_oferta("Cálculo en la tarde")
+        HorarioOfertado.objects.create(oferta=otra, dia=DiaSemana.MARTES, hora_inicio="15:00", hora_fin="17:00")
+        nueva = OfertaClase(profesor=otra.profesor, ramo=otra.ramo, titulo="Nueva", descripcion="d")
+        post = self.build_formset_post("horarios", forms=[self.horario(DiaSemana.MARTES, "16:30", "18:00")])
+        formset = HorarioFormSet(post, instance=nueva, prefix="horarios", profesor=otra.profesor)
+        self.assertFalse(formset.is_valid())
+        self.assertIn("'Cálculo en la tarde'", formset.forms[0].non_field_errors()[0])
+
+    def test_editing_offer_ignores_its_own_saved_horarios(self):
+        """Al editar, los horarios guardados de la misma oferta no cuentan como conflicto."""
+        oferta = self.make_oferta()
+        HorarioOfertado.objects.create(oferta=oferta, dia=DiaSemana.MARTES, hora_inicio="15:00", hora_fin="17:00")
+        post = self.build_formset_post("horarios", forms=[self.horario(DiaSemana.MARTES, "15:30", "17:00")])
+        formset = HorarioFormSet(post, instance=oferta, prefix="horarios", profesor=oferta.profesor)
+        self.assertTrue(formset.is_valid(), formset.errors)
+
 class OfertaFormRamosTests(FormFactoriesMixin, TestCase):
     """Pruebas para la validación del `OfertaForm` relacionado a `ramo`.
 
@@ -242,4 +297,611 @@ class SolicitudClaseFormTests(FormFactoriesMixin, TestCase):
             "ramo": ramo.pk,
         })
         self.assertFalse(form.is_valid())
-        self.assertIn("titulo", form.errors)
\ No newline at end of file
+        self.assertIn("titulo", form.errors)
+
+
+class ComentariosPaginadosTests(FormFactoriesMixin, TestCase):
+    """Pruebas de la paginación de comentarios y del contador total_comentarios."""
+
+    def setUp(self):
+        self.oferta = self.make_oferta()
+        self.autor = self.oferta.profesor
+        self.client = Client()
+
+    def comentar(self, n):
+        inicio = Comentario.objects.count()
+        for i in range(inicio, inicio + n):
+            Comentario.objects.create(contenido=f"c{i}", publicador=self.autor, oferta_clase=self.oferta)
+
+    def detail_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("courses:oferta_detail", args=[self.oferta.pk]))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_contador_se_actualiza_al_crear_y_borrar(self):
+        self.comentar(3)
+        self.oferta.refresh_from_db()
+        self.assertEqual(self.oferta.total_comentarios, 3)
+        Comentario.objects.filter(oferta_clase=self.oferta).first().delete()
+        self.oferta.refresh_from_db()
+        self.assertEqual(self.oferta.total_comentarios, 2)
+
+    def test_detalle_con_cantidad_fija_de_consultas(self):
+        """Con 2 o con 25 comentarios el detalle hace las mismas consultas."""
+        self.comentar(2)
+        pocos, _ = self.detail_queries()
+        self.comentar(23)
+        muchos, response = self.detail_queries()
+        self.assertEqual(pocos, muchos)
+        self.assertEqual(len(response.context["comentarios"]), 10)
+        self.assertTrue(response.context["comentarios_has_more"])
+
+    def test_endpoint_cargar_mas(self):
+        self.comentar(12)
+        url = reverse("courses:oferta_comentarios", args=[self.oferta.pk])
+        data = self.client.get(url, {"page": 2}).json()
+        self.assertEqual([c["contenido"] for c in data["comentarios"]], ["c10", "c11"])
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["total"], 12)
+
+
+
+class ComentariosHilosTests(FormFactoriesMixin, TestCase):
+    """Pruebas de respuestas en hilo con ruta materializada."""
+
+    def setUp(self):
+        self.oferta = self.make_oferta()
+        self.autor = self.oferta.profesor
+
+    def comentar(self, contenido, parent=None):
+        return Comentario.objects.create(
+            contenido=contenido, publicador=self.autor, oferta_clase=self.oferta, parent=parent
+        )
+
+    def test_orden_de_hilo_y_subarbol(self):
+        a = self.comentar("a")
+        b = self.comentar("b")
+        a1 = self.comentar("a1", parent=a)
+        a1x = self.comentar("a1x", parent=a1)
+        a2 = self.comentar("a2", parent=a)
+        comentarios, _ = CommentService.get_page(self.oferta)
+        self.assertEqual([c.contenido for c in comentarios], ["a", "a1", "a1x", "a2", "b"])
+        self.assertEqual([c.depth for c in comentarios], [0, 1, 2, 1, 0])
+        self.assertEqual(list(CommentService.get_subtree(a1)), [a1, a1x])
+        self.assertNotIn(b, CommentService.get_subtree(a))
+        self.assertEqual(a2.path, a.path + Comentario.path_step(a2.pk))
+
+    def test_respuesta_hereda_publicacion_y_respeta_profundidad_maxima(self):
+        nodo = self.comentar("raiz")
+        for i in range(Comentario.MAX_DEPTH + 3):
+            nodo = Comentario.objects.create(contenido=str(i), publicador=self.autor, parent=nodo)
+        self.assertEqual(nodo.oferta_clase, self.oferta)
+        self.assertEqual(nodo.depth, Comentario.MAX_DEPTH)
+
+    def test_pagina_no_incluye_hilos_de_otra_publicacion(self):
+        otra = OfertaClase.objects.create(titulo="Otra oferta", descripcion="d", profesor=self.autor, ramo=self.oferta.ramo)
+        self.comentar("o1-a")
+        Comentario.objects.create(contenido="o2-secreto", publicador=self.autor, oferta_clase=otra)
+        self.comentar("o1-b")
+
+        comentarios, _ = CommentService.get_page(self.oferta)
+
+        self.assertEqual([c.contenido for c in comentarios], ["o1-a", "o1-b"])
+
+    def test_pagina_de_hilos_en_dos_consultas(self):
+        raiz = self.comentar("raiz")
+        nodo = raiz
+        for i in range(15):
+            nodo = self.comentar(f"r{i}", parent=nodo)
+        with self.assertNumQueries(2):
+            comentarios, has_more = CommentService.get_page(self.oferta)
+            [c.publicador.user.username for c in comentarios]
+        self.assertEqual(len(comentarios), 16)
+        self.assertFalse(has_more)
+
+
+class ScheduleIndexTests(TestCase):
+    """Pruebas del índice de intervalos por día."""
+
+    def interval(self, inicio, fin, oferta_id=1):
+        return Interval(time(*inicio), time(*fin), None, oferta_id, f"Oferta {oferta_id}")
+
+    def test_find_overlap_with_nested_and_touching_intervals(self):
+        index = ScheduleIndex({
+            DiaSemana.LUNES: [
+                self.interval((8, 0), (18, 0), oferta_id=1),  # covers everything after it
+                self.interval((9, 0), (10, 0), oferta_id=2),
+            ],
+            DiaSemana.MARTES: [self.interval((10, 0), (12, 0), oferta_id=3)],
+        })
+        self.assertEqual(index.find_overlap(DiaSemana.LUNES, time(17, 0), time(19, 0)).oferta_id, 1)
+        self.assertIsNone(index.find_overlap(DiaSemana.LUNES, time(18, 0), time(19, 0)))
+        self.assertIsNone(index.find_overlap(DiaSemana.MARTES, time(8, 0), time(10, 0)))
+        self.assertIsNone(index.find_overlap(DiaSemana.MIERCOLES, time(10, 0), time(11, 0)))
+        self.assertEqual(len(index), 3)
+
+
+class DisponibilidadApiTests(FormFactoriesMixin, TestCase):
+    """Pruebas del endpoint de búsqueda de horarios con cupos."""
+
+    def setUp(self):
+        self.oferta = self.make_oferta("Álgebra martes")
+        self.url = reverse("courses:disponibilidad_api")
+
+    def horario(self, inicio, fin, cupos=1, dia=DiaSemana.MARTES, oferta=None):
+        return HorarioOfertado.objects.create(
+            oferta=oferta or self.oferta, dia=dia, cupos_totales=cupos,
+            hora_inicio=time.fromisoformat(inicio), hora_fin=time.fromisoformat(fin),
+        )
+
+    def test_filtra_por_ventana_y_cupos(self):
+        libre = self.horario("15:00", "16:00")
+        self.horario("13:00", "15:00")  # empieza antes de la ventana
+        self.horario("17:00", "19:00")  # termina después
+        self.horario("14:00", "15:00", dia=DiaSemana.LUNES)
+        lleno = self.horario("14:00", "15:00")
+        Inscripcion.objects.create(estudiante=self.make_perfil_con_email(), horario_ofertado=lleno)
+
+        data = self.client.get(self.url, {"ramo": self.oferta.ramo.pk, "dia": 2, "desde": "14:00", "hasta": "18:00"}).json()
+
+        self.assertEqual([r["horario_id"] for r in data["resultados"]], [libre.pk])
+        self.assertEqual(data["resultados"][0]["cupos_libres"], 1)
+
+    def test_ordena_por_inicio_y_rating(self):
+        self.oferta.profesor.rating_promedio = 3
+        self.oferta.profesor.save()
+        otro = self.make_perfil_con_email()
+        otro.rating_promedio = 5
+        otro.save()
+        mejor = OfertaClase.objects.create(titulo="Mejor", descripcion="d", profesor=otro, ramo=self.oferta.ramo)
+        b = self.horario("15:00", "16:00")
+        a = self.horario("15:00", "16:00", oferta=mejor)
+        c = self.horario("14:00", "15:00")
+        data = self.client.get(self.url, {"dia": 2}).json()
+        self.assertEqual([r["horario_id"] for r in data["resultados"]], [c.pk, a.pk, b.pk])
+
+    def test_parametros_invalidos(self):
+        response = self.client.get(self.url, {"dia": 9, "desde": "18:00", "hasta": "14:00"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("dia", response.json()["errors"])
+
+    def make_perfil_con_email(self):
+        user = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x")
+        return user.perfil
+
+
+class TutorMatchingTests(FormFactoriesMixin, TestCase):
+    """Pruebas del puntaje de tutores sugeridos para una solicitud."""
+
+    def perfil(self, rating=0, total=0, carrera=None):
+        user = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x")
+        perfil = user.perfil
+        perfil.rating_promedio, perfil.total_ratings, perfil.carrera = rating, total, carrera
+        perfil.save()
+        return perfil
+
+    def test_ordena_por_rating_bayesiano_carrera_y_disponibilidad(self):
+        ramo = self.make_ramo("Cálculo")
+        carrera = Carrera.objects.create(name="Ingeniería")
+        solicitante = self.perfil(carrera=carrera)
+        un_cinco = self.perfil(rating=5, total=1)
+        experto = self.perfil(rating=4.8, total=40)
+        companero = self.perfil(rating=4.8, total=40, carrera=carrera)
+        disponible = self.perfil(rating=4.8, total=40)
+        sin_ramo = self.perfil(rating=5, total=100)
+        for tutor in (un_cinco, experto, companero, disponible, solicitante):
+            PerfilRamo.objects.create(perfil=tutor, ramo=ramo)
+        oferta = OfertaClase.objects.create(titulo="t", descripcion="d", profesor=disponible, ramo=ramo)
+        HorarioOfertado.objects.create(oferta=oferta, dia=1, hora_inicio=time(10), hora_fin=time(11))
+
+        solicitud = SolicitudClase.objects.create(titulo="Ayuda", descripcion="d", solicitante=solicitante, ramo=ramo)
+        sugeridos = TutorMatchingService.suggest(solicitud)
+
+        self.assertEqual(sugeridos, [disponible, companero, experto, un_cinco])
+        self.assertNotIn(sin_ramo, sugeridos)
+
+
+class RecomendacionesTests(TestCase):
+    """Pruebas del cálculo de recomendaciones y la sección "Para ti" del home."""
+
+    def perfil(self, rating=0, total=0, carrera=None):
+        user = User.objects.create_user(username=f"u_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x")
+        perfil = user.perfil
+        perfil.rating_promedio, perfil.total_ratings, perfil.carrera = rating, total, carrera
+        perfil.save()
+        return perfil
+
+    def oferta(self, profesor, ramo, public=True):
+        oferta = OfertaClase.objects.create(titulo=f"{ramo.name} con {profesor.pk}", descripcion="d", profesor=profesor, ramo=ramo, public=public)
+        oferta.horario = HorarioOfertado.objects.create(oferta=oferta, dia=1, hora_inicio=time(10), hora_fin=time(11), cupos_totales=5)
+        return oferta
+
+    def setUp(self):
+        carrera = Carrera.objects.create(name="Ingeniería")
+        calculo, algebra, fisica = Ramo.objects.create(name="Cálculo"), Ramo.objects.create(name="Álgebra"), Ramo.objects.create(name="Física")
+        self.estudiante = self.perfil(carrera=carrera)
+        bueno, regular = self.perfil(rating=4.9, total=30), self.perfil(rating=3.0, total=30)
+
+        self.calculo_bueno = self.oferta(bueno, calculo)
+        self.calculo_regular = self.oferta(regular, calculo)
+        self.algebra = self.oferta(bueno, algebra)
+        self.fisica = self.oferta(bueno, fisica)
+        self.privada = self.oferta(bueno, calculo, public=False)
+        self.propia = self.oferta(self.estudiante, calculo)
+
+        # Interest: a request for Cálculo; Física is already passed
+        SolicitudClase.objects.create(titulo="Ayuda", descripcion="d", solicitante=self.estudiante, ramo=calculo)
+        PerfilRamo.objects.create(perfil=self.estudiante, ramo=fisica)
+        # Classmates take Álgebra and Física
+        companero = self.perfil(carrera=carrera)
+        for oferta in (self.algebra, self.fisica):
+            Inscripcion.objects.create(estudiante=companero, horario_ofertado=oferta.horario)
+
+    def test_build_ordena_por_afinidad_y_calidad(self):
+        RecommendationService.build(batch_size=2)
+
+        ofertas = [r.oferta for r in RecommendationService.for_perfil(self.estudiante)]
+        self.assertEqual(ofertas, [self.calculo_bueno, self.calculo_regular, self.algebra])
+
+    def test_build_reemplaza_las_recomendaciones_previas(self):
+        RecommendationService.build()
+        RecommendationService.build()
+
+        self.assertEqual(Recomendacion.objects.filter(perfil=self.estudiante).count(), 3)
+
+    def test_home_muestra_para_ti_con_una_consulta(self):
+        RecommendationService.build()
+        self.client.force_login(self.estudiante.user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("home"))
+
+        self.assertContains(response, "Para ti")
+        self.assertEqual([r.oferta for r in response.context["para_ti"]], [self.calculo_bueno, self.calculo_regular, self.algebra])
+        self.assertEqual(sum("courses_recomendacion" in q["sql"] for q in ctx.captured_queries), 1)
+
+
+class ImportCatalogueTests(TestCase):
+    """Pruebas de ``manage.py import_catalogue`` (upserts por lotes, diff y dry run)."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.estudiante = User.objects.create_user(username="alumna", email="alumna@test.cl", password="x").perfil
+        # Created by hand (or by seed) before codes existed
+        self.calculo = Ramo.objects.create(name="Cálculo I")
+
+    def write(self, name, text):
+        path = self.dir / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def run_import(self, *args):
+        out = StringIO()
+        call_command("import_catalogue", *args, "--batch-size", "2", "-v", "2", stdout=out)
+        return out.getvalue()
+
+    def test_upsert_reporta_diferencias(self):
+        ramos = self.write("ramos.csv", "codigo,nombre\nMA1001,Cálculo I\nCC3001,Algoritmos\nCC4401,Ing. Software\n")
+        out = self.run_import("--ramos", ramos)
+
+        self.assertIn("2 nuevos, 1 actualizados, 0 sin cambios", out)
+        self.calculo.refresh_from_db()
+        self.assertEqual(self.calculo.codigo, "MA1001")
+        self.assertEqual(Ramo.objects.count(), 3)
+
+        ramos = self.write("ramos.jsonl", '{"codigo": "CC4401", "nombre": "Ingeniería de Software"}\n{"codigo": "CC3001", "nombre": "Algoritmos"}\n')
+        out = self.run_import("--ramos", ramos)
+
+        self.assertIn("0 nuevos, 1 actualizados, 1 sin cambios", out)
+        self.assertIn("~ CC4401: 'Ing. Software' -> 'Ingeniería de Software'", out)
+        self.assertEqual(Ramo.objects.get(codigo="CC4401").name, "Ingeniería de Software")
+
+    def test_dry_run_no_guarda(self):
+        carreras = self.write("carreras.json", '[{"codigo": "1", "nombre": "Computación"}]')
+        ramos = self.write("ramos.csv", "codigo,nombre\nCC3001,Algoritmos\n")
+        # Cursados can reference a ramo created earlier in the same run
+        cursados = self.write("cursados.csv", "usuario,ramo\nalumna,CC3001\n")
+        out = self.run_import("--carreras", carreras, "--ramos", ramos, "--cursados", cursados, "--dry-run")
+
+        self.assertIn("+ alumna: CC3001", out)
+        self.assertFalse(Carrera.objects.exists())
+        self.assertEqual(Ramo.objects.count(), 1)
+        self.assertFalse(PerfilRamo.objects.exists())
+
+    def test_cursados_solo_agrega_y_errores_deshacen_todo(self):
+        Ramo.objects.create(name="Algoritmos", codigo="CC3001")
+        PerfilRamo.objects.create(perfil=self.estudiante, ramo=self.calculo)
+        self.calculo.codigo = "MA1001"
+        self.calculo.save()
+
+        cursados = self.write("cursados.csv", "usuario,ramo\nalumna,MA1001\nalumna,CC3001\nnadie,CC3001\n")
+        with self.assertRaisesMessage(CommandError, "1 fila(s) con errores"):
+            self.run_import("--cursados", cursados)
+        self.assertEqual(PerfilRamo.objects.count(), 1)
+
+        cursados = self.write("cursados.csv", "usuario,ramo\nalumna,MA1001\nalumna,CC3001\n")
+        out = self.run_import("--cursados", cursados)
+
+        self.assertIn("1 nuevos, 0 actualizados, 1 sin cambios", out)
+        self.assertEqual(set(self.estudiante.ramos_cursados.values_list("codigo", flat=True)), {"MA1001", "CC3001"})
+
+
+class CalendarFeedTests(TestCase):
+    """Pruebas del feed .ics de clases aceptadas (contenido, token, caché e invalidación)."""
+
+    def setUp(self):
+        cache.clear()
+        self.profesor = User.objects.create_user(username="profe", email="profe@test.cl", password="x").perfil
+        self.estudiante = User.objects.create_user(username="alumna", email="alumna@test.cl", password="x").perfil
+        self.oferta = OfertaClase.objects.create(
+            titulo="Cálculo; repaso, certamen", descripcion="d", profesor=self.profesor, ramo=Ramo.objects.create(name="Cálculo"),
+        )
+        self.horario = HorarioOfertado.objects.create(
+            oferta=self.oferta, dia=DiaSemana.MARTES, hora_inicio=time(18, 30), hora_fin=time(20), cupos_totales=3,
+        )
+        self.inscripcion = Inscripcion.objects.create(estudiante=self.estudiante, horario_ofertado=self.horario)
+
+    def feed(self, perfil, **headers):
+        return self.client.get(reverse("courses:calendar_feed", args=[CalendarService.token_for(perfil)]), headers=headers)
+
+    @override_settings(SITE_URL="http://calendario.test")
+    def test_eventos_recurrentes_de_aceptadas(self):
+        self.assertNotIn(b"BEGIN:VEVENT", self.feed(self.estudiante).content)
+
+        self.inscripcion.aceptar()
+        body = self.feed(self.estudiante).content.decode()
+
+        self.assertIn("RRULE:FREQ=WEEKLY;BYDAY=TU", body)
+        self.assertRegex(body, r"DTSTART;TZID=America/Santiago:\d{8}T183000")
+        self.assertIn("SUMMARY:Cálculo\\; repaso\\, certamen", body)
+        self.assertIn("BEGIN:VTIMEZONE\r\nTZID:America/Santiago", body)
+        self.assertIn("BEGIN:DAYLIGHT", body)
+        self.assertIn("TZOFFSETTO:-0300", body)
+        self.assertIn(f"URL:http://calendario.test{reverse('courses:oferta_detail', args=[self.oferta.pk])}", body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split("\r\n")))
+        tutor = self.feed(self.profesor).content.decode()
+        self.assertIn("SUMMARY:Clase: Cálculo", tutor)
+        self.assertIn("1 estudiante aceptados", tutor)
+
+    def test_token_invalido(self):
+        token = CalendarService.token_for(self.estudiante)
+        self.assertEqual(self.client.get(reverse("courses:calendar_feed", args=[token + "x"])).status_code, 404)
+
+    def test_regenerar_revoca_el_enlace(self):
+        anterior = reverse("courses:calendar_feed", args=[CalendarService.token_for(self.estudiante)])
+        self.client.force_login(self.estudiante.user)
+
+        self.client.post(reverse("courses:regenerar_calendario"))
+
+        self.estudiante.refresh_from_db()
+        self.assertEqual(self.client.get(anterior).status_code, 404)
+        self.assertEqual(self.feed(self.estudiante).status_code, 200)
+
+    def test_cache_e_invalidacion(self):
+        self.inscripcion.aceptar()
+        etag = self.feed(self.estudiante)["ETag"]
+
+        # Only the token check (which also reads the feed version) hits the database
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.feed(self.estudiante, if_none_match=etag).status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        # The professor completes the class: both feeds drop the event
+        self.feed(self.profesor)
+        Inscripcion.objects.get(pk=self.inscripcion.pk).completar()
+        self.assertEqual(self.feed(self.estudiante, if_none_match=etag).status_code, 200)
+        self.assertNotIn(b"BEGIN:VEVENT", self.feed(self.profesor).content)
+
+    def test_cambio_en_otro_proceso_no_sirve_la_cache(self):
+        self.inscripcion.aceptar()
+        self.assertIn(b"BEGIN:VEVENT", self.feed(self.estudiante).content)
+
+        # Another worker (or cron) cancels it: nothing ever clears this process's cache
+        with patch.object(cache, "delete"), patch.object(cache, "delete_many"), patch.object(cache, "clear"):
+            Inscripcion.objects.get(pk=self.inscripcion.pk).cancelar()
+            self.assertNotIn(b"BEGIN:VEVENT", self.feed(self.estudiante).content)
+
+    def test_cambio_de_horario_invalida(self):
+        self.inscripcion.aceptar()
+        self.feed(self.estudiante)
+
+        self.horario.hora_inicio = time(17)
+        self.horario.save()
+
+        self.assertRegex(self.feed(self.estudiante).content.decode(), r"DTSTART;TZID=America/Santiago:\d{8}T170000")
+
+
+class TimetableTests(TestCase):
+    """Pruebas del horario semanal del estudiante (choques, caché e inscripción)."""
+
+    def setUp(self):
+        cache.clear()
+        self.profesor = User.objects.create_user(username="profe", email="profe@test.cl", password="x").perfil
+        self.estudiante = User.objects.create_user(username="alumna", email="alumna@test.cl", password="x").perfil
+        ramo = Ramo.objects.create(name="Álgebra")
+        self.oferta = OfertaClase.objects.create(titulo="Álgebra I", descripcion="d", profesor=self.profesor, ramo=ramo)
+        self.otra = OfertaClase.objects.create(titulo="Álgebra II", descripcion="d", profesor=self.profesor, ramo=ramo)
+        self.horario = HorarioOfertado.objects.create(
+            oferta=self.oferta, dia=DiaSemana.LUNES, hora_inicio=time(10), hora_fin=time(12), cupos_totales=3,
+        )
+        Inscripcion.objects.create(estudiante=self.estudiante, horario_ofertado=self.horario)
+        self.client.force_login(self.estudiante.user)
+
+    def horario_otra(self, inicio, fin, dia=DiaSemana.LUNES):
+        return HorarioOfertado.objects.create(
+            oferta=self.otra, dia=dia, hora_inicio=time(*inicio), hora_fin=time(*fin), cupos_totales=3,
+        )
+
+    def test_barrido_marca_todos_los_choques(self):
+        largo = Inscripcion.objects.create(estudiante=self.estudiante, horario_ofertado=self.horario_otra((9,), (13,)))
+        contiguo = Inscripcion.objects.create(estudiante=self.estudiante, horario_ofertado=self.horario_otra((13,), (14,)))
+        martes = Inscripcion.objects.create(
+            estudiante=self.estudiante, horario_ofertado=self.horario_otra((10,), (12,), dia=DiaSemana.MARTES),
+        )
+
+        self.estudiante.refresh_from_db()
+        conflictos = TimetableService.conflicts(TimetableService.entries(self.estudiante))
+
+        self.assertIn(largo.pk, conflictos)
+        self.assertEqual(len(conflictos), 2)
+        self.assertNotIn(contiguo.pk, conflictos)
+        self.assertNotIn(martes.pk, conflictos)
+
+    def test_inscripcion_que_choca_se_rechaza(self):
+        choque = self.horario_otra((11,), (13,))
+        libre = self.horario_otra((12,), (13,))
+        url = reverse("courses:inscribirse", args=[self.otra.pk])
+
+        self.client.post(url, {"horario": choque.pk})
+        self.client.post(url, {"horario": libre.pk})
+
+        inscritos = set(Inscripcion.objects.filter(estudiante=self.estudiante).values_list("horario_ofertado_id", flat=True))
+        self.assertEqual(inscritos, {self.horario.pk, libre.pk})
+
+    def test_validacion_no_usa_la_cache(self):
+        # Another worker cancels the enrollment: no signal runs in this process
+        TimetableService.entries(self.estudiante)
+        Inscripcion.objects.filter(horario_ofertado=self.horario).update(estado=EstadoInscripcion.CANCELADO)
+        choque = self.horario_otra((11,), (13,))
+
+        self.client.post(reverse("courses:inscribirse", args=[self.otra.pk]), {"horario": choque.pk})
+
+        self.assertTrue(Inscripcion.objects.filter(estudiante=self.estudiante, horario_ofertado=choque).exists())
+
+    def test_cancelada_libera_el_bloque(self):
+        TimetableService.entries(self.estudiante)
+        Inscripcion.objects.get(horario_ofertado=self.horario).cancelar()
+
+        self.assertIsNone(TimetableService.find_conflict(self.estudiante.pk, self.horario_otra((11,), (13,))))
+
+    def test_horario_cacheado_e_invalidado(self):
+        url = reverse("courses:mi_horario")
+        self.assertContains(self.client.get(url), "Álgebra I")
+
+        self.estudiante.refresh_from_db()
+        with CaptureQueriesContext(connection) as ctx:
+            TimetableService.entries(self.estudiante)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.oferta.titulo = "Álgebra Lineal"
+        self.oferta.save()
+        self.assertContains(self.client.get(url), "Álgebra Lineal")
+
+    def test_cambio_en_otro_proceso_no_sirve_la_cache(self):
+        url = reverse("courses:mi_horario")
+        self.assertContains(self.client.get(url), "Álgebra I")
+
+        # Another worker (or cron) cancels it: nothing ever clears this process's cache
+        with patch.object(cache, "delete"), patch.object(cache, "delete_many"), patch.object(cache, "clear"):
+            Inscripcion.objects.get(horario_ofertado=self.horario).cancelar()
+            self.assertNotContains(self.client.get(url), "Álgebra I")
+
+
+class InscriptionSweepTests(TestCase):
+    """Pruebas del barrido de inscripciones (pendientes vencidas y clases dictadas)."""
+
+    # Miércoles 21 de octubre de 2026, 12:00 hora local
+    NOW = timezone.make_aware(datetime(2026, 10, 21, 12))
+
+    def setUp(self):
+        cache.clear()
+        self.profesor = User.objects.create_user(username="profe", email="profe@test.cl", password="x").perfil
+        self.estudiante = User.objects.create_user(username="alumna", email="alumna@test.cl", password="x").perfil
+        oferta = OfertaClase.objects.create(
+            titulo="Física", descripcion="d", profesor=self.profesor, ramo=Ramo.objects.create(name="Física"),
+        )
+        self.martes = HorarioOfertado.objects.create(
+            oferta=oferta, dia=DiaSemana.MARTES, hora_inicio=time(10), hora_fin=time(11), cupos_totales=5,
+        )
+        self.miercoles = HorarioOfertado.objects.create(
+            oferta=oferta, dia=DiaSemana.MIERCOLES, hora_inicio=time(11), hora_fin=time(12), cupos_totales=5,
+        )
+
+    def inscripcion(self, horario, estado, reservada, estudiante=None):
+        estudiante = estudiante or User.objects.create_user(
+            username=f"e_{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@test.cl", password="x",
+        ).perfil
+        inscripcion = Inscripcion.objects.create(estudiante=estudiante, horario_ofertado=horario, estado=estado)
+        Inscripcion.objects.filter(pk=inscripcion.pk).update(fecha_reserva=reservada)
+        return inscripcion
+
+    def estado(self, inscripcion):
+        return Inscripcion.objects.values_list("estado", flat=True).get(pk=inscripcion.pk)
+
+    def test_vence_pendientes_antiguas(self):
+        vieja = self.inscripcion(self.martes, EstadoInscripcion.PENDIENTE, self.NOW - timedelta(days=8), self.estudiante)
+        reciente = self.inscripcion(self.martes, EstadoInscripcion.PENDIENTE, self.NOW - timedelta(days=1))
+        self.assertEqual(len(TimetableService.entries(Perfil.objects.get(pk=self.estudiante.pk))), 1)
+
+        self.assertEqual(InscriptionSweepService.expire_stale(now=self.NOW, dry_run=True), 1)
+        self.assertEqual(InscriptionSweepService.expire_stale(now=self.NOW, batch_size=1), 1)
+
+        self.assertEqual(self.estado(vieja), EstadoInscripcion.RECHAZADO)
+        self.assertEqual(self.estado(reciente), EstadoInscripcion.PENDIENTE)
+        aviso = Notification.objects.get(type=NotificationTypes.INSCRIPTION_EXPIRED)
+        self.assertEqual(aviso.receiver, self.estudiante)
+        creada = Notification.objects.get(type=NotificationTypes.INSCRIPTION_CREATED, object_id=vieja.pk)
+        self.assertEqual(creada.action_taken, "Vencida ⌛")
+        self.assertEqual(TimetableService.entries(Perfil.objects.get(pk=self.estudiante.pk)), [])
+
+    def test_completa_clases_dictadas(self):
+        lunes = self.NOW - timedelta(days=2)
+        dictada = self.inscripcion(self.martes, EstadoInscripcion.ACEPTADO, lunes)
+        hoy_terminada = self.inscripcion(self.miercoles, EstadoInscripcion.ACEPTADO, lunes)
+        reservada_hoy = self.inscripcion(self.miercoles, EstadoInscripcion.ACEPTADO, self.NOW - timedelta(hours=3))
+        martes_tarde = self.inscripcion(self.martes, EstadoInscripcion.ACEPTADO, self.NOW - timedelta(hours=20))
+
+        # Today's class ended at 12:00, but a one-hour grace keeps it for now
+        self.assertEqual(InscriptionSweepService.complete_past(now=self.NOW), 1)
+        self.assertEqual(InscriptionSweepService.complete_past(now=self.NOW, grace=timedelta(0)), 1)
+
+        self.assertEqual(self.estado(dictada), EstadoInscripcion.COMPLETADO)
+        self.assertEqual(self.estado(hoy_terminada), EstadoInscripcion.COMPLETADO)
+        self.assertEqual(self.estado(reservada_hoy), EstadoInscripcion.ACEPTADO)
+        self.assertEqual(self.estado(martes_tarde), EstadoInscripcion.ACEPTADO)
+        self.assertEqual(Notification.objects.filter(type=NotificationTypes.INSCRIPTION_COMPLETED).count(), 2)
+
+    def test_caches_web_no_quedan_viejas(self):
+        dictada = self.inscripcion(self.martes, EstadoInscripcion.ACEPTADO, self.NOW - timedelta(days=2), self.estudiante)
+        feed = reverse("courses:calendar_feed", args=[CalendarService.token_for(self.estudiante)])
+        self.assertIn(b"BEGIN:VEVENT", self.client.get(feed).content)
+        self.assertEqual(len(TimetableService.entries(Perfil.objects.get(pk=self.estudiante.pk))), 1)
+
+        # The sweep runs from cron: it never touches the web process's cache
+        with patch.object(cache, "delete"), patch.object(cache, "delete_many"), patch.object(cache, "clear"):
+            self.assertEqual(InscriptionSweepService.complete_past(now=self.NOW), 1)
+
+        self.assertEqual(self.estado(dictada), EstadoInscripcion.COMPLETADO)
+        self.assertNotIn(b"BEGIN:VEVENT", self.client.get(feed).content)
+        self.assertEqual(TimetableService.entries(Perfil.objects.get(pk=self.estudiante.pk)), [])
+
+    def test_solo_cuenta_las_filas_cambiadas(self):
+        vieja = self.inscripcion(self.martes, EstadoInscripcion.PENDIENTE, self.NOW - timedelta(days=8))
+        cancelada = self.inscripcion(self.martes, EstadoInscripcion.PENDIENTE, self.NOW - timedelta(days=9))
+
+        def cancel_after_select(sender, instance, **kwargs):
+            # A request cancels it between the sweep's SELECT and its UPDATE
+            if instance.pk == cancelada.pk:
+                Inscripcion.objects.filter(pk=cancelada.pk).update(estado=EstadoInscripcion.CANCELADO)
+
+        post_init.connect(cancel_after_select, sender=Inscripcion)
+        try:
+            self.assertEqual(InscriptionSweepService.expire_stale(now=self.NOW), 1)
+        finally:
+            post_init.disconnect(cancel_after_select, sender=Inscripcion)
+
+        self.assertEqual(self.estado(vieja), EstadoInscripcion.RECHAZADO)
+        self.assertEqual(self.estado(cancelada), EstadoInscripcion.CANCELADO)
+        aviso = Notification.objects.get(type=NotificationTypes.INSCRIPTION_EXPIRED)
+        self.assertEqual(aviso.object_id, vieja.pk)
+
+    def test_comando(self):
+        self.inscripcion(self.martes, EstadoInscripcion.PENDIENTE, timezone.now() - timedelta(days=30))
+        out = StringIO()
+
+        call_command("sweep_inscripciones", "--complete", stdout=out)
+
+        self.assertIn("1 pendientes vencidas", out.getvalue())
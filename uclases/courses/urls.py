@@ -8,14 +8,22 @@ urlpatterns = [
     path('publications/', views.publications_view, name='publications'),
     path('publications/offer/<int:pk>/', views.oferta_detail, name='oferta_detail'),
     path('publications/request/<int:pk>/', views.solicitud_detail, name='solicitud_detail'),
+    path('publications/offer/<int:pk>/comentarios/', views.oferta_comentarios_api, name='oferta_comentarios'),
+    path('publications/request/<int:pk>/comentarios/', views.solicitud_comentarios_api, name='solicitud_comentarios'),
     path('oferta/nueva/', views.crear_oferta, name='crear_oferta'),
     path('solicitud/nueva/', views.crear_solicitud, name='crear_solicitud'),
     path('oferta/<int:pk>/editar/', views.editar_oferta, name='editar_oferta'),
     path('solicitud/<int:pk>/editar/', views.editar_solicitud, name='editar_solicitud'),
     path('publications/offer/<int:pk>/inscribirse/',  views.inscribirse_view, name='inscribirse'),
+    path('api/disponibilidad/', views.disponibilidad_api, name='disponibilidad_api'),
+    path('export/inscripciones.<str:formato>', views.export_inscripciones, name='export_inscripciones'),
+    path('export/ratings.<str:formato>', views.export_ratings, name='export_ratings'),
     
     # Gestión de inscripciones
     path('mis-inscripciones/', views.mis_inscripciones_view, name='mis_inscripciones'),
+    path('mi-horario/', views.mi_horario_view, name='mi_horario'),
+    path('calendario/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
+    path('calendario/regenerar/', views.regenerar_calendario_view, name='regenerar_calendario'),
     path('inscripcion/<int:pk>/aceptar/', views.aceptar_inscripcion, name='aceptar_inscripcion'),
     path('inscripcion/<int:pk>/rechazar/', views.rechazar_inscripcion, name='rechazar_inscripcion'),
     path('inscripcion/<int:pk>/cancelar/', views.cancelar_inscripcion, name='cancelar_inscripcion'),
@@ -4,17 +4,33 @@ from operator import attrgetter
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+
+from core.db_router import use_replica
+from core.exports import export_response
 
 from .models import OfertaClase, SolicitudClase, HorarioOfertado, Inscripcion, Ramo ,Rating
 from accounts.models import Perfil
 from .enums import DiaSemana , EstadoInscripcion
-from .forms import HorarioFormSet, OfertaForm, SolicitudClaseForm,  ComentarioForm, RatingForm
+from .forms import HorarioFormSet, OfertaForm, SolicitudClaseForm,  ComentarioForm, RatingForm, DisponibilidadSearchForm
 from .services.inscription_service import InscriptionService
+from .services.comment_service import CommentService
+from .services.availability_service import AvailabilityService
+from .services.export_service import ExportService
+from .services.calendar_service import CalendarService
+from .services.timetable_service import TimetableService
 from notifications.services.notification_service import NotificationService
 from notifications.enums import NotificationTypes
 
 
 
+@use_replica
 def publications_view(request):
     """
     Lista todas las publicaciones (ofertas y solicitudes de clases) ordenadas por fecha.
@@ -47,6 +63,7 @@ def publications_view(request):
     return render(request, 'courses/publications_list.html', context)
 
 
+@use_replica
 def oferta_detail(request, pk):
     """
     Muestra el detalle completo de una oferta de clase con sus horarios ordenados.
@@ -64,8 +81,11 @@ def oferta_detail(request, pk):
     Dependencies:
         - courses.models.OfertaClase
         - courses.enums.DiaSemana
+        - courses.services.comment_service.CommentService
     """
-    oferta = get_object_or_404(OfertaClase, pk=pk)
+    oferta = get_object_or_404(
+        OfertaClase.objects.select_related('profesor__user', 'profesor__carrera', 'ramo'), pk=pk
+    )
     
     # Ordenar horarios por día de la semana (de lunes a domingo)
     horarios_ordenados = oferta.horarios.all().order_by('dia', 'hora_inicio')
@@ -75,6 +95,7 @@ def oferta_detail(request, pk):
             comentario = form.save(commit=False)
             comentario.oferta_clase = oferta
             comentario.publicador = request.user.perfil
+            comentario.parent = CommentService.resolve_parent(oferta, request.POST.get('parent'))
             comentario.save()
             messages.success(request, "Comentario agregado correctamente.")
             return redirect('courses:oferta_detail', pk=oferta.pk)
@@ -86,11 +107,12 @@ def oferta_detail(request, pk):
         'horarios_ordenados': horarios_ordenados,
         'dias_semana': DiaSemana,
         'comentario_form': form,
-        'comentarios': oferta.comentarios.all()
     }
+    context.update(_comentarios_context(oferta, 'courses:oferta_comentarios'))
     return render(request, 'courses/oferta_detail.html', context)
 
 
+@use_replica
 def solicitud_detail(request, pk):
     """
     Muestra el detalle completo de una solicitud de clase.
@@ -107,8 +129,11 @@ def solicitud_detail(request, pk):
     
     Dependencies:
         - courses.models.SolicitudClase
+        - courses.services.comment_service.CommentService
     """
-    solicitud = get_object_or_404(SolicitudClase, pk=pk)
+    solicitud = get_object_or_404(
+        SolicitudClase.objects.select_related('solicitante__user', 'solicitante__carrera', 'ramo'), pk=pk
+    )
 
     puede_proponer_clase = False
     if request.user.is_authenticated:
@@ -120,6 +145,7 @@ def solicitud_detail(request, pk):
             comentario = form.save(commit=False)
             comentario.solicitud_clase = solicitud
             comentario.publicador = request.user.perfil
+            comentario.parent = CommentService.resolve_parent(solicitud, request.POST.get('parent'))
             comentario.save()
             messages.success(request, "Comentario agregado correctamente.")
             return redirect('courses:solicitud_detail', pk=solicitud.pk)
@@ -129,11 +155,67 @@ def solicitud_detail(request, pk):
     context = {
         'solicitud': solicitud,
         'comentario_form': form,
-        'comentarios': solicitud.comentarios.all(),
         'puede_proponer_clase': puede_proponer_clase,
     }
+    context.update(_comentarios_context(solicitud, 'courses:solicitud_comentarios'))
     return render(request, 'courses/solicitud_detail.html', context)
 
+
+def _comentarios_context(publication, url_name):
+    """Primera página de comentarios y datos para el botón "cargar más"."""
+    comentarios, has_more = CommentService.get_page(publication)
+    return {
+        'comentarios': comentarios,
+        'comentarios_total': publication.total_comentarios,
+        'comentarios_has_more': has_more,
+        'comentarios_url': reverse(url_name, args=[publication.pk]),
+    }
+
+
+def _comentarios_json(request, publication):
+    comentarios, has_more = CommentService.get_page(publication, request.GET.get('page', 1))
+    return JsonResponse({
+        'comentarios': [CommentService.serialize(c) for c in comentarios],
+        'has_more': has_more,
+        'total': publication.total_comentarios,
+    })
+
+
+@use_replica
+def oferta_comentarios_api(request, pk):
+    """
+    Devuelve una página de comentarios de una oferta en JSON ("cargar más").
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP. Parámetro GET ``page`` (desde 1).
+        pk (int): Clave primaria de la oferta.
+    
+    Returns:
+        JsonResponse: ``comentarios`` (lista), ``has_more`` (bool) y ``total`` (int).
+    
+    Dependencies:
+        - courses.services.comment_service.CommentService
+    """
+    return _comentarios_json(request, get_object_or_404(OfertaClase, pk=pk))
+
+
+@use_replica
+def solicitud_comentarios_api(request, pk):
+    """
+    Devuelve una página de comentarios de una solicitud en JSON ("cargar más").
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP. Parámetro GET ``page`` (desde 1).
+        pk (int): Clave primaria de la solicitud.
+    
+    Returns:
+        JsonResponse: ``comentarios`` (lista), ``has_more`` (bool) y ``total`` (int).
+    
+    Dependencies:
+        - courses.services.comment_service.CommentService
+    """
+    return _comentarios_json(request, get_object_or_404(SolicitudClase, pk=pk))
+
 @login_required
 def crear_oferta(request):
     """
@@ -155,7 +237,7 @@ def crear_oferta(request):
     """
     if request.method == "POST":
         form = OfertaForm(request.POST, user=request.user)
-        formset = HorarioFormSet(request.POST, prefix="horarios")
+        formset = HorarioFormSet(request.POST, prefix="horarios", profesor=request.user.perfil)
         
         if form.is_valid() and formset.is_valid():
             oferta = form.save(commit=False)
@@ -241,7 +323,7 @@ def editar_oferta(request, pk):
 
     if request.method == "POST":
         form = OfertaForm(request.POST, instance=oferta, user=request.user)
-        formset = HorarioFormSet(request.POST, instance=oferta, prefix="horarios")
+        formset = HorarioFormSet(request.POST, instance=oferta, prefix="horarios", profesor=oferta.profesor)
         if form.is_valid() and formset.is_valid():
             form.save()
             formset.save()
@@ -295,6 +377,7 @@ def editar_solicitud(request, pk):
     return render(request, "courses/editar_solicitud.html", {"form": form, "solicitud": solicitud})
 
 
+@login_required
 def inscribirse_view(request, pk):
     """
     Permite a un estudiante seleccionar un horario específico e inscribirse en una oferta de clase.
@@ -306,6 +389,7 @@ def inscribirse_view(request, pk):
         - Verifica que haya cupos disponibles en el horario seleccionado
         - Cuenta inscripciones activas (estados: Pendiente y Aceptado)
         - Previene inscripciones duplicadas en el mismo horario
+        - Rechaza horarios que chocan con otras inscripciones pendientes o aceptadas del estudiante
         - Reduce automáticamente el número de cupos al inscribirse exitosamente
     
     Args:
@@ -323,8 +407,11 @@ def inscribirse_view(request, pk):
         - courses.models.OfertaClase
         - courses.models.HorarioOfertado
         - courses.models.Inscripcion
+        - courses.services.timetable_service.TimetableService
     """
     oferta = get_object_or_404(OfertaClase, pk=pk)
+    # Active blocks of the student, read fresh from the DB (binary search per schedule)
+    index = TimetableService.schedule_index(request.user.perfil.pk)
     
     # Obtener todos los horarios ordenados
     horarios_ordenados = oferta.horarios.all().order_by('dia', 'hora_inicio')
@@ -345,12 +432,16 @@ def inscribirse_view(request, pk):
             horario.usuario_inscrito = True
             horario.inscripcion_estado = inscripciones_dict[horario.id].estado
             horario.inscripcion_estado_display = inscripciones_dict[horario.id].get_estado_display()
+            horario.conflicto = None
         else:
             horario.usuario_inscrito = False
             horario.inscripcion_estado = None
+            horario.conflicto = index.find_overlap(horario.dia, horario.hora_inicio, horario.hora_fin)
 
     # Determinar si existe al menos un horario con cupos disponibles
-    has_available = any((not h.usuario_inscrito) and (h.cupos_totales > 0) for h in horarios_ordenados)
+    has_available = any(
+        (not h.usuario_inscrito) and (h.cupos_totales > 0) and not h.conflicto for h in horarios_ordenados
+    )
 
     if request.method == "POST":
         horario_id = request.POST.get("horario")
@@ -387,11 +478,27 @@ def inscribirse_view(request, pk):
             messages.error(request, "Lo sentimos, este horario ya no tiene cupos disponibles.")
             return redirect("courses:inscribirse", pk=oferta.pk)
 
-        # Crear inscripción
-        inscripcion, created = Inscripcion.objects.get_or_create(
-            estudiante=request.user.perfil,
-            horario_ofertado=horario,
-        )
+        with transaction.atomic():
+            # Lock the student so two concurrent enrollments are checked one after the other
+            Perfil.objects.select_for_update().get(pk=request.user.perfil.pk)
+
+            # Verificar que no choque con otra inscripción pendiente o aceptada
+            conflicto = TimetableService.find_conflict(request.user.perfil.pk, horario)
+            if conflicto is None:
+                # Crear inscripción
+                inscripcion, created = Inscripcion.objects.get_or_create(
+                    estudiante=request.user.perfil,
+                    horario_ofertado=horario,
+                )
+
+        if conflicto:
+            messages.error(
+                request,
+                f"Este horario choca con «{conflicto.oferta_titulo}» "
+                f"({conflicto.inicio:%H:%M}-{conflicto.fin:%H:%M}). "
+                "Cancela esa inscripción antes de inscribirte.",
+            )
+            return redirect("courses:inscribirse", pk=oferta.pk)
 
         if not created:
             messages.warning(request, "Ya estás inscrito en este horario.")
@@ -554,7 +661,7 @@ def proponer_oferta_clase(request, solicitud_id):
     
     if request.method == 'POST':
         form = OfertaForm(request.POST, user=request.user)
-        formset = HorarioFormSet(request.POST) 
+        formset = HorarioFormSet(request.POST, profesor=profesor_perfil)
         if form.is_valid() and formset.is_valid():
             oferta = form.save(commit=False)
             oferta.profesor = profesor_perfil
@@ -576,6 +683,13 @@ def proponer_oferta_clase(request, solicitud_id):
                 data={'oferta': oferta},
                 related_object=oferta
             )
+            # Si el profesor llegó por una sugerencia, marcarla como respondida
+            NotificationService.mark_action(
+                receiver=profesor_perfil,
+                type=NotificationTypes.SOLICITUD_MATCH,
+                related_object=solicitud,
+                action_text='Clase propuesta'
+            )
 
 
             messages.success(request, f'Tu oferta de clase de {ramo.name} ha sido publicada y el solicitante ha sido notificado.')
@@ -632,49 +746,89 @@ def mis_inscripciones_view(request):
     """
     perfil = request.user.perfil
     
-    # Obtener TODAS las inscripciones relevantes para el usuario
-    # 1. Inscripciones a ofertas donde este perfil es el profesor
-    inscripciones_como_profesor = Inscripcion.objects.filter(
-        horario_ofertado__oferta__profesor=perfil
+    # Inscripciones a ofertas donde este perfil es el profesor o propias como estudiante.
+    # Un solo queryset con todos los select_related que usa el template para
+    # ambos roles (al combinar dos querysets con | se pierden los del segundo).
+    inscripciones = Inscripcion.objects.filter(
+        Q(horario_ofertado__oferta__profesor=perfil) | Q(estudiante=perfil)
     ).select_related(
-        'estudiante',
         'estudiante__user',
         'estudiante__carrera',
-        'horario_ofertado__oferta__ramo'
-    )
-    
-    # 2. Inscripciones propias donde este perfil es el estudiante
-    inscripciones_como_estudiante = Inscripcion.objects.filter(
-        estudiante=perfil
-    ).select_related(
-        'horario_ofertado__oferta__profesor',
         'horario_ofertado__oferta__profesor__user',
         'horario_ofertado__oferta__ramo'
+    ).order_by('-fecha_reserva')
+    
+    # Calcular contadores por estado en una sola consulta
+    counts = inscripciones.aggregate(
+        all_count=Count('pk'),
+        pendiente_count=Count('pk', filter=Q(estado=EstadoInscripcion.PENDIENTE)),
+        aceptado_count=Count('pk', filter=Q(estado=EstadoInscripcion.ACEPTADO)),
+        rechazado_count=Count('pk', filter=Q(estado=EstadoInscripcion.RECHAZADO)),
+        cancelado_count=Count('pk', filter=Q(estado=EstadoInscripcion.CANCELADO)),
     )
     
-    # Combinar ambas querysets y eliminar duplicados
-    inscripciones = (inscripciones_como_profesor | inscripciones_como_estudiante).distinct().order_by('-fecha_reserva')
-    
-    # Calcular contadores por estado
-    all_count = inscripciones.count()
-    pendiente_count = inscripciones.filter(estado=EstadoInscripcion.PENDIENTE).count()
-    aceptado_count = inscripciones.filter(estado=EstadoInscripcion.ACEPTADO).count()
-    rechazado_count = inscripciones.filter(estado=EstadoInscripcion.RECHAZADO).count()
-    cancelado_count = inscripciones.filter(estado=EstadoInscripcion.CANCELADO).count()
-    
     context = {
         'inscripciones': inscripciones,
         'EstadoInscripcion': EstadoInscripcion,
-        'all_count': all_count,
-        'pendiente_count': pendiente_count,
-        'aceptado_count': aceptado_count,
-        'rechazado_count': rechazado_count,
-        'cancelado_count': cancelado_count,
+        'calendar_url': CalendarService.feed_url(request, perfil),
+        **counts,
     }
     
     return render(request, 'courses/mis_inscripciones.html', context)
 
 
+@login_required
+def regenerar_calendario_view(request):
+    """
+    Revoca el enlace del feed de calendario del usuario y genera uno nuevo.
+    
+    Para cuando el enlace privado se filtró: el anterior deja de responder.
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP (requiere POST).
+    
+    Returns:
+        HttpResponseRedirect: Redirige a mis inscripciones.
+    
+    Dependencies:
+        - courses.services.calendar_service.CalendarService
+    """
+    if request.method == "POST":
+        CalendarService.revoke(request.user.perfil.pk)
+        messages.success(request, "Generamos un nuevo enlace de calendario; el anterior ya no funciona.")
+    return redirect('courses:mis_inscripciones')
+
+
+@login_required
+def mi_horario_view(request):
+    """
+    Horario semanal del estudiante con sus inscripciones pendientes y aceptadas.
+
+    Los bloques que se superponen con otro se marcan como conflicto (por
+    ejemplo, inscripciones anteriores a la validación de choques).
+
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP.
+
+    Returns:
+        HttpResponse: Renderiza el horario por día de la semana.
+
+    Template:
+        'courses/mi_horario.html'
+
+    Dependencies:
+        - courses.services.timetable_service.TimetableService
+    """
+    dias, total_conflictos = TimetableService.week(request.user.perfil)
+    context = {
+        'dias': dias,
+        'total_conflictos': total_conflictos,
+        'total_bloques': sum(len(dia['bloques']) for dia in dias),
+        'EstadoInscripcion': EstadoInscripcion,
+    }
+    return render(request, 'courses/mi_horario.html', context)
+
+
 @login_required
 def dashboard_mis_ofertas(request):
     """
@@ -741,17 +895,15 @@ def mis_ofertas_horarios_view(request, oferta_id):
         profesor=perfil
     )
     
-    # Obtener todos los horarios de la oferta
-    horarios = oferta.horarios.all().order_by('dia', 'hora_inicio')
+    # Horarios ordenados en memoria: un order_by descartaría lo precargado
+    horarios = sorted(oferta.horarios.all(), key=attrgetter('dia', 'hora_inicio'))
     
-    # Para cada horario, filtrar inscripciones por estado
+    # Para cada horario, filtrar en memoria las inscripciones ya precargadas por estado
     for horario in horarios:
-        horario.inscritos_aceptados = horario.inscripciones.filter(
-            estado=EstadoInscripcion.ACEPTADO
-        ).select_related('estudiante__user', 'estudiante__carrera')
-        horario.inscritos_completados = horario.inscripciones.filter(
-            estado=EstadoInscripcion.COMPLETADO
-        ).select_related('estudiante__user', 'estudiante__carrera')
+        inscripciones = horario.inscripciones.all()
+        horario.inscritos_aceptados = [i for i in inscripciones if i.estado == EstadoInscripcion.ACEPTADO]
+        horario.inscritos_completados = [i for i in inscripciones if i.estado == EstadoInscripcion.COMPLETADO]
+        horario.total_inscritos = len(horario.inscritos_aceptados) + len(horario.inscritos_completados)
     
     context = {
         'oferta': oferta,
@@ -805,15 +957,12 @@ def mis_horarios_view(request, id_oferta):
         'ramo'
     ).all()
     
-    # Para cada horario, contar inscripciones por estado
+    # Para cada horario, separar en memoria las inscripciones precargadas por estado
     for oferta in ofertas:
         for horario in oferta.horarios.all():
-            horario.inscritos_aceptados = horario.inscripciones.filter(
-                estado=EstadoInscripcion.ACEPTADO
-            )
-            horario.inscritos_completados = horario.inscripciones.filter(
-                estado=EstadoInscripcion.COMPLETADO
-            )
+            inscripciones = horario.inscripciones.all()
+            horario.inscritos_aceptados = [i for i in inscripciones if i.estado == EstadoInscripcion.ACEPTADO]
+            horario.inscritos_completados = [i for i in inscripciones if i.estado == EstadoInscripcion.COMPLETADO]
     
     context = {
         'ofertas': ofertas,
@@ -940,11 +1089,7 @@ def crear_rating_view(request):
         return redirect('accounts:profile_detail', public_uid=profesor.user.public_uid)
     
     # Buscar la primera inscripción sin rating
-    inscripcion_sin_rating = None
-    for inscripcion in inscripciones_completadas:
-        if not Rating.objects.filter(inscripcion=inscripcion).exists():
-            inscripcion_sin_rating = inscripcion
-            break
+    inscripcion_sin_rating = inscripciones_completadas.filter(rating__isnull=True).order_by('pk').first()
     
     if not inscripcion_sin_rating:
         messages.warning(request, 'Ya has calificado todas tus clases con este profesor.')
@@ -987,4 +1132,124 @@ def eliminar_oferta(request, oferta_id):
     oferta.delete()  # El signal pre_delete se encargará de las notificaciones
     
     messages.success(request, f"La oferta '{oferta_titulo}' ha sido eliminada correctamente.")
-    return redirect('courses:mis_ofertas')
\ No newline at end of file
+    return redirect('courses:mis_ofertas')
+
+
+@use_replica
+def disponibilidad_api(request):
+    """
+    Busca horarios de ofertas públicas con cupos libres.
+    
+    Ejemplo: ``?ramo=3&dia=2&desde=14:00&hasta=18:00`` devuelve los horarios
+    del ramo 3 del martes que empiezan a las 14:00 o después y terminan a
+    las 18:00 o antes, con al menos un cupo libre.
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP con parámetros GET
+                               ``ramo`` (opcional), ``dia``, ``desde`` y ``hasta`` (HH:MM).
+    
+    Returns:
+        JsonResponse: ``{"resultados": [...]}`` ordenados por hora de inicio y
+                      rating del profesor, o ``{"errors": {...}}`` con estado 400.
+    
+    Dependencies:
+        - courses.forms.DisponibilidadSearchForm
+        - courses.services.availability_service.AvailabilityService
+    """
+    form = DisponibilidadSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    horarios = AvailabilityService.search(
+        dia=form.cleaned_data['dia'],
+        desde=form.cleaned_data['desde'],
+        hasta=form.cleaned_data['hasta'],
+        ramo=form.cleaned_data['ramo'],
+    )
+    return JsonResponse({'resultados': [AvailabilityService.serialize(h) for h in horarios]})
+
+
+@login_required
+@use_replica
+def export_inscripciones(request, formato):
+    """
+    Descarga en streaming las inscripciones visibles para el usuario.
+    
+    El staff exporta todas; el resto, las de sus ofertas y las propias.
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP.
+        formato (str): ``csv`` o ``jsonl``.
+    
+    Returns:
+        StreamingHttpResponse: Archivo ``inscripciones-AAAA-MM-DD.<formato>``.
+    
+    Dependencies:
+        - courses.services.export_service.ExportService
+        - core.exports.export_response
+    """
+    return export_response(
+        ExportService.inscripciones_for(request.user),
+        ExportService.INSCRIPCION_COLUMNS,
+        f"inscripciones-{timezone.localdate():%Y-%m-%d}",
+        formato,
+    )
+
+
+@login_required
+@use_replica
+def export_ratings(request, formato):
+    """
+    Descarga en streaming los ratings visibles para el usuario.
+    
+    El staff exporta todos; el resto, los recibidos y los dados.
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP.
+        formato (str): ``csv`` o ``jsonl``.
+    
+    Returns:
+        StreamingHttpResponse: Archivo ``ratings-AAAA-MM-DD.<formato>``.
+    
+    Dependencies:
+        - courses.services.export_service.ExportService
+        - core.exports.export_response
+    """
+    return export_response(
+        ExportService.ratings_for(request.user),
+        ExportService.RATING_COLUMNS,
+        f"ratings-{timezone.localdate():%Y-%m-%d}",
+        formato,
+    )
+
+
+@require_safe
+@use_replica
+def calendar_feed(request, token):
+    """
+    Feed iCalendar (.ics) con las clases aceptadas del dueño del token.
+    
+    No requiere sesión (los clientes de calendario no la tienen): el token
+    firmado identifica al perfil y una consulta revisa que no esté revocado y
+    lee la versión del feed. Con el feed en caché y ``If-None-Match`` responde
+    304 sin más consultas.
+    
+    Args:
+        request (HttpRequest): Objeto de solicitud HTTP.
+        token (str): Token de ``CalendarService.token_for``.
+    
+    Returns:
+        HttpResponse: Calendario ``text/calendar``, o 404 si el token no es válido.
+    
+    Dependencies:
+        - courses.services.calendar_service.CalendarService
+    """
+    resolved = CalendarService.resolve_token(token)
+    if resolved is None:
+        raise Http404("Calendario no encontrado")
+    etag, body = CalendarService.get_feed(*resolved)
+    response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    # The URL is a secret: shared caches must not keep it
+    patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(request, etag=etag, response=response)
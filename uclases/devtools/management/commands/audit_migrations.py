@@ -0,0 +1,107 @@
+"""
+Auditoría de migraciones, constraints e índices para un backend de BD.
+Ejecutar con: python manage.py audit_migrations
+Contra PostgreSQL: DB_ENGINE=postgres DB_NAME=uclases python manage.py audit_migrations --live
+
+Para cada app del proyecto verifica que:
+1. Los checks de Django para la BD no reporten constraints/índices no soportados.
+2. Cada migración genere SQL válido para el backend (equivalente a sqlmigrate).
+3. No existan operaciones RunSQL (SQL específico de un motor) o irreversibles.
+4. (--live) Los índices y constraints declarados en Meta existan en la BD migrada.
+
+Ejecutarla con SQLite y con PostgreSQL asegura que el esquema funciona en ambos.
+"""
+
+from io import StringIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, migrations
+from django.db.migrations.loader import MigrationLoader
+
+
+def project_app_labels():
+    """Apps definidas dentro del proyecto (excluye django.contrib y terceros)."""
+    base_dir = str(settings.BASE_DIR)
+    return sorted(
+        config.label for config in apps.get_app_configs() if config.path.startswith(base_dir)
+    )
+
+
+class Command(BaseCommand):
+    help = "Audita que migraciones, constraints e índices funcionen en el backend configurado"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Alias de BD a auditar")
+        parser.add_argument(
+            "--live",
+            action="store_true",
+            help="Además compara índices/constraints de los modelos con la BD ya migrada",
+        )
+
+    def handle(self, *args, **opts):
+        alias = opts["database"]
+        connection = connections[alias]
+        labels = project_app_labels()
+        self.problems = 0
+
+        self.stdout.write(f"🔎 Auditando '{alias}' ({connection.vendor}) para apps: {', '.join(labels)}")
+        self.check_model_support(alias, labels)
+        self.check_migration_sql(alias, connection, labels)
+        if opts["live"]:
+            self.check_live_schema(connection, labels)
+
+        if self.problems:
+            raise CommandError(f"❌ {self.problems} problema(s) encontrados en '{alias}'.")
+        self.stdout.write(self.style.SUCCESS(f"✅ Sin problemas para {connection.vendor}."))
+
+    def report(self, message):
+        self.problems += 1
+        self.stdout.write(self.style.ERROR(f"  - {message}"))
+
+    def check_model_support(self, alias, labels):
+        """Checks de Django que dependen del backend (models.W036-W047 y similares)."""
+        self.stdout.write("\n1. Checks de modelos para el backend")
+        app_configs = [apps.get_app_config(label) for label in labels]
+        for message in checks.run_checks(app_configs=app_configs, databases=[alias]):
+            if message.level >= checks.WARNING:
+                self.report(f"{message.id}: {message.obj}: {message.msg}")
+
+    def check_migration_sql(self, alias, connection, labels):
+        """Genera el SQL de cada migración y revisa operaciones no portables."""
+        self.stdout.write("\n2. SQL de migraciones")
+        loader = MigrationLoader(connection, ignore_no_migrations=True)
+        for app_label, name in sorted(loader.disk_migrations):
+            if app_label not in labels:
+                continue
+            migration = loader.disk_migrations[(app_label, name)]
+            for operation in migration.operations:
+                if isinstance(operation, migrations.RunSQL):
+                    self.report(f"{app_label}.{name}: RunSQL no es portable entre motores")
+                if not operation.reversible:
+                    self.report(f"{app_label}.{name}: {operation.describe()} es irreversible")
+            try:
+                call_command("sqlmigrate", app_label, name, database=alias, stdout=StringIO(), stderr=StringIO())
+            except Exception as exc:
+                self.report(f"{app_label}.{name}: no genera SQL ({exc})")
+
+    def check_live_schema(self, connection, labels):
+        """Compara los nombres de índices/constraints de Meta con la introspección."""
+        self.stdout.write("\n3. Esquema en la base de datos")
+        with connection.cursor() as cursor:
+            tables = set(connection.introspection.table_names(cursor))
+            for label in labels:
+                for model in apps.get_app_config(label).get_models():
+                    table = model._meta.db_table
+                    if not model._meta.managed or table not in tables:
+                        if model._meta.managed:
+                            self.report(f"{table}: la tabla no existe (¿falta migrate?)")
+                        continue
+                    existing = connection.introspection.get_constraints(cursor, table)
+                    declared = [*model._meta.indexes, *model._meta.constraints]
+                    for item in declared:
+                        if item.name not in existing:
+                            self.report(f"{table}: falta '{item.name}'")
@@ -0,0 +1,101 @@
+"""
+Benchmark de escrituras concurrentes sobre SQLite.
+Ejecutar con: python manage.py bench_sqlite
+Opciones: --workers 8 --transactions 200
+
+Compara la configuración por defecto de SQLite (journal DELETE, transacciones
+diferidas) con el perfil de core.database (WAL + PRAGMAs + BEGIN IMMEDIATE).
+Cada worker es un proceso independiente que simula una inscripción:
+lee el conteo de cupos y luego inserta una fila en la misma transacción.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.database import SQLITE_PRAGMAS, apply_sqlite_pragmas
+
+PROFILES = {
+    "default": {"pragmas": (), "begin": "BEGIN"},
+    "tuned": {"pragmas": SQLITE_PRAGMAS, "begin": "BEGIN IMMEDIATE"},
+}
+
+
+def _setup_database(path, profile):
+    conn = sqlite3.connect(path)
+    apply_sqlite_pragmas(conn.cursor(), PROFILES[profile]["pragmas"])
+    conn.execute("CREATE TABLE inscripcion (id INTEGER PRIMARY KEY, horario INTEGER, estado INTEGER)")
+    conn.execute("CREATE INDEX inscripcion_horario ON inscripcion (horario, estado)")
+    conn.commit()
+    conn.close()
+
+
+def _worker(args):
+    """Ejecuta ``transactions`` transacciones lectura+escritura y cuenta los fallos."""
+    path, profile, worker_id, transactions = args
+    config = PROFILES[profile]
+    # Python's default timeout (5 s) mirrors what Django uses out of the box
+    conn = sqlite3.connect(path, isolation_level=None, timeout=5)
+    apply_sqlite_pragmas(conn.cursor(), config["pragmas"])
+
+    ok = locked = 0
+    latencies = []
+    for i in range(transactions):
+        horario = (worker_id * transactions + i) % 50
+        start = time.perf_counter()
+        try:
+            conn.execute(config["begin"])
+            conn.execute(
+                "SELECT COUNT(*) FROM inscripcion WHERE horario = ? AND estado IN (0, 1)", (horario,)
+            ).fetchone()
+            conn.execute("INSERT INTO inscripcion (horario, estado) VALUES (?, 0)", (horario,))
+            conn.execute("COMMIT")
+            ok += 1
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            locked += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+    return ok, locked, latencies
+
+
+class Command(BaseCommand):
+    help = "Compara el rendimiento de escrituras concurrentes en SQLite con y sin el perfil afinado"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Procesos escritores concurrentes")
+        parser.add_argument("--transactions", type=int, default=200, help="Transacciones por worker")
+
+    def handle(self, *args, **opts):
+        workers = opts["workers"]
+        transactions = opts["transactions"]
+        self.stdout.write(
+            f"🏁 {workers} workers x {transactions} transacciones (SELECT + INSERT por transacción)\n"
+        )
+        self.stdout.write(f"{'perfil':<10}{'ok':>8}{'locked':>8}{'tx/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+
+        for profile in PROFILES:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.sqlite3")
+                _setup_database(path, profile)
+
+                start = time.perf_counter()
+                with multiprocessing.Pool(workers) as pool:
+                    results = pool.map(
+                        _worker, [(path, profile, w, transactions) for w in range(workers)]
+                    )
+                elapsed = time.perf_counter() - start
+
+            ok = sum(r[0] for r in results)
+            locked = sum(r[1] for r in results)
+            latencies = sorted(lat for r in results for lat in r[2])
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0
+            self.stdout.write(
+                f"{profile:<10}{ok:>8}{locked:>8}{ok / elapsed:>10.0f}{p50:>10.2f}{p99:>10.2f}"
+            )
@@ -0,0 +1,332 @@
+"""
+Benchmark de extremo a extremo de las vistas de la app.
+Ejecutar con: python manage.py bench_views
+Opciones: python manage.py bench_views --scales 1000,10000 --repeat 20 --output bench.json
+Comparar con una corrida anterior: python manage.py bench_views --baseline bench.json
+
+Para cada escala se crea una BD de prueba vacía (como ``manage.py test``), se
+puebla con ``seed --scale`` y se recorren todas las URLs de ``home``,
+``accounts``, ``courses``, ``notifications`` y ``api`` con el cliente de pruebas de
+Django, autenticado como el profesor con más ofertas. Por URL se registra:
+
+- Latencia p50/p95/p99 (ms) de ``--repeat`` peticiones GET tras un calentamiento.
+- Cantidad de consultas SQL de una petición.
+- Bytes de la respuesta.
+
+El resultado es un JSON ordenado y estable, pensado para versionarlo o
+compararlo con ``diff``. Se reportan como problemas (y con ``--check`` el
+comando termina con error):
+
+- Una vista supera su presupuesto de consultas (``QUERY_BUDGETS``).
+- Las consultas de una vista crecen con la escala (típico de un N+1).
+- Con ``--baseline``, el p95 empeora más de ``--tolerance`` o aumentan las
+  consultas respecto de la corrida anterior.
+
+Las URLs que modifican datos con GET (``SKIP``) no se ejecutan.
+"""
+
+import json
+import logging
+import math
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from accounts.models import Perfil
+from courses.models import Carrera, HorarioOfertado, Inscripcion, OfertaClase, Ramo, SolicitudClase
+from courses.services.calendar_service import CalendarService
+from devtools.management.commands.seed import CARRERAS, RAMOS
+from devtools.scale_seed import ScaleSeeder
+from notifications.models import Notification
+
+NAMESPACES = ("home", "accounts", "courses", "notifications", "api")
+
+# Views that change data (or the session) on GET, or need a one-shot token
+SKIP = {
+    "accounts:logout": "cierra la sesión",
+    "accounts:password_reset_confirm": "requiere un token de un solo uso",
+    "courses:eliminar_oferta": "elimina la oferta con GET",
+    "courses:completar_horario": "completa inscripciones con GET",
+}
+
+# Query string for views that need one to do real work
+QUERY_PARAMS = {
+    "courses:disponibilidad_api": {"dia": 2, "desde": "14:00", "hasta": "18:00"},
+    "home:perfil-autocomplete-api": {"q": "carga"},
+}
+
+# Max SQL queries per request on the hot paths (independent of data volume)
+QUERY_BUDGETS = {
+    "home:home": 8,
+    "courses:publications": 6,
+    "courses:oferta_detail": 12,
+    "courses:solicitud_detail": 12,
+    "courses:oferta_comentarios": 6,
+    "courses:solicitud_comentarios": 6,
+    "courses:disponibilidad_api": 4,
+    "courses:mis_inscripciones": 10,
+    "courses:mis_ofertas": 8,
+    "notifications:list": 8,
+    "api:v1_ofertas": 4,
+    "api:v1_horarios": 3,
+}
+
+# p95 changes smaller than this are timer noise, whatever the relative change
+MIN_LATENCY_DELTA_MS = 5.0
+
+
+def iter_url_patterns(resolver=None, namespace=None):
+    """Recorre (nombre calificado, URLPattern) de los namespaces de ``NAMESPACES``."""
+    resolver = resolver or get_resolver()
+    for entry in resolver.url_patterns:
+        if isinstance(entry, URLResolver):
+            ns = entry.namespace or namespace
+            if ns in NAMESPACES:
+                yield from iter_url_patterns(entry, ns)
+        elif isinstance(entry, URLPattern) and namespace and entry.name:
+            yield f"{namespace}:{entry.name}", entry
+
+
+def percentile(samples, p):
+    """Percentil por rango más cercano de una lista ordenada."""
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def sample_context(perfil):
+    """Ids de ejemplo para completar los parámetros de las URLs, centrados en ``perfil``."""
+    oferta = (
+        OfertaClase.objects.filter(profesor=perfil)
+        .annotate(n=Count("horarios__inscripciones"))
+        .order_by("-n", "pk")
+        .first()
+    )
+    horario = HorarioOfertado.objects.filter(oferta=oferta).order_by("pk").first()
+    inscripcion = Inscripcion.objects.filter(horario_ofertado__oferta__profesor=perfil).order_by("pk").first()
+    solicitud = SolicitudClase.objects.order_by("-total_comentarios", "pk").first()
+    propia = SolicitudClase.objects.filter(solicitante=perfil).order_by("pk").first()
+    ajena = SolicitudClase.objects.exclude(solicitante=perfil).order_by("-total_comentarios", "pk").first()
+    notification = Notification.objects.filter(receiver=perfil).order_by("pk").first()
+
+    def pk(obj):
+        return obj.pk if obj else None
+
+    return {
+        "courses:oferta_detail": {"pk": pk(oferta)},
+        "courses:oferta_comentarios": {"pk": pk(oferta)},
+        "courses:inscribirse": {"pk": pk(oferta)},
+        "courses:editar_oferta": {"pk": pk(oferta)},
+        "courses:mis_ofertas_horarios": {"oferta_id": pk(oferta)},
+        "courses:solicitud_detail": {"pk": pk(solicitud)},
+        "courses:solicitud_comentarios": {"pk": pk(solicitud)},
+        "courses:editar_solicitud": {"pk": pk(propia)},
+        "courses:proponer_oferta": {"solicitud_id": pk(ajena)},
+        "courses:aceptar_inscripcion": {"pk": pk(inscripcion)},
+        "courses:rechazar_inscripcion": {"pk": pk(inscripcion)},
+        "courses:cancelar_inscripcion": {"pk": pk(inscripcion)},
+        "courses:completar_horario": {"pk": pk(horario)},
+        "notifications:mark_read": {"notification_id": pk(notification)},
+        "notifications:mark_unread": {"notification_id": pk(notification)},
+        "accounts:profile_detail": {"public_uid": perfil.user.public_uid},
+        "courses:export_inscripciones": {"formato": "csv"},
+        "courses:export_ratings": {"formato": "csv"},
+        "notifications:export": {"formato": "jsonl"},
+        "courses:calendar_feed": {"token": CalendarService.token_for(perfil)},
+        "api:v1_oferta": {"pk": pk(oferta)},
+        "api:v1_solicitud": {"pk": pk(solicitud)},
+        "api:v1_perfil": {"public_uid": perfil.user.public_uid},
+    }
+
+
+class Command(BaseCommand):
+    help = "Mide latencia, consultas SQL y bytes de todas las vistas a distintas escalas de datos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1000,10000", help="Usuarios a generar por escala, separados por coma")
+        parser.add_argument("--repeat", type=int, default=20, help="Peticiones medidas por URL")
+        parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos generados")
+        parser.add_argument("--output", help="Archivo donde escribir el JSON (por defecto solo se muestra la tabla)")
+        parser.add_argument("--baseline", help="JSON de una corrida anterior con el que comparar")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Empeoramiento de p95 tolerado vs. baseline")
+        parser.add_argument("--check", action="store_true", help="Terminar con error si hay problemas (para CI)")
+
+    def handle(self, *args, **opts):
+        scales = sorted(int(value) for value in opts["scales"].split(","))
+
+        # 4xx responses (e.g. 405 on POST-only views) and slow-request perf logs
+        # would print one line per request
+        loggers = [logging.getLogger(name) for name in ("django.request", "uclases.perf")]
+        previous_levels = [log.level for log in loggers]
+        for log in loggers:
+            log.setLevel(logging.ERROR)
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                results = self.run_scales(scales, opts)
+        finally:
+            for log, level in zip(loggers, previous_levels):
+                log.setLevel(level)
+
+        report = {
+            "meta": {"scales": scales, "repeat": opts["repeat"], "seed": opts["seed"]},
+            "results": results,
+        }
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True, ensure_ascii=False)
+                fh.write("\n")
+            self.stdout.write(f"\n💾 Resultados en {opts['output']}")
+
+        problems = self.check_budgets(results) + self.check_growth(results)
+        if opts["baseline"]:
+            with open(opts["baseline"], encoding="utf-8") as fh:
+                problems += self.check_baseline(results, json.load(fh)["results"], opts["tolerance"])
+
+        for problem in problems:
+            self.stdout.write(self.style.WARNING(f"⚠️  {problem}"))
+        if problems and opts["check"]:
+            raise CommandError(f"❌ {len(problems)} problema(s) de rendimiento.")
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("\n✅ Todas las vistas dentro de presupuesto."))
+
+    def run_scales(self, scales, opts):
+        """Para cada escala: BD de prueba nueva, datos sintéticos y medición."""
+        results = []
+        for scale in scales:
+            self.stdout.write(f"\n📦 Escala {scale:,}: creando BD de prueba y datos...")
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                ScaleSeeder(
+                    scale=scale,
+                    seed=opts["seed"],
+                    batch_size=5000,
+                    carreras=[Carrera.objects.get_or_create(name=name)[0] for name in CARRERAS],
+                    ramos=[Ramo.objects.get_or_create(name=name)[0] for name in RAMOS],
+                    stdout=_Quiet(),
+                ).run()
+                results.extend(self.bench_scale(scale, opts["repeat"]))
+            finally:
+                teardown_databases(old_config, verbosity=0)
+        return results
+
+    def bench_scale(self, scale, repeat):
+        perfil = (
+            Perfil.objects.select_related("user")
+            .annotate(n=Count("ofertas_creadas"))
+            .order_by("-n", "pk")
+            .first()
+        )
+        params = sample_context(perfil)
+        client = Client()
+        client.force_login(perfil.user)
+
+        self.stdout.write(f"{'url':<42}{'status':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'sql':>6}{'KB':>9}")
+        results = []
+        for name, _ in iter_url_patterns():
+            row = {"scale": scale, "url": name}
+            if name in SKIP:
+                row["skipped"] = SKIP[name]
+                results.append(row)
+                continue
+            kwargs = params.get(name, {})
+            if any(value is None for value in kwargs.values()):
+                row["skipped"] = "sin datos de ejemplo"
+                results.append(row)
+                continue
+
+            path = reverse(name, kwargs=kwargs)
+            query = QUERY_PARAMS.get(name, {})
+            row.update(self.measure(client, path, query, repeat))
+            results.append(row)
+            self.stdout.write(
+                f"{name:<42}{row['status']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{row['p99_ms']:>9.1f}{row['queries']:>6}{row['bytes'] / 1024:>9.1f}"
+            )
+        return results
+
+    @staticmethod
+    def measure(client, path, query, repeat):
+        # Warm-up: template loading, caches, first connection
+        client.get(path, query)
+
+        with ExitStack() as stack:
+            contexts = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            response = client.get(path, query)
+            # Streaming bodies (exports) run their queries while being consumed
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+        queries = sum(len(ctx.captured_queries) for ctx in contexts)
+
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(path, query)
+            if response.streaming:
+                for _chunk in response.streaming_content:
+                    pass
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        return {
+            "status": response.status_code,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries": queries,
+            "bytes": size,
+        }
+
+    @staticmethod
+    def check_budgets(results):
+        return [
+            f"{row['url']} (escala {row['scale']:,}): {row['queries']} consultas, presupuesto {QUERY_BUDGETS[row['url']]}"
+            for row in results
+            if row["url"] in QUERY_BUDGETS and row.get("queries", 0) > QUERY_BUDGETS[row["url"]]
+        ]
+
+    @staticmethod
+    def check_growth(results):
+        by_url = {}
+        for row in results:
+            if "queries" in row:
+                by_url.setdefault(row["url"], []).append((row["scale"], row["queries"]))
+        problems = []
+        for url, points in sorted(by_url.items()):
+            points.sort()
+            (small, q_small), (large, q_large) = points[0], points[-1]
+            if q_large > q_small:
+                problems.append(f"{url}: las consultas crecen con los datos ({q_small} con {small:,} → {q_large} con {large:,})")
+        return problems
+
+    @staticmethod
+    def check_baseline(results, baseline, tolerance):
+        previous = {(row["scale"], row["url"]): row for row in baseline if "queries" in row}
+        problems = []
+        for row in results:
+            before = previous.get((row["scale"], row["url"]))
+            if before is None or "queries" not in row:
+                continue
+            if row["queries"] > before["queries"]:
+                problems.append(f"{row['url']} (escala {row['scale']:,}): {before['queries']} → {row['queries']} consultas")
+            slower = row["p95_ms"] - before["p95_ms"]
+            if row["p95_ms"] > before["p95_ms"] * (1 + tolerance) and slower > MIN_LATENCY_DELTA_MS:
+                problems.append(
+                    f"{row['url']} (escala {row['scale']:,}): p95 {before['p95_ms']:.1f} → {row['p95_ms']:.1f} ms"
+                )
+        return problems
+
+
+class _Quiet:
+    """Salida descartada para el seeder (el benchmark muestra su propia tabla)."""
+
+    def write(self, *args, **kwargs):
+        pass
@@ -0,0 +1,184 @@
+"""
+Revisa el plan de ejecución de las consultas más frecuentes de la app.
+Ejecutar con: python manage.py explain_queries
+Opciones: python manage.py explain_queries --verbose --database replica
+
+Cada entrada del catálogo reproduce una consulta real de las vistas
+(listados por fecha, cupos de un horario, inscripciones de un estudiante,
+comentarios de una publicación, ...). Para cada una se obtiene el plan con
+``QuerySet.explain()`` (``EXPLAIN QUERY PLAN`` en SQLite, ``EXPLAIN`` en
+PostgreSQL) y se marcan:
+
+- Recorridos completos de tabla (``SCAN tabla`` sin índice / ``Seq Scan``).
+- Ordenamientos en una tabla temporal (``USE TEMP B-TREE FOR ORDER BY``).
+
+Los ids de ejemplo se toman de la BD si hay datos; con la BD vacía se usa 1,
+lo que basta para que el planificador elija el camino de acceso.
+Termina con error si alguna consulta hace un recorrido completo.
+"""
+
+import re
+from datetime import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+
+from accounts.models import Perfil
+from courses.models import (
+    Comentario,
+    EstadoInscripcion,
+    HorarioOfertado,
+    Inscripcion,
+    OfertaClase,
+    Ramo,
+    SolicitudClase,
+)
+from courses.services.availability_service import AvailabilityService
+from courses.services.matching_service import TutorMatchingService
+from courses.services.recommendation_service import RecommendationService
+from notifications.models import Notification
+
+ACTIVE_STATES = [EstadoInscripcion.PENDIENTE, EstadoInscripcion.ACEPTADO]
+
+# SQLite: "SCAN tabla" without "USING ... INDEX"; PostgreSQL: "Seq Scan on tabla"
+FULL_SCAN_RE = re.compile(r"\bSCAN (?P<table>\w+)(?! USING)(?:\s|$)|\bSeq Scan on (?P<pg_table>\w+)")
+TEMP_SORT_RE = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)")
+
+
+def _sample_pk(model, db):
+    return model.objects.using(db).values_list("pk", flat=True).first() or 1
+
+
+def query_catalogue(db):
+    """
+    Construye el catálogo de consultas a revisar.
+
+    Args:
+        db: Alias de BD donde se evaluarán.
+
+    Returns:
+        list[tuple[str, QuerySet]]: Pares (descripción, queryset).
+    """
+    perfil = _sample_pk(Perfil, db)
+    oferta = _sample_pk(OfertaClase, db)
+    solicitud = _sample_pk(SolicitudClase, db)
+    horario = _sample_pk(HorarioOfertado, db)
+
+    catalogue = [
+        ("home: últimas ofertas", OfertaClase.objects.order_by("-fecha_publicacion")[:5]),
+        ("home: últimas solicitudes", SolicitudClase.objects.order_by("-fecha_publicacion")[:5]),
+        ("home: para ti", RecommendationService.for_perfil(perfil)[:RecommendationService.TOP_N]),
+        (
+            "dashboard: mis ofertas",
+            OfertaClase.objects.filter(profesor_id=perfil).order_by("-fecha_publicacion"),
+        ),
+        (
+            "dashboard: mis solicitudes",
+            SolicitudClase.objects.filter(solicitante_id=perfil).order_by("-fecha_publicacion"),
+        ),
+        (
+            "oferta_detail: horarios ordenados",
+            HorarioOfertado.objects.filter(oferta_id=oferta).order_by("dia", "hora_inicio"),
+        ),
+        (
+            "formset de horarios: agenda del profesor",
+            HorarioOfertado.objects.filter(oferta__profesor_id=perfil).exclude(oferta_id=oferta)
+            .values_list("dia", "hora_inicio", "hora_fin", "pk", "oferta_id", "oferta__titulo"),
+        ),
+        (
+            "inscribirse: cupos ocupados",
+            Inscripcion.objects.filter(horario_ofertado_id=horario, estado__in=ACTIVE_STATES),
+        ),
+        (
+            "gestionar horario: inscritos aceptados",
+            Inscripcion.objects.filter(horario_ofertado_id=horario, estado=EstadoInscripcion.ACEPTADO)
+            .select_related("estudiante__user", "estudiante__carrera"),
+        ),
+        (
+            "disponibilidad: horarios con cupos (por ramo)",
+            AvailabilityService.search(dia=2, desde=time(14), hasta=time(18), ramo=_sample_pk(Ramo, db)),
+        ),
+        (
+            "disponibilidad: horarios con cupos (todos los ramos)",
+            AvailabilityService.search(dia=2, desde=time(14), hasta=time(18)),
+        ),
+        (
+            "perfil: inscripciones completadas",
+            Inscripcion.objects.filter(estudiante_id=perfil, estado=EstadoInscripcion.COMPLETADO),
+        ),
+        (
+            "oferta_detail: hilos de comentarios",
+            Comentario.objects.filter(oferta_clase_id=oferta, depth=0).order_by("path")[:11],
+        ),
+        (
+            "solicitud_detail: hilos de comentarios",
+            Comentario.objects.filter(solicitud_clase_id=solicitud, depth=0).order_by("path")[:11],
+        ),
+        (
+            "comentarios: respuestas de un hilo",
+            Comentario.objects.filter(oferta_clase_id=oferta, path__gte="0000000001", path__lt="0000000001~")
+            .select_related("publicador__user")
+            .order_by("path"),
+        ),
+        (
+            "matching: tutores para una solicitud",
+            TutorMatchingService.candidates(
+                SolicitudClase(pk=solicitud, ramo_id=_sample_pk(Ramo, db), solicitante=Perfil(pk=perfil))
+            )[:TutorMatchingService.TOP_K],
+        ),
+        (
+            "nav: notificaciones no leídas",
+            # .count() drops the model's default ordering
+            Notification.objects.filter(receiver_id=perfil, read=False).order_by(),
+        ),
+        (
+            "metrics: no leídas por tipo",
+            Notification.objects.filter(read=False).values_list("type").annotate(total=Count("pk")).order_by(),
+        ),
+    ]
+    return [(name, queryset.using(db)) for name, queryset in catalogue]
+
+
+def plan_problems(plan):
+    """
+    Devuelve los problemas detectados en el texto de un plan.
+
+    Returns:
+        list[str]: Mensajes; vacía si el plan solo usa índices.
+    """
+    problems = []
+    for match in FULL_SCAN_RE.finditer(plan):
+        problems.append(f"recorrido completo de {match.group('table') or match.group('pg_table')}")
+    for match in TEMP_SORT_RE.finditer(plan):
+        problems.append(f"ordenamiento temporal ({match.group(1)})")
+    return problems
+
+
+class Command(BaseCommand):
+    help = "Ejecuta EXPLAIN sobre las consultas frecuentes de la app y marca recorridos completos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Alias de BD a analizar")
+        parser.add_argument("--verbose", action="store_true", help="Muestra el plan completo de cada consulta")
+
+    def handle(self, *args, **opts):
+        db = opts["database"]
+        self.stdout.write(f"🔎 Planes de consulta en '{db}' ({connections[db].vendor})\n")
+
+        full_scans = 0
+        for name, queryset in query_catalogue(db):
+            plan = queryset.explain()
+            problems = plan_problems(plan)
+            if problems:
+                full_scans += any(p.startswith("recorrido") for p in problems)
+                self.stdout.write(self.style.WARNING(f"⚠️  {name}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f"✅ {name}")
+            if opts["verbose"] or problems:
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+
+        if full_scans:
+            raise CommandError(f"❌ {full_scans} consulta(s) recorren una tabla completa.")
+        self.stdout.write(self.style.SUCCESS("\n✅ Todas las consultas usan índices."))
@@ -2,9 +2,10 @@
 Management command para poblar la base de datos con datos de prueba
 Ejecutar con: python manage.py seed
 O en producción: python manage.py seed --force
+Carga masiva: python manage.py seed --scale 100000 --seed 42 (ver devtools.scale_seed)
 """
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.db import transaction
 from django.contrib.auth import get_user_model
@@ -15,9 +16,54 @@ from datetime import time
 from courses.models import Ramo, Carrera, OfertaClase, SolicitudClase, PerfilRamo, HorarioOfertado
 from courses.enums import DiaSemana
 from accounts.models import Perfil
+from devtools.scale_seed import PASSWORD, ScaleSeeder
 
 User = get_user_model()
 
+CARRERAS = [
+    "Ingeniería Civil en Computación",
+    "Ingeniería Civil Industrial",
+    "Ingeniería Civil Eléctrica",
+    "Ingeniería Civil Mecánica",
+    "Ingeniería Civil Matemática",
+    "Licenciatura en Ciencias de la Computación",
+    "Ingeniería Civil",
+    "Ingeniería Comercial",
+]
+
+RAMOS = [
+    # Matemáticas
+    "Álgebra Lineal",
+    "Cálculo I",
+    "Cálculo II",
+    "Cálculo III",
+    "Ecuaciones Diferenciales",
+    "Álgebra Abstracta",
+    "Probabilidades y Estadística",
+    "Análisis Numérico",
+    # Física
+    "Física I",
+    "Física II",
+    "Física III",
+    "Física Experimental",
+    # Computación
+    "Programación",
+    "Estructuras de Datos",
+    "Algoritmos",
+    "Bases de Datos",
+    "Ingeniería de Software",
+    "Sistemas Operativos",
+    "Redes de Computadores",
+    "Inteligencia Artificial",
+    "Machine Learning",
+    "Desarrollo Web",
+    # Otros
+    "Química General",
+    "Economía",
+    "Gestión de Proyectos",
+    "Inglés Técnico",
+]
+
 
 class Command(BaseCommand):
     help = "Poblar la base de datos con datos de prueba (idempotente - puede ejecutarse múltiples veces)"
@@ -28,8 +74,24 @@ class Command(BaseCommand):
             action="store_true",
             help="Permitir ejecución fuera de modo DEBUG"
         )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            help="Generar N usuarios sintéticos (y ofertas, inscripciones, etc. proporcionales) con bulk_create"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Semilla del generador aleatorio para --scale (mismo valor, mismos datos)"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Filas por bulk_create en --scale"
+        )
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         # Verificar si estamos en DEBUG o si se pasó --force
         if not settings.DEBUG and not opts["force"]:
@@ -41,25 +103,23 @@ class Command(BaseCommand):
             )
             return
 
+        if opts["scale"] is not None:
+            # No outer transaction: ScaleSeeder commits batch by batch
+            return self.handle_scale(opts)
+        self.handle_seed()
+
+    @transaction.atomic
+    def handle_seed(self):
+        """Seed normal: pocos registros idempotentes, todo en una transacción."""
         self.stdout.write(self.style.SUCCESS("🚀 Iniciando población de base de datos..."))
 
         # ============================================
         # 1. CREAR CARRERAS
         # ============================================
         self.stdout.write("\n📚 Creando carreras...")
-        carreras_data = [
-            "Ingeniería Civil en Computación",
-            "Ingeniería Civil Industrial",
-            "Ingeniería Civil Eléctrica",
-            "Ingeniería Civil Mecánica",
-            "Ingeniería Civil Matemática",
-            "Licenciatura en Ciencias de la Computación",
-            "Ingeniería Civil",
-            "Ingeniería Comercial",
-        ]
 
         carreras = []
-        for nombre in carreras_data:
+        for nombre in CARRERAS:
             carrera, created = Carrera.objects.get_or_create(name=nombre)
             carreras.append(carrera)
             if created:
@@ -71,41 +131,9 @@ class Command(BaseCommand):
         # 2. CREAR RAMOS
         # ============================================
         self.stdout.write("\n📖 Creando ramos...")
-        ramos_data = [
-            # Matemáticas
-            "Álgebra Lineal",
-            "Cálculo I",
-            "Cálculo II",
-            "Cálculo III",
-            "Ecuaciones Diferenciales",
-            "Álgebra Abstracta",
-            "Probabilidades y Estadística",
-            "Análisis Numérico",
-            # Física
-            "Física I",
-            "Física II",
-            "Física III",
-            "Física Experimental",
-            # Computación
-            "Programación",
-            "Estructuras de Datos",
-            "Algoritmos",
-            "Bases de Datos",
-            "Ingeniería de Software",
-            "Sistemas Operativos",
-            "Redes de Computadores",
-            "Inteligencia Artificial",
-            "Machine Learning",
-            "Desarrollo Web",
-            # Otros
-            "Química General",
-            "Economía",
-            "Gestión de Proyectos",
-            "Inglés Técnico",
-        ]
 
         ramos = []
-        for nombre in ramos_data:
+        for nombre in RAMOS:
             ramo, created = Ramo.objects.get_or_create(name=nombre)
             ramos.append(ramo)
             if created:
@@ -615,3 +643,38 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("   Username: profProgramacion | Password: password123"))
         self.stdout.write(self.style.SUCCESS("   Username: juan_perez | Password: password123"))
         self.stdout.write("="*60)
+
+    def handle_scale(self, opts):
+        """Carga masiva para pruebas de carga (``--scale N``)."""
+        if opts["scale"] < 1:
+            raise CommandError("--scale debe ser al menos 1")
+
+        carreras = [Carrera.objects.get_or_create(name=nombre)[0] for nombre in CARRERAS]
+        ramos = [Ramo.objects.get_or_create(name=nombre)[0] for nombre in RAMOS]
+        seeder = ScaleSeeder(
+            scale=opts["scale"],
+            seed=opts["seed"],
+            batch_size=opts["batch_size"],
+            carreras=carreras,
+            ramos=ramos,
+            stdout=self.stdout,
+        )
+        if seeder.already_seeded():
+            raise CommandError(
+                f"Ya existen usuarios '{seeder.prefix}*'. Use otra --seed o una BD limpia."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🚀 Carga masiva: {opts['scale']:,} usuarios (seed={opts['seed']}, lotes de {opts['batch_size']:,})"
+        ))
+        resumen = seeder.run()
+
+        filas = sum(rows for _, rows, _ in resumen)
+        segundos = sum(elapsed for _, _, elapsed in resumen)
+        self.stdout.write("\n" + "="*60)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {filas:,} filas en {segundos:.1f}s ({filas / max(segundos, 1e-9):,.0f} filas/s)"
+        ))
+        self.stdout.write(self.style.SUCCESS(f"   Contraseña de todos los usuarios: {PASSWORD}"))
+        self.stdout.write("="*60)
+
@@ -0,0 +1,406 @@
+"""
+Generador masivo de datos sintéticos para pruebas de carga (``seed --scale``).
+
+A diferencia del seed normal (pocos registros con ``get_or_create``), acá
+todo se inserta con ``bulk_create`` por lotes:
+
+- La contraseña se hashea una sola vez y se reutiliza en todos los usuarios.
+- Los perfiles se crean directamente (bulk_create no dispara la señal que
+  los crea) y tampoco se disparan las señales de notificaciones.
+- Los campos que normalmente mantienen las señales o ``save()``
+  (``rating_promedio``/``total_ratings``, ``total_comentarios``, ``path``
+  de los comentarios) se recalculan al final con un UPDATE por campo.
+
+Cada lote se confirma en su propia transacción: una carga de millones de
+filas no mantiene abierta una sola transacción (ni el lock de escritura de
+SQLite) durante toda la corrida. Si se interrumpe, las filas ya insertadas
+quedan; ``already_seeded`` impide repetir la semilla sobre ellas.
+
+El contenido depende solo de ``--scale`` y ``--seed``: con la misma semilla
+sobre una BD vacía se obtienen los mismos datos (salvo las fechas, que son
+``auto_now_add``).
+"""
+
+import random
+import time
+from datetime import time as dtime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Avg, CharField, Count, DecimalField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Concat, LPad
+
+from accounts.models import Perfil
+from courses.enums import DiaSemana, EstadoInscripcion
+from courses.models import Comentario, HorarioOfertado, Inscripcion, OfertaClase, PerfilRamo, Rating, SolicitudClase
+from notifications.enums import NotificationTypes
+from notifications.models import Notification
+
+User = get_user_model()
+
+PASSWORD = "password123"
+
+# Volumes per generated user
+OFERTAS_POR_USUARIO = 0.2
+SOLICITUDES_POR_USUARIO = 0.2
+INSCRIPCIONES_POR_USUARIO = 2
+COMENTARIOS_POR_USUARIO = 1
+RAMOS_CURSADOS = (0, 5)
+HORARIOS_POR_OFERTA = (1, 3)
+PROPORCION_RESPUESTAS = 0.3
+PROPORCION_CALIFICADAS = 0.8
+
+ESTADOS = [
+    (EstadoInscripcion.PENDIENTE, 15),
+    (EstadoInscripcion.ACEPTADO, 25),
+    (EstadoInscripcion.RECHAZADO, 10),
+    (EstadoInscripcion.CANCELADO, 10),
+    (EstadoInscripcion.COMPLETADO, 40),
+]
+
+BLOQUES = [(dtime(h), dtime(h + 2)) for h in range(8, 22, 2)]
+
+NOMBRES = ["Ana", "Juan", "Sofía", "Diego", "Camila", "Matías", "Valentina", "Nicolás", "Isidora", "Felipe"]
+APELLIDOS = ["Pérez", "García", "Rojas", "Muñoz", "Castro", "Vera", "Flores", "Herrera", "Pino", "Silva"]
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ScaleSeeder:
+    """
+    Genera usuarios, ofertas, horarios, inscripciones, ratings, comentarios y
+    notificaciones proporcionales a ``scale`` (cantidad de usuarios).
+
+    Uso:
+
+        ScaleSeeder(scale=100_000, seed=42, batch_size=5000, carreras=..., ramos=..., stdout=...).run()
+    """
+
+    def __init__(self, scale, seed, batch_size, carreras, ramos, stdout):
+        self.scale = scale
+        self.seed = seed
+        self.batch_size = batch_size
+        self.carrera_ids = [carrera.pk for carrera in carreras]
+        self.ramo_ids = [ramo.pk for ramo in ramos]
+        self.ramo_names = {ramo.pk: ramo.name for ramo in ramos}
+        self.stdout = stdout
+        self.rng = random.Random(seed)
+        self.prefix = f"carga{seed}_"
+        self.resumen = []
+
+    def already_seeded(self):
+        """True si ya existen usuarios generados con esta semilla."""
+        return User.objects.filter(username__startswith=self.prefix).exists()
+
+    def run(self):
+        """Ejecuta todas las etapas y devuelve el resumen [(etapa, filas, segundos)]."""
+        perfiles = self.create_users()
+        self.create_perfil_ramos(perfiles)
+        ofertas, profesores = self.create_ofertas(perfiles)
+        horarios, horario_profesor = self.create_horarios(ofertas, profesores)
+        solicitudes, solicitantes = self.create_solicitudes(perfiles)
+        inscripciones = self.create_inscripciones(perfiles, horarios, horario_profesor)
+        self.create_ratings(inscripciones)
+        comentarios = self.create_comentarios(perfiles, ofertas, profesores, solicitudes, solicitantes)
+        self.create_notificaciones(inscripciones, comentarios)
+        self.refresh_counters(perfiles[0], ofertas[0] if ofertas else None, solicitudes[0] if solicitudes else None)
+        return self.resumen
+
+    # ------------------------------------------------------------------
+    # Bulk insert with progress
+    # ------------------------------------------------------------------
+
+    def bulk(self, label, model, rows, total):
+        """
+        Inserta ``rows`` (generador de instancias) por lotes mostrando avance.
+
+        Cada lote se confirma por separado.
+
+        Returns:
+            list: pks de las filas insertadas, en orden
+        """
+        pks = []
+        start = time.perf_counter()
+        next_report = 0.1
+        for chunk in _chunks(rows, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=self.batch_size)
+            pks.extend(obj.pk for obj in chunk)
+            if total and len(pks) / total >= next_report:
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"  {label}: {len(pks):,}/{total:,} ({len(pks) / max(elapsed, 1e-9):,.0f} filas/s)"
+                )
+                while len(pks) / total >= next_report:
+                    next_report += 0.1
+        self.record(label, len(pks), time.perf_counter() - start)
+        return pks
+
+    def record(self, label, rows, elapsed):
+        self.resumen.append((label, rows, elapsed))
+        self.stdout.write(f"  ✅ {label}: {rows:,} filas en {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} filas/s)")
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def create_users(self):
+        self.stdout.write(f"\n👥 Usuarios ({self.scale:,})...")
+        password = make_password(PASSWORD)
+        rng = self.rng
+
+        def users():
+            for i in range(self.scale):
+                username = f"{self.prefix}{i:07d}"
+                yield User(
+                    username=username,
+                    email=f"{username}@carga.uclases.cl",
+                    password=password,
+                    first_name=rng.choice(NOMBRES),
+                    last_name=rng.choice(APELLIDOS),
+                )
+
+        user_ids = self.bulk("usuarios", User, users(), self.scale)
+        carreras = self.carrera_ids
+        self.bulk(
+            "perfiles",
+            Perfil,
+            (Perfil(user_id=pk, carrera_id=rng.choice(carreras)) for pk in user_ids),
+            len(user_ids),
+        )
+        # Perfil's primary key is the user id
+        return user_ids
+
+    def create_perfil_ramos(self, perfiles):
+        self.stdout.write("\n📝 Ramos cursados...")
+        rng, ramos = self.rng, self.ramo_ids
+        counts = [rng.randint(*RAMOS_CURSADOS) for _ in perfiles]
+
+        def rows():
+            for perfil_id, k in zip(perfiles, counts):
+                for ramo_id in rng.sample(ramos, min(k, len(ramos))):
+                    yield PerfilRamo(perfil_id=perfil_id, ramo_id=ramo_id)
+
+        self.bulk("ramos cursados", PerfilRamo, rows(), sum(min(k, len(ramos)) for k in counts))
+
+    def create_ofertas(self, perfiles):
+        total = int(self.scale * OFERTAS_POR_USUARIO)
+        self.stdout.write(f"\n💼 Ofertas ({total:,})...")
+        rng = self.rng
+        profesores = [rng.choice(perfiles) for _ in range(total)]
+        ramos = [rng.choice(self.ramo_ids) for _ in range(total)]
+
+        def rows():
+            for i, (profesor_id, ramo_id) in enumerate(zip(profesores, ramos)):
+                nombre = self.ramo_names[ramo_id]
+                yield OfertaClase(
+                    titulo=f"Clases de {nombre} #{i}",
+                    descripcion=f"Clases particulares de {nombre}: materia, ejercicios y preparación de certámenes.",
+                    profesor_id=profesor_id,
+                    ramo_id=ramo_id,
+                    public=rng.random() < 0.9,
+                )
+
+        return self.bulk("ofertas", OfertaClase, rows(), total), profesores
+
+    def create_horarios(self, ofertas, profesores):
+        self.stdout.write("\n⏰ Horarios...")
+        rng = self.rng
+        por_oferta = [rng.randint(*HORARIOS_POR_OFERTA) for _ in ofertas]
+        horario_profesor = []
+
+        def rows():
+            for oferta_id, profesor_id, k in zip(ofertas, profesores, por_oferta):
+                for dia in rng.sample(DiaSemana.values, k):
+                    inicio, fin = rng.choice(BLOQUES)
+                    horario_profesor.append(profesor_id)
+                    yield HorarioOfertado(
+                        oferta_id=oferta_id, dia=dia, hora_inicio=inicio, hora_fin=fin,
+                        cupos_totales=rng.randint(1, 5),
+                    )
+
+        return self.bulk("horarios", HorarioOfertado, rows(), sum(por_oferta)), horario_profesor
+
+    def create_solicitudes(self, perfiles):
+        total = int(self.scale * SOLICITUDES_POR_USUARIO)
+        self.stdout.write(f"\n🔍 Solicitudes ({total:,})...")
+        rng = self.rng
+        solicitantes = [rng.choice(perfiles) for _ in range(total)]
+
+        def rows():
+            for i, solicitante_id in enumerate(solicitantes):
+                ramo_id = rng.choice(self.ramo_ids)
+                nombre = self.ramo_names[ramo_id]
+                yield SolicitudClase(
+                    titulo=f"Busco clases de {nombre} #{i}",
+                    descripcion=f"Necesito ayuda con {nombre} antes del próximo certamen.",
+                    solicitante_id=solicitante_id,
+                    ramo_id=ramo_id,
+                )
+
+        return self.bulk("solicitudes", SolicitudClase, rows(), total), solicitantes
+
+    def create_inscripciones(self, perfiles, horarios, horario_profesor):
+        """Devuelve [(inscripcion_id, estudiante_id, profesor_id, estado)]."""
+        self.stdout.write("\n🎟️  Inscripciones...")
+        if not horarios:
+            return []
+        rng = self.rng
+        estados, pesos = zip(*ESTADOS)
+        max_k = min(2 * INSCRIPCIONES_POR_USUARIO, len(horarios))
+        plan = []
+        for estudiante_id in perfiles:
+            # Distinct horarios per student (unique_inscripcion)
+            for idx in rng.sample(range(len(horarios)), rng.randint(0, max_k)):
+                if horario_profesor[idx] != estudiante_id:
+                    plan.append((estudiante_id, idx, rng.choices(estados, pesos)[0]))
+
+        pks = self.bulk(
+            "inscripciones",
+            Inscripcion,
+            (Inscripcion(estudiante_id=e, horario_ofertado_id=horarios[idx], estado=estado) for e, idx, estado in plan),
+            len(plan),
+        )
+        return [(pk, e, horario_profesor[idx], estado) for pk, (e, idx, estado) in zip(pks, plan)]
+
+    def create_ratings(self, inscripciones):
+        self.stdout.write("\n⭐ Ratings...")
+        rng = self.rng
+        completadas = [
+            (pk, estudiante_id, profesor_id)
+            for pk, estudiante_id, profesor_id, estado in inscripciones
+            if estado == EstadoInscripcion.COMPLETADO and rng.random() < PROPORCION_CALIFICADAS
+        ]
+        self.bulk(
+            "ratings",
+            Rating,
+            (
+                Rating(
+                    inscripcion_id=pk, calificador_id=estudiante_id, calificado_id=profesor_id,
+                    valoracion=rng.choices([1, 2, 3, 4, 5], [5, 5, 15, 35, 40])[0],
+                )
+                for pk, estudiante_id, profesor_id in completadas
+            ),
+            len(completadas),
+        )
+
+    def create_comentarios(self, perfiles, ofertas, profesores, solicitudes, solicitantes):
+        """Devuelve [(comentario_id, dueño_de_la_publicación)] de los comentarios raíz."""
+        total = int(self.scale * COMENTARIOS_POR_USUARIO)
+        raices = total - int(total * PROPORCION_RESPUESTAS)
+        self.stdout.write(f"\n💬 Comentarios ({total:,})...")
+        publicaciones = len(ofertas) + len(solicitudes)
+        if not publicaciones:
+            return []
+        rng = self.rng
+
+        # Root comments; index < len(ofertas) means an oferta, otherwise a solicitud
+        destinos = [rng.randrange(publicaciones) for _ in range(raices)]
+
+        def roots():
+            for destino in destinos:
+                es_oferta = destino < len(ofertas)
+                yield Comentario(
+                    publicador_id=rng.choice(perfiles),
+                    contenido="¿Quedan cupos para esta semana?" if es_oferta else "Yo te puedo ayudar con este ramo.",
+                    oferta_clase_id=ofertas[destino] if es_oferta else None,
+                    solicitud_clase_id=None if es_oferta else solicitudes[destino - len(ofertas)],
+                    depth=0,
+                )
+
+        raiz_ids = self.bulk("comentarios", Comentario, roots(), raices)
+
+        # One level of replies under random roots of the same publication
+        padres = [rng.randrange(len(raiz_ids)) for _ in range(total - raices)]
+
+        def replies():
+            for idx in padres:
+                destino = destinos[idx]
+                es_oferta = destino < len(ofertas)
+                yield Comentario(
+                    publicador_id=rng.choice(perfiles),
+                    contenido="¡Gracias por la respuesta!",
+                    oferta_clase_id=ofertas[destino] if es_oferta else None,
+                    solicitud_clase_id=None if es_oferta else solicitudes[destino - len(ofertas)],
+                    parent_id=raiz_ids[idx],
+                    depth=1,
+                )
+
+        self.bulk("respuestas", Comentario, replies(), len(padres))
+
+        start = time.perf_counter()
+        step = LPad(Cast("pk", CharField()), Comentario.PATH_STEP, Value("0"))
+        nuevos = Comentario.objects.filter(pk__gte=raiz_ids[0], path="")
+        filas = nuevos.filter(depth=0).update(path=step)
+        parent_path = Comentario.objects.filter(pk=OuterRef("parent_id")).values("path")[:1]
+        filas += nuevos.filter(depth=1).update(path=Concat(Subquery(parent_path), step))
+        self.record("paths de comentarios", filas, time.perf_counter() - start)
+
+        def owner(destino):
+            return profesores[destino] if destino < len(ofertas) else solicitantes[destino - len(ofertas)]
+
+        return [(pk, owner(destino)) for pk, destino in zip(raiz_ids, destinos)]
+
+    def create_notificaciones(self, inscripciones, comentarios):
+        self.stdout.write("\n🔔 Notificaciones...")
+        rng = self.rng
+        inscripcion_ct = ContentType.objects.get_for_model(Inscripcion)
+        comentario_ct = ContentType.objects.get_for_model(Comentario)
+
+        def rows():
+            for pk, _, profesor_id, _ in inscripciones:
+                yield Notification(
+                    receiver_id=profesor_id, type=NotificationTypes.INSCRIPTION_CREATED,
+                    title="Nueva inscripción", message="Un estudiante se inscribió en uno de tus horarios.",
+                    read=rng.random() < 0.7, content_type=inscripcion_ct, object_id=pk,
+                )
+            for pk, owner_id in comentarios:
+                yield Notification(
+                    receiver_id=owner_id, type=NotificationTypes.NEW_COMMENT,
+                    title="Nuevo comentario", message="Alguien comentó en tu publicación.",
+                    read=rng.random() < 0.5, content_type=comentario_ct, object_id=pk,
+                )
+
+        self.bulk("notificaciones", Notification, rows(), len(inscripciones) + len(comentarios))
+
+    def refresh_counters(self, first_perfil, first_oferta, first_solicitud):
+        """Recalcula con un UPDATE por campo los contadores que normalmente mantienen las señales."""
+        self.stdout.write("\n🧮 Contadores denormalizados...")
+        start = time.perf_counter()
+
+        def aggregate(model, fk, expression, output_field):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(**{fk: OuterRef("pk")}).order_by().values(fk)
+                    .annotate(value=expression).values("value"),
+                    output_field=output_field,
+                ),
+                Value(0),
+                output_field=output_field,
+            )
+
+        filas = Perfil.objects.filter(pk__gte=first_perfil).update(
+            rating_promedio=aggregate(Rating, "calificado", Avg("valoracion"), DecimalField(max_digits=3, decimal_places=2)),
+            total_ratings=aggregate(Rating, "calificado", Count("pk"), IntegerField()),
+        )
+        def comentarios(fk):
+            return aggregate(Comentario, fk, Count("pk"), IntegerField())
+
+        if first_oferta:
+            filas += OfertaClase.objects.filter(pk__gte=first_oferta).update(total_comentarios=comentarios("oferta_clase"))
+        if first_solicitud:
+            filas += SolicitudClase.objects.filter(pk__gte=first_solicitud).update(
+                total_comentarios=comentarios("solicitud_clase")
+            )
+        self.record("contadores", filas, time.perf_counter() - start)
@@ -1,3 +1,44 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import Perfil, User
+from courses.models import Comentario, OfertaClase
+from devtools.scale_seed import ScaleSeeder
+
+
+class SeedScaleTests(TestCase):
+    """Pruebas de la carga masiva ``seed --scale``."""
+
+    def test_scale_generates_consistent_data(self):
+        out = StringIO()
+        call_command("seed", scale=50, seed=7, force=True, stdout=out)
+
+        self.assertEqual(User.objects.filter(username__startswith="carga7_").count(), 50)
+        self.assertEqual(Perfil.objects.filter(user__username__startswith="carga7_").count(), 50)
+        # Passwords share one precomputed hash and still authenticate
+        self.assertTrue(User.objects.get(username="carga7_0000000").check_password("password123"))
+        # Denormalized counters and comment paths match what signals/save() would produce
+        for perfil in Perfil.objects.annotate(n=Count("ratings_recibidos")):
+            self.assertEqual(perfil.total_ratings, perfil.n)
+        for oferta in OfertaClase.objects.annotate(n=Count("comentarios")):
+            self.assertEqual(oferta.total_comentarios, oferta.n)
+        self.assertFalse(Comentario.objects.filter(path="").exists())
+        self.assertIn("filas/s", out.getvalue())
+
+    def test_scale_commits_each_batch(self):
+        """Un fallo a mitad de la carga no deshace los lotes ya confirmados."""
+        with patch.object(ScaleSeeder, "create_ofertas", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                call_command("seed", scale=5, seed=9, force=True, stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(username__startswith="carga9_").count(), 5)
+
+    def test_scale_refuses_to_repeat_a_seed(self):
+        call_command("seed", scale=5, seed=3, force=True, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("seed", scale=5, seed=3, force=True, stdout=StringIO())
@@ -4,9 +4,13 @@ from operator import attrgetter
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
 
+from core.db_router import use_replica
+
 from accounts.models import Perfil
 from courses.models import OfertaClase, SolicitudClase
+from courses.services.recommendation_service import RecommendationService
 
+@use_replica
 def perfil_autocomplete_api(request):
     """
     API de autocompletado que busca perfiles de usuarios por nombre de usuario.
@@ -42,6 +46,7 @@ def perfil_autocomplete_api(request):
 
     return JsonResponse(results, safe=False)
 
+@use_replica
 def home(request):
     """
     Vista principal que muestra las publicaciones recientes (ofertas y solicitudes de clases).
@@ -51,7 +56,8 @@ def home(request):
                                redirige al perfil del usuario especificado.
     
     Returns:
-        HttpResponse: Renderiza la página principal con las 5 publicaciones más recientes.
+        HttpResponse: Renderiza la página principal con las 5 publicaciones más recientes
+                      y, si hay sesión, las ofertas recomendadas precalculadas ("Para ti").
         HttpResponseRedirect: Redirige al perfil si se proporciona 'perfil_uid' en GET.
     
     Template:
@@ -59,24 +65,40 @@ def home(request):
     
     Dependencies:
         - courses.models (OfertaClase, SolicitudClase)
+        - courses.services.recommendation_service.RecommendationService
         - itertools.chain, operator.attrgetter
     """
     perfil_uid = request.GET.get("perfil")
     if perfil_uid:
         return redirect("accounts:profile_detail", public_uid=perfil_uid)
 
-    ofertas_qs = OfertaClase.objects.order_by('-fecha_publicacion')
-    solicitudes_qs = SolicitudClase.objects.order_by('-fecha_publicacion')
+    # The 5 most recent of the merged list are among the 5 most recent of each
+    # kind; one extra row per kind tells whether there is more to show.
+    limite = 5
+    ofertas = list(
+        OfertaClase.objects.select_related('profesor__user', 'profesor__carrera', 'ramo')
+        .order_by('-fecha_publicacion')[:limite + 1]
+    )
+    solicitudes = list(
+        SolicitudClase.objects.select_related('solicitante__user', 'solicitante__carrera', 'ramo')
+        .order_by('-fecha_publicacion')[:limite + 1]
+    )
 
     publicaciones_recientes_all = sorted(
-        chain(ofertas_qs, solicitudes_qs),
+        chain(ofertas, solicitudes),
         key=attrgetter('fecha_publicacion'),
         reverse=True,
     )
 
-    publicaciones_recientes = publicaciones_recientes_all[:5]
+    publicaciones_recientes = publicaciones_recientes_all[:limite]
+
+    para_ti = []
+    if request.user.is_authenticated:
+        # Perfil's PK is the user id: a single indexed query, no need to load the perfil
+        para_ti = list(RecommendationService.for_perfil(request.user.pk)[:RecommendationService.TOP_N])
 
     context = {
+        'para_ti': para_ti,
         'publicaciones_recientes': publicaciones_recientes,
         'mostrar_ver_todas': len(publicaciones_recientes_all) > len(publicaciones_recientes),
     }
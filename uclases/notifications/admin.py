@@ -1,3 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdmin
+from core.exports import export_action
+from .models import Notification
+from .services.notification_service import NotificationService
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    """Admin para el modelo Notification"""
+    list_display = ("id", "receiver", "type", "title", "read", "action_taken", "creation_date")
+    list_select_related = ("receiver__user",)
+    search_fields = ("receiver__user__username", "title")
+    list_filter = ("type", "read")
+    # Same order as -creation_date (auto_now_add) but walks the primary key instead of sorting the table
+    ordering = ("-pk",)
+    
+    readonly_fields = ("creation_date",)
+    actions = [
+        export_action(NotificationService.EXPORT_COLUMNS, "notificaciones", "csv"),
+        export_action(NotificationService.EXPORT_COLUMNS, "notificaciones", "jsonl"),
+    ]
@@ -21,7 +21,11 @@ class NotificationTypes:
     INSCRIPTION_CANCELED = 'inscription_canceled'
     # Notificación cuando un profesor propone una oferta en respuesta a una solicitud
     OFERTA_PROPOSED = 'oferta_proposed'
+    # Notificación a tutores sugeridos cuando se publica una solicitud de su ramo
+    SOLICITUD_MATCH = 'solicitud_match'
     INSCRIPTION_COMPLETED = 'inscription_completed'
+    # Notificación al estudiante cuando su inscripción pendiente vence sin respuesta
+    INSCRIPTION_EXPIRED = 'inscription_expired'
     
     # Notificaciones de ofertas
     OFFER_DELETED = 'offer_deleted'
@@ -0,0 +1,83 @@
+"""
+Envía recordatorios de las clases aceptadas que empiezan pronto.
+Ejecutar con: python manage.py send_class_reminders
+Opciones: python manage.py send_class_reminders --lead 60 --batch-size 500 --dry-run
+
+Pensado para correr cada minuto desde cron:
+    * * * * * cd /ruta/uclases && python manage.py send_class_reminders -v 0
+o como proceso propio con --loop 60 (repite cada 60 segundos).
+
+Es idempotente: cada clase se recuerda una sola vez aunque el comando corra
+varias veces dentro de la ventana. El detalle está en
+notifications.services.reminder_service.
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from notifications.services.reminder_service import ReminderService
+
+
+class Command(BaseCommand):
+    help = "Notifica a los estudiantes las clases aceptadas que empiezan dentro de la anticipación dada"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lead",
+            type=int,
+            default=int(ReminderService.LEAD.total_seconds() // 60),
+            help="Minutos de anticipación del recordatorio",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ReminderService.BATCH_SIZE,
+            help="Notificaciones por lote",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            metavar="SEGUNDOS",
+            help="Repetir cada SEGUNDOS en vez de correr una vez (detener con Ctrl+C)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Contar los recordatorios pendientes sin enviarlos",
+        )
+
+    def handle(self, *args, **opts):
+        lead = timedelta(minutes=opts["lead"])
+        if not timedelta(0) < lead <= ReminderService.MAX_LEAD:
+            raise CommandError(f"--lead debe estar entre 1 y {int(ReminderService.MAX_LEAD.total_seconds() // 60)} minutos")
+        if opts["loop"] is not None and opts["loop"] < 1:
+            raise CommandError("--loop debe ser al menos 1 segundo")
+
+        if opts["loop"] is None:
+            self.run_once(lead, opts)
+            return
+        try:
+            while True:
+                # Long-running process: drop connections the database may have closed
+                close_old_connections()
+                self.run_once(lead, opts)
+                time.sleep(opts["loop"])
+        except KeyboardInterrupt:
+            self.stdout.write("\n👋 Detenido")
+
+    def run_once(self, lead, opts):
+        start = time.perf_counter()
+        sent = ReminderService.send_due(lead=lead, batch_size=opts["batch_size"], dry_run=opts["dry_run"])
+        elapsed = time.perf_counter() - start
+        if opts["verbosity"] < 1:
+            return
+        verb = "pendientes (dry-run)" if opts["dry_run"] else "enviados"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"⏰ {timezone.localtime():%Y-%m-%d %H:%M}: {sent} recordatorios {verb} en {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_perfil_timetable_version'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0002_alter_notification_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('read', False)), fields=['type'], name='notif_unread_type_idx'),
+        ),
+    ]
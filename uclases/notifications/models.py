@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from accounts.models import Perfil
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -44,6 +45,11 @@ class Notification(models.Model):
         verbose_name = "Notificación"
         verbose_name_plural = "Notificaciones"
         ordering = ['-creation_date']  # Más recientes primero
+        indexes = [
+            # Unread backlog by type (uclases_notifications_unread on every /metrics scrape);
+            # partial, so it stays small however many read notifications pile up
+            models.Index(fields=['type'], condition=Q(read=False), name='notif_unread_type_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.receiver.user.username}"
@@ -1,8 +1,46 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from django.utils import timezone
+
+from core.metrics import registry
+from core.perf import record_time
 from notifications.models import Notification
 from notifications.strategy.factory import NotificationStrategyFactory
 
+
+def _unread_by_type(samples):
+    """Notificaciones sin leer por tipo: lo que los usuarios tienen pendiente de revisar."""
+    rows = Notification.objects.filter(read=False).values_list('type').annotate(total=Count('pk')).order_by()
+    return {(type,): total for type, total in rows}
+
+
+NOTIFICATIONS_CREATED = registry.counter(
+    "uclases_notifications_created_total", "Notificaciones creadas por tipo (NotificationTypes).", ("type",),
+)
+registry.gauge(
+    "uclases_notifications_unread", "Notificaciones sin leer por tipo (cola pendiente de los usuarios).",
+    _unread_by_type, ("type",),
+)
+
+
 class NotificationService:
+    # Columns for core.exports (name, values_list path)
+    EXPORT_COLUMNS = [
+        ('id', 'pk'),
+        ('receptor', 'receiver__user__username'),
+        ('tipo', 'type'),
+        ('titulo', 'title'),
+        ('mensaje', 'message'),
+        ('leida', 'read'),
+        ('accion', 'action_taken'),
+        ('fecha_accion', 'action_date'),
+        ('fecha_creacion', 'creation_date'),
+        ('objeto_tipo', 'content_type__model'),
+        ('objeto_id', 'object_id'),
+    ]
+
     @staticmethod
+    @record_time("notifications_ms", "notifications_count")
     def send(receiver, type, data, related_object=None):
         """
         Envía una notificación utilizando la estrategia especificada.
@@ -22,4 +60,84 @@ class NotificationService:
             title=strategy.get_title(data),
             message=strategy.get_message(data),
             related_object=related_object
-        )
\ No newline at end of file
+        )
+        NOTIFICATIONS_CREATED.inc(type)
+
+    @staticmethod
+    @record_time("notifications_ms", "notifications_count")
+    def send_bulk(type, items, batch_size=500):
+        """
+        Envía muchas notificaciones del mismo tipo con ``bulk_create``.
+
+        :param type: Identificador de la estrategia de notificación.
+        :param items: Iterable de tuplas (receptor, data, objeto relacionado o None).
+        :param batch_size: Filas por INSERT.
+        :return: Cantidad de notificaciones creadas.
+        """
+        strategy = NotificationStrategyFactory.get_strategy(type)
+        notifications = []
+        for receiver, data, related_object in items:
+            notifications.append(Notification(
+                receiver=receiver,
+                type=type,
+                title=strategy.get_title(data),
+                message=strategy.get_message(data),
+                # get_for_model is cached, so this does not query per row
+                content_type=ContentType.objects.get_for_model(related_object) if related_object is not None else None,
+                object_id=related_object.pk if related_object is not None else None,
+            ))
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        if notifications:
+            NOTIFICATIONS_CREATED.inc(type, amount=len(notifications))
+        return len(notifications)
+
+    @staticmethod
+    def mark_action(receiver, type, related_object, action_text):
+        """
+        Registra una acción en las notificaciones pendientes de un receptor.
+
+        :param receiver: Perfil dueño de las notificaciones.
+        :param type: Tipo de notificación a actualizar.
+        :param related_object: Objeto al que apuntan las notificaciones.
+        :param action_text: Texto de la acción realizada (ej: 'Clase propuesta').
+        :return: Cantidad de notificaciones actualizadas.
+        """
+        return Notification.objects.filter(
+            receiver=receiver,
+            type=type,
+            content_type=ContentType.objects.get_for_model(related_object),
+            object_id=related_object.pk,
+            action_taken__isnull=True,
+        ).update(action_taken=action_text, action_date=timezone.now(), read=True)
+
+    @staticmethod
+    def mark_action_many(type, model, object_ids, action_text):
+        """
+        Registra una acción en las notificaciones pendientes de muchos objetos (un solo UPDATE).
+
+        :param type: Tipo de notificación a actualizar.
+        :param model: Modelo de los objetos relacionados.
+        :param object_ids: Claves primarias de los objetos.
+        :param action_text: Texto de la acción realizada (ej: 'Vencida ⌛').
+        :return: Cantidad de notificaciones actualizadas.
+        """
+        return Notification.objects.filter(
+            type=type,
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=object_ids,
+            action_taken__isnull=True,
+        ).update(action_taken=action_text, action_date=timezone.now(), read=True)
+
+
+    @staticmethod
+    def export_queryset(user):
+        """
+        Notificaciones que el usuario puede exportar.
+
+        :param user: Usuario autenticado.
+        :return: QuerySet con todas para el staff, o solo las propias, ordenado por pk.
+        """
+        notifications = Notification.objects.order_by('pk')
+        if user.is_staff:
+            return notifications
+        return notifications.filter(receiver_id=user.pk)
@@ -0,0 +1,143 @@
+"""
+Recordatorios de clases aceptadas que empiezan pronto (``REMINDER_CLASS_SOON``).
+
+Las clases son semanales: una inscripción ACEPTADO se repite cada
+``HorarioOfertado.dia`` a la ``hora_inicio`` (hora local, ``TIME_ZONE``).
+La ventana ``[ahora, ahora + anticipación)`` se traduce a uno o dos tramos
+``dia = d AND hora_inicio en [desde, hasta)`` (dos si cruza la medianoche),
+que se resuelven con el índice ``horario_dia_inicio_idx``
+``(dia, hora_inicio, hora_fin)`` sin recorrer todas las inscripciones.
+
+Cada inscripción recordada guarda en ``ultimo_recordatorio`` el inicio de
+la clase que se le recordó; mientras ese inicio no haya pasado no se vuelve
+a recordar. Por eso correr el comando cada minuto (o dos veces a la vez) no
+duplica avisos, y una corrida sin clases en la ventana cuesta una consulta.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from courses.enums import EstadoInscripcion
+from courses.models import Inscripcion
+from notifications.enums import NotificationTypes
+from notifications.services.notification_service import NotificationService
+
+
+class ReminderService:
+    """
+    Servicio que encuentra y avisa las clases aceptadas próximas.
+
+    Responsabilidades:
+    - Traducir la ventana de anticipación a tramos (día, hora de inicio)
+    - Seleccionar las inscripciones ACEPTADO aún no recordadas
+    - Crear las notificaciones en bloque y marcar las inscripciones
+    """
+
+    LEAD = timedelta(hours=1)
+    # Larger leads would make a window contain the same weekday twice
+    MAX_LEAD = timedelta(days=1)
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def window(now, lead):
+        """
+        Tramos de la ventana ``[now, now + lead)`` en hora local.
+
+        Args:
+            now: Datetime con zona horaria
+            lead: Anticipación (timedelta, como máximo ``MAX_LEAD``)
+
+        Returns:
+            list: Tuplas (fecha, dia, desde, hasta), con ``hasta`` None hasta el fin del día
+        """
+        if not timedelta(0) < lead <= ReminderService.MAX_LEAD:
+            raise ValueError(f"La anticipación debe estar entre 0 y {ReminderService.MAX_LEAD}")
+        start = timezone.localtime(now)
+        end = timezone.localtime(now + lead)
+        tramos = []
+        day = start.date()
+        while day <= end.date():
+            desde = start.time() if day == start.date() else time.min
+            hasta = end.time() if day == end.date() else None
+            if hasta is None or desde < hasta:
+                tramos.append((day, day.isoweekday(), desde, hasta))
+            day += timedelta(days=1)
+        return tramos
+
+    @staticmethod
+    def due(now, lead):
+        """
+        Inscripciones ACEPTADO con una clase en la ventana que aún no se recordó.
+
+        Returns:
+            list: Tuplas (inscripción, inicio de la clase como datetime con zona)
+        """
+        tramos = ReminderService.window(now, lead)
+        ventana = Q()
+        for _, dia, desde, hasta in tramos:
+            tramo = Q(horario_ofertado__dia=dia, horario_ofertado__hora_inicio__gte=desde)
+            if hasta is not None:
+                tramo &= Q(horario_ofertado__hora_inicio__lt=hasta)
+            ventana |= tramo
+
+        inscripciones = (
+            Inscripcion.objects
+            .filter(ventana, estado=EstadoInscripcion.ACEPTADO)
+            # Reminded for a class that has not started yet: that is this same class
+            .filter(Q(ultimo_recordatorio__isnull=True) | Q(ultimo_recordatorio__lte=now))
+            .select_related('estudiante', 'horario_ofertado__oferta__ramo', 'horario_ofertado__oferta__profesor__user')
+            .select_for_update(of=('self',))
+            .order_by('pk')
+        )
+        fechas = {dia: fecha for fecha, dia, _, _ in tramos}
+        tz = timezone.get_current_timezone()
+        return [
+            (
+                inscripcion,
+                timezone.make_aware(
+                    datetime.combine(fechas[inscripcion.horario_ofertado.dia], inscripcion.horario_ofertado.hora_inicio),
+                    tz,
+                ),
+            )
+            for inscripcion in inscripciones
+        ]
+
+    @staticmethod
+    def send_due(now=None, lead=None, batch_size=None, dry_run=False):
+        """
+        Envía los recordatorios pendientes de la ventana.
+
+        Args:
+            now: Momento de referencia (por defecto ahora)
+            lead: Anticipación (por defecto ``LEAD``)
+            batch_size: Filas por INSERT/UPDATE (por defecto ``BATCH_SIZE``)
+            dry_run: Solo cuenta, sin crear notificaciones ni marcar inscripciones
+
+        Returns:
+            int: Cantidad de recordatorios enviados (o que se enviarían)
+        """
+        now = now or timezone.now()
+        lead = lead or ReminderService.LEAD
+        batch_size = batch_size or ReminderService.BATCH_SIZE
+
+        # The row locks (where supported) keep two overlapping runs from reminding the same class
+        with transaction.atomic():
+            pendientes = ReminderService.due(now, lead)
+            if dry_run or not pendientes:
+                return len(pendientes)
+
+            NotificationService.send_bulk(
+                NotificationTypes.REMINDER_CLASS_SOON,
+                ((inscripcion.estudiante, {'inscripcion': inscripcion}, inscripcion) for inscripcion, _ in pendientes),
+                batch_size=batch_size,
+            )
+            for inscripcion, inicio in pendientes:
+                inscripcion.ultimo_recordatorio = inicio
+            # bulk_update skips save(), so the Inscripcion signals (calendar, metrics) do not fire
+            Inscripcion.objects.bulk_update(
+                [inscripcion for inscripcion, _ in pendientes], ['ultimo_recordatorio'], batch_size=batch_size,
+            )
+        return len(pendientes)
@@ -11,5 +11,6 @@ from . import slots_signals
 from . import comments_signals
 from . import ratings_signals
 from . import offers_signals
+from . import solicitudes_signals
 
 # Al agregar nuevos signals, importarlos aquí:
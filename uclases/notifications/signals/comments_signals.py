@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from courses.models import Comentario
@@ -5,9 +6,23 @@ from notifications.services.notification_service import NotificationService
 from notifications.enums import NotificationTypes
 
 @receiver(post_save, sender=Comentario)
-def notify_new_comment(sender, instance, created, **kwargs):
+def notify_new_comment(sender, instance, created, using=None, **kwargs):
     if not created:
         return
+    # Comentario.save writes the path after post_save, in the same transaction
+    transaction.on_commit(lambda: _notify_new_comment(instance), using=using)
+
+
+def _notify_new_comment(instance):
+    # Respuesta en un hilo: avisar al autor del comentario padre
+    parent_author = instance.parent.publicador if instance.parent_id else None
+    if parent_author and parent_author != instance.publicador:
+        NotificationService.send(
+            receiver=parent_author,
+            type=NotificationTypes.COMMENT_REPLY,
+            data={'comentario': instance},
+            related_object=instance
+        )
 
     # Determinar dueño de la publicación (oferta o solicitud)
     publication_owner = None
@@ -19,6 +34,9 @@ def notify_new_comment(sender, instance, created, **kwargs):
     # Si no hay dueño conocido, o el autor del comentario es el dueño, no notificar
     if not publication_owner or publication_owner == instance.publicador:
         return
+    # El dueño ya recibió COMMENT_REPLY si le respondieron a él
+    if publication_owner == parent_author:
+        return
 
     NotificationService.send(
         receiver=publication_owner,
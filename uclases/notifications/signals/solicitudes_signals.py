@@ -0,0 +1,36 @@
+"""
+Signals para notificaciones relacionadas con solicitudes de clases.
+
+Al publicar una solicitud se sugiere a los mejores tutores del ramo
+(ver courses.services.matching_service) que le propongan una clase.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from courses.models import SolicitudClase
+from courses.services.matching_service import TutorMatchingService
+from notifications.services.notification_service import NotificationService
+from notifications.enums import NotificationTypes
+
+
+@receiver(post_save, sender=SolicitudClase)
+def notify_matching_tutors(sender, instance, created, **kwargs):
+    """
+    Notifica a los TOP_K tutores sugeridos cuando se crea una solicitud.
+    
+    Args:
+        sender: Modelo que envía la señal (SolicitudClase)
+        instance: Solicitud recién guardada
+        created: True si es una creación
+        **kwargs: Argumentos adicionales del signal
+    """
+    if not created:
+        return
+
+    for tutor in TutorMatchingService.suggest(instance):
+        NotificationService.send(
+            receiver=tutor,
+            type=NotificationTypes.SOLICITUD_MATCH,
+            data={'solicitud': instance},
+            related_object=instance
+        )
@@ -12,13 +12,16 @@ from . import inscription_accepted
 from . import inscription_rejected
 from . import inscription_canceled
 from . import oferta_proposed
+from . import solicitud_match
 from . import inscription_completed
+from . import inscription_expired
 
 # Notificaciones de ofertas
 from . import offer_deleted
 
 # Notificaciones de comentarios
 from . import new_comment
+from . import comment_reply
 
 # Notificaciones de reviews
 from . import rating_received
@@ -26,3 +29,5 @@ from . import rating_received
 # Notificaciones de cupos
 from . import slots_full
 
+# Notificaciones de recordatorios
+from . import reminder_class_soon
@@ -0,0 +1,50 @@
+from notifications.strategy.trait import NotificationStrategy
+from notifications.strategy.factory import NotificationStrategyFactory
+from notifications.enums import NotificationTypes
+from django.urls import reverse
+
+@NotificationStrategyFactory.register(NotificationTypes.COMMENT_REPLY)
+class CommentReplyStrategy(NotificationStrategy):
+    """Estrategia para notificar cuando alguien responde a un comentario propio."""
+
+    def get_title(self, data):
+        return "Nueva respuesta"
+
+    def get_message(self, data):
+        comment = data['comentario']
+        replier = comment.publicador.user.get_full_name() or comment.publicador.user.username
+        content_preview = comment.contenido[:80] + "..." if len(comment.contenido) > 80 else comment.contenido
+
+        if comment.oferta_clase:
+            publication_title = comment.oferta_clase.titulo
+        else:
+            publication_title = comment.solicitud_clase.titulo
+        return f"{replier} respondió tu comentario en '{publication_title}': '{content_preview}'"
+
+    def get_actions(self, notification):
+
+        if not notification.related_object:
+            return []
+
+        comment = notification.related_object
+
+        if comment.oferta_clase_id:
+            url = reverse('courses:oferta_detail', args=[comment.oferta_clase_id])
+            label = 'Ir a oferta'
+        elif comment.solicitud_clase_id:
+            url = reverse('courses:solicitud_detail', args=[comment.solicitud_clase_id])
+            label = 'Ir a solicitud'
+        else:
+            return []
+
+        return [
+            {
+                'label': label,
+                'url': url,
+                'method': 'GET',
+                'style': 'primary'
+            }
+        ]
+
+    def get_icon(self):
+        return "↩️"
@@ -0,0 +1,36 @@
+from notifications.strategy.trait import NotificationStrategy
+from notifications.strategy.factory import NotificationStrategyFactory
+from notifications.enums import NotificationTypes
+from django.urls import reverse
+
+@NotificationStrategyFactory.register(NotificationTypes.INSCRIPTION_EXPIRED)
+class InscriptionExpiredStrategy(NotificationStrategy):
+    """Estrategia para notificar al estudiante cuando su inscripción pendiente vence sin respuesta."""
+
+    def get_title(self, data):
+        return "Inscripción vencida"
+
+    def get_message(self, data):
+        inscription = data['inscripcion']
+        offer = inscription.horario_ofertado.oferta
+        teacher = offer.profesor.user.get_full_name() or offer.profesor.user.username
+
+        return (f"Tu inscripción en la oferta '{offer.titulo}' del ramo {offer.ramo.name} "
+                f"venció porque el profesor {teacher} no la respondió a tiempo. "
+                f"El cupo quedó libre: puedes buscar otra oferta.")
+
+    def get_actions(self, notification):
+        if not notification.related_object:
+            return []
+
+        return [
+            {
+                'label': 'Ver otras ofertas',
+                'url': reverse('courses:publications'),
+                'method': 'GET',
+                'style': 'primary'
+            }
+        ]
+
+    def get_icon(self):
+        return "⌛"
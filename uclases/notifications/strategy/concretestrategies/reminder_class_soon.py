@@ -0,0 +1,45 @@
+from notifications.strategy.trait import NotificationStrategy
+from notifications.strategy.factory import NotificationStrategyFactory
+from notifications.enums import NotificationTypes
+from django.urls import reverse
+
+@NotificationStrategyFactory.register(NotificationTypes.REMINDER_CLASS_SOON)
+class ReminderClassSoonStrategy(NotificationStrategy):
+    """Estrategia para recordar al estudiante una clase aceptada que empieza pronto."""
+
+    def get_title(self, data):
+        return "Tu clase empieza pronto"
+
+    def get_message(self, data):
+        inscription = data['inscripcion']
+        schedule = inscription.horario_ofertado
+        offer = schedule.oferta
+        teacher = offer.profesor.user.get_full_name() or offer.profesor.user.username
+        start_time = schedule.hora_inicio.strftime('%H:%M')
+
+        return (f"Recuerda: tu clase '{offer.titulo}' de {offer.ramo.name} con el profesor {teacher} "
+                f"empieza el {schedule.get_dia_display().lower()} a las {start_time}.")
+
+    def get_actions(self, notification):
+        if not notification.related_object:
+            return []
+
+        inscription = notification.related_object
+        offer = inscription.horario_ofertado.oferta
+        return [
+            {
+                'label': 'Ver oferta',
+                'url': reverse('courses:oferta_detail', args=[offer.pk]),
+                'method': 'GET',
+                'style': 'primary'
+            },
+            {
+                'label': 'Ver profesor',
+                'url': reverse('accounts:profile_detail', args=[offer.profesor.user.public_uid]),
+                'method': 'GET',
+                'style': 'info'
+            }
+        ]
+
+    def get_icon(self):
+        return "⏰"
@@ -0,0 +1,46 @@
+from notifications.strategy.trait import NotificationStrategy
+from notifications.strategy.factory import NotificationStrategyFactory
+from notifications.enums import NotificationTypes
+from django.urls import reverse
+
+@NotificationStrategyFactory.register(NotificationTypes.SOLICITUD_MATCH)
+class SolicitudMatchStrategy(NotificationStrategy):
+    """Estrategia para sugerir a un tutor una solicitud de un ramo que cursó."""
+
+    def get_title(self, data):
+        return "Solicitud que puedes responder"
+
+    def get_message(self, data):
+        solicitud = data['solicitud']
+        solicitante = solicitud.solicitante.user.get_full_name() or solicitud.solicitante.user.username
+        ramo = solicitud.ramo.name
+
+        return (f"{solicitante} busca clases de {ramo}: '{solicitud.titulo}'. "
+                f"Como cursaste el ramo, podrías proponerle una clase.")
+
+    def get_actions(self, notification):
+        if not notification.related_object:
+            return []
+
+        solicitud_id = notification.related_object.pk
+
+        actions = [
+            {
+                'label': 'Ver solicitud',
+                'url': reverse('courses:solicitud_detail', args=[solicitud_id]),
+                'method': 'GET',
+                'style': 'info'
+            }
+        ]
+        # Una vez respondida, solo se deja el botón de navegación
+        if not notification.action_taken:
+            actions.insert(0, {
+                'label': 'Proponer clase',
+                'url': reverse('courses:proponer_oferta', args=[solicitud_id]),
+                'method': 'GET',
+                'style': 'primary'
+            })
+        return actions
+
+    def get_icon(self):
+        return "🎯"
@@ -0,0 +1,67 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from courses.enums import DiaSemana, EstadoInscripcion
+from courses.models import HorarioOfertado, Inscripcion
+from notifications.enums import NotificationTypes
+from notifications.models import Notification
+from notifications.services.reminder_service import ReminderService
+from .test_base import NotificationBaseTests, User
+
+
+class ReminderServiceTests(NotificationBaseTests):
+    """Recordatorios REMINDER_CLASS_SOON (ventana, idempotencia y semana siguiente)."""
+
+    # Lunes 19 de octubre de 2026, 09:30 hora local; self.horario es el lunes a las 10:00
+    NOW = timezone.make_aware(datetime.datetime(2026, 10, 19, 9, 30))
+
+    def setUp(self):
+        super().setUp()
+        self.aceptada = Inscripcion.objects.create(
+            estudiante=self.perfil_estudiante, horario_ofertado=self.horario, estado=EstadoInscripcion.ACEPTADO,
+        )
+        otro = User.objects.create_user(username="otro_estudiante", email="otro@test.cl", password="x").perfil
+        Inscripcion.objects.create(estudiante=otro, horario_ofertado=self.horario, estado=EstadoInscripcion.PENDIENTE)
+        tarde = HorarioOfertado.objects.create(
+            oferta=self.oferta, dia=DiaSemana.LUNES, hora_inicio=datetime.time(15), hora_fin=datetime.time(16),
+        )
+        Inscripcion.objects.create(estudiante=otro, horario_ofertado=tarde, estado=EstadoInscripcion.ACEPTADO)
+        Notification.objects.all().delete()
+
+    def reminders(self):
+        return Notification.objects.filter(type=NotificationTypes.REMINDER_CLASS_SOON)
+
+    def test_ventana_que_cruza_la_medianoche(self):
+        domingo = timezone.make_aware(datetime.datetime(2026, 10, 25, 23, 30))
+
+        tramos = ReminderService.window(domingo, datetime.timedelta(hours=1))
+
+        self.assertEqual([(dia, desde, hasta) for _, dia, desde, hasta in tramos], [
+            (DiaSemana.DOMINGO, datetime.time(23, 30), None),
+            (DiaSemana.LUNES, datetime.time.min, datetime.time(0, 30)),
+        ])
+
+    def test_recuerda_una_vez_por_clase(self):
+        self.assertEqual(ReminderService.send_due(now=self.NOW), 1)
+        self.assertEqual(ReminderService.send_due(now=self.NOW + datetime.timedelta(minutes=1)), 0)
+
+        notification = self.reminders().get()
+        self.assertEqual(notification.receiver, self.perfil_estudiante)
+        self.assertEqual(notification.related_object, self.aceptada)
+        self.assertIn("a las 10:00", notification.message)
+        self.aceptada.refresh_from_db()
+        self.assertEqual(self.aceptada.ultimo_recordatorio, self.NOW + datetime.timedelta(minutes=30))
+
+        # Next week's class is reminded again
+        self.assertEqual(ReminderService.send_due(now=self.NOW + datetime.timedelta(days=7)), 1)
+
+    def test_comando_dry_run(self):
+        out = StringIO()
+
+        call_command("send_class_reminders", "--lead", "60", "--dry-run", stdout=out)
+
+        self.assertIn("recordatorios pendientes (dry-run)", out.getvalue())
+        self.assertFalse(self.reminders().exists())
@@ -1,9 +1,12 @@
-from courses.models import Inscripcion
+from courses.models import Comentario, Inscripcion, PerfilRamo, SolicitudClase
 from courses.enums import EstadoInscripcion
 from notifications.models import Notification
 from notifications.enums import NotificationTypes
+from notifications.services.notification_service import NotificationService
 from django.utils import timezone
-from .test_base import NotificationBaseTests
+from .test_base import NotificationBaseTests, User
+import uuid
+from unittest.mock import patch
 
 class InscriptionSignalTest(NotificationBaseTests):
 
@@ -77,4 +80,69 @@ class InscriptionSignalTest(NotificationBaseTests):
             fecha_reserva=timezone.now()
         )
         Notification.objects.all().delete() # Limpieza inicial
-        return ins
\ No newline at end of file
+        return ins
+
+
+class CommentReplySignalTest(NotificationBaseTests):
+
+    def test_reply_notifies_parent_author(self):
+        """Responder a un comentario -> COMMENT_REPLY al autor del padre (y NEW_COMMENT al dueño)."""
+        terceros = User.objects.create_user(
+            username='tercero', password='password123', email='tercero@test.cl', public_uid=uuid.uuid4().hex
+        )
+        padre = Comentario.objects.create(contenido="¿Hay cupo?", publicador=self.perfil_estudiante, oferta_clase=self.oferta)
+        Notification.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comentario.objects.create(contenido="Yo también", publicador=terceros.perfil, parent=padre)
+
+        tipos = dict(Notification.objects.values_list('receiver', 'type'))
+        self.assertEqual(tipos[self.perfil_estudiante.pk], NotificationTypes.COMMENT_REPLY)
+        self.assertEqual(tipos[self.perfil_profe.pk], NotificationTypes.NEW_COMMENT)
+
+    def test_owner_reply_sends_only_comment_reply(self):
+        """Si el dueño responde, solo se notifica al autor del padre, una vez."""
+        padre = Comentario.objects.create(contenido="¿Hay cupo?", publicador=self.perfil_estudiante, oferta_clase=self.oferta)
+        Notification.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comentario.objects.create(contenido="Sí", publicador=self.perfil_profe, parent=padre)
+
+        self.assertEqual(Notification.objects.count(), 1)
+        notif = Notification.objects.get()
+        self.assertEqual(notif.receiver, self.perfil_estudiante)
+        self.assertEqual(notif.type, NotificationTypes.COMMENT_REPLY)
+        self.assertIn("respondió tu comentario", notif.message)
+
+    def test_notification_sees_final_path(self):
+        """Las notificaciones se envían al confirmar, con el ``path`` ya escrito."""
+        padre = Comentario.objects.create(contenido="¿Hay cupo?", publicador=self.perfil_estudiante, oferta_clase=self.oferta)
+        paths = []
+        real_send = NotificationService.send
+
+        def send(**kwargs):
+            paths.append(kwargs['data']['comentario'].path)
+            return real_send(**kwargs)
+
+        with patch.object(NotificationService, 'send', side_effect=send):
+            with self.captureOnCommitCallbacks(execute=True):
+                respuesta = Comentario.objects.create(contenido="Sí", publicador=self.perfil_profe, parent=padre)
+            self.assertEqual(paths, [padre.path + Comentario.path_step(respuesta.pk)])
+
+
+class SolicitudMatchSignalTest(NotificationBaseTests):
+
+    def test_new_request_notifies_tutors_who_passed_the_ramo(self):
+        """Al publicar una solicitud se sugiere a quienes cursaron el ramo (no al solicitante)."""
+        PerfilRamo.objects.create(perfil=self.perfil_profe, ramo=self.ramo)
+        PerfilRamo.objects.create(perfil=self.perfil_estudiante, ramo=self.ramo)
+
+        solicitud = SolicitudClase.objects.create(
+            titulo="Necesito ayuda", descripcion="d", solicitante=self.perfil_estudiante, ramo=self.ramo
+        )
+
+        notif = Notification.objects.get(type=NotificationTypes.SOLICITUD_MATCH)
+        self.assertEqual(notif.receiver, self.perfil_profe)
+        self.assertEqual(notif.related_object, solicitud)
+        self.assertEqual(notif.get_available_actions()[0]['label'], 'Proponer clase')
+
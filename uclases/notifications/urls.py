@@ -8,4 +8,5 @@ urlpatterns = [
     path('<int:notification_id>/mark-read/', views.mark_as_read, name='mark_read'),
     path('<int:notification_id>/mark-unread/', views.mark_as_unread, name='mark_unread'),
     path('mark-all-read/', views.mark_all_as_read, name='mark_all_read'),
+    path('export.<str:formato>', views.export_notifications, name='export'),
 ]
@@ -5,19 +5,34 @@ from django.core.paginator import Paginator
 from django.contrib import messages
 from django.http import JsonResponse
 from django.urls import reverse
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.utils import timezone
+from core.db_router import use_replica
+from core.exports import export_response
+from courses.models import Comentario, HorarioOfertado, Inscripcion, OfertaClase, Rating, SolicitudClase
 from .models import Notification
+from .services.notification_service import NotificationService
 
 @login_required
 def notifications_view(request):
     """
     Muestra todas las notificaciones del usuario con paginación.
     El orden está definido en el modelo Notification (más recientes primero).
-    Optimizado con select_related y prefetch_related para evitar N+1 queries.
+    Optimizado con select_related y prefetch_related para evitar N+1 queries:
+    el objeto relacionado de cada tipo se precarga con lo que leen las
+    estrategias en ``get_actions``.
     """
     notifications_list = request.user.perfil.notifications.select_related(
         'content_type'
     ).prefetch_related(
-        'related_object'
+        GenericPrefetch('related_object', [
+            Inscripcion.objects.select_related('estudiante__user', 'horario_ofertado__oferta__profesor__user'),
+            Rating.objects.select_related('calificado__user'),
+            HorarioOfertado.objects.select_related('oferta'),
+            Comentario.objects.select_related('oferta_clase', 'solicitud_clase'),
+            OfertaClase.objects.select_related('profesor__user'),
+            SolicitudClase.objects.all(),
+        ])
     ).all()
     
     # Paginación: 15 notificaciones por página
@@ -122,4 +137,18 @@ def mark_all_as_read(request):
     else:
         messages.info(request, 'No hay notificaciones sin leer.')
     
-    return redirect('notifications:list')
\ No newline at end of file
+    return redirect('notifications:list')
+
+
+@login_required
+@use_replica
+def export_notifications(request, formato):
+    """
+    Descarga en streaming las notificaciones del usuario (todas para el staff).
+    """
+    return export_response(
+        NotificationService.export_queryset(request.user),
+        NotificationService.EXPORT_COLUMNS,
+        f"notificaciones-{timezone.localdate():%Y-%m-%d}",
+        formato,
+    )
@@ -0,0 +1,113 @@
+(function () {
+    const BUTTON_SELECTOR = '[data-comentarios-more]';
+    const LIST_SELECTOR = '[data-comentarios-list]';
+    const FORM_SELECTOR = '[data-comentario-form]';
+
+    const INDENT_PX = 16;
+
+    // Build a comment card with the same markup as the server-rendered ones
+    const createComment = (comentario, canReply) => {
+        const article = document.createElement('article');
+        article.className = 'rounded-xl border border-border bg-card/80 p-4 shadow-sm';
+        if (comentario.depth) {
+            article.classList.add('border-l-4', 'border-l-primary/40');
+        }
+        article.style.marginLeft = `min(${comentario.depth * INDENT_PX}px, 40%)`;
+
+        const header = document.createElement('div');
+        header.className = 'flex items-start justify-between gap-4 mb-2';
+
+        const author = document.createElement('a');
+        author.href = comentario.perfil_url;
+        author.className = 'font-semibold text-primary hover:underline';
+        author.textContent = `@${comentario.autor}`;
+
+        const date = document.createElement('span');
+        date.className = 'text-xs text-foreground/60 whitespace-nowrap';
+        date.textContent = comentario.fecha_display;
+
+        const body = document.createElement('p');
+        body.className = 'text-sm text-foreground/80 leading-relaxed break-words';
+        // textContent keeps user content escaped
+        body.textContent = comentario.contenido;
+
+        header.append(author, date);
+        article.append(header, body);
+
+        if (canReply) {
+            const reply = document.createElement('button');
+            reply.type = 'button';
+            reply.className = 'mt-2 text-xs text-primary hover:underline';
+            reply.dataset.comentarioReply = String(comentario.id);
+            reply.dataset.autor = comentario.autor;
+            reply.textContent = 'Responder';
+            article.append(reply);
+        }
+        return article;
+    };
+
+    const loadMore = async (button, list) => {
+        const page = Number(button.dataset.nextPage || 2);
+        button.disabled = true;
+        try {
+            const response = await fetch(`${button.dataset.url}?page=${page}`, {
+                headers: { Accept: 'application/json' },
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const data = await response.json();
+            const canReply = button.dataset.canReply === '1';
+            data.comentarios.forEach((comentario) => list.append(createComment(comentario, canReply)));
+            if (data.has_more) {
+                button.dataset.nextPage = String(page + 1);
+                button.disabled = false;
+            } else {
+                button.remove();
+            }
+        } catch (error) {
+            console.error('No se pudieron cargar más comentarios', error);
+            button.disabled = false;
+        }
+    };
+
+    // Point the comment form at the selected comment (hidden "parent" input)
+    const setReplyTarget = (form, id, autor) => {
+        const parent = form.querySelector('[data-comentario-parent]');
+        const banner = form.querySelector('[data-comentario-replying]');
+        parent.value = id || '';
+        banner.classList.toggle('hidden', !id);
+        form.querySelector('[data-comentario-replying-to]').textContent = id ? `@${autor}` : '';
+        if (id) {
+            form.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            form.querySelector('textarea')?.focus();
+        }
+    };
+
+    const init = () => {
+        const button = document.querySelector(BUTTON_SELECTOR);
+        const list = document.querySelector(LIST_SELECTOR);
+        const form = document.querySelector(FORM_SELECTOR);
+        if (button && list) {
+            button.addEventListener('click', () => loadMore(button, list));
+        }
+        if (!form || !list) {
+            return;
+        }
+        // Delegated so comments added by "load more" work too
+        list.addEventListener('click', (event) => {
+            const reply = event.target.closest('[data-comentario-reply]');
+            if (reply) {
+                setReplyTarget(form, reply.dataset.comentarioReply, reply.dataset.autor);
+            }
+        });
+        form.querySelector('[data-comentario-reply-cancel]')
+            ?.addEventListener('click', () => setReplyTarget(form, null));
+    };
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();